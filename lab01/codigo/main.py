@@ -1,14 +1,18 @@
-import pandas as pd
+import argparse
 import os
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
-from services.git import GitHubService
-from typing import Dict, List
-from collections import defaultdict
+from typing import List
 
-from services.save_to_csv import SaveToCSV
-from services.print_summary import CalculateMetrics
+# Só módulos leves no topo: pandas, matplotlib e os gráficos são importados
+# dentro dos subcomandos que os usam, para a coleta iniciar rápido (ex: cron).
+
+# Define o diretório base para os arquivos
+BASE_DIR = './lab01/relatorios'
+CSV_PATH = os.path.join(BASE_DIR, 'lab01s01_repositories.csv')
+PARQUET_PATH = os.path.join(BASE_DIR, 'lab01s01_repositories.parquet')
+SUMMARY_PATH = os.path.join(BASE_DIR, 'lab01s01_summary.md')
 
 
 class MetricsAnalyzer:
@@ -16,27 +20,107 @@ class MetricsAnalyzer:
         pass
 
 
+def load_repositories(csv_path: str = CSV_PATH, parquet_path: str = PARQUET_PATH):
+    """
+    Carrega os repositórios coletados em colunas tipadas
+
+    Args:
+        csv_path: Caminho do CSV
+        parquet_path: Caminho do Parquet
+
+    Returns:
+        RepositoryTable com os repositórios
+    """
+    from services.repository_table import RepositoryTable
+
+    # O Parquet (colunar) carrega bem mais rápido; usa o CSV se ele estiver desatualizado
+    repositories = RepositoryTable.read(csv_path, parquet_path)
+
+    print(f"Total repositories loaded: {len(repositories)}")
+    return repositories
+
 
-def main():
-    with open("token.txt") as f:
+def collect(args):
+    """Coleta os repositórios e grava cada página em relatorios/ (com checkpoint do cursor)."""
+    from services.git import ResponseCache
+    from services.save_to_csv import StreamingCSVSink
+
+    with open(args.token_file) as f:
         TOKEN = f.read().strip()
 
+    # Páginas já buscadas vêm do cache ao repetir uma coleta interrompida
+    cache = None if args.no_cache else ResponseCache()
+
+    if args.use_async:
+        from services.git_async import AsyncGitHubService
+        github_service = AsyncGitHubService(TOKEN, max_concurrency=args.concurrency, cache=cache)
+    else:
+        from services.git import GitHubService
+        github_service = GitHubService(TOKEN, cache)
+
+    sink = StreamingCSVSink(CSV_PATH, parquet_filename=PARQUET_PATH if args.parquet else None,
+                            resume=not args.no_resume)
+    github_service.collect_repositories(args.total, sink)
+
+
+def summarize(args):
+    """Gera o resumo .md (com os gráficos) a partir dos dados coletados."""
+    from services.print_summary import CalculateMetrics
+
+    repositories = load_repositories()
+    CalculateMetrics.print_summary(repositories, SUMMARY_PATH, args.workers, args.force)
+
+
+def plot(args):
+    """Gera apenas os gráficos, sem reescrever o resumo."""
+    from services.print_summary import CalculateMetrics
+    from services.stats_engine import StatsEngine
+
+    repositories = load_repositories()
+    charts = CalculateMetrics.generate_charts(StatsEngine(repositories), chart_workers=args.workers,
+                                              force=args.force)
+    print(f"{len(charts)} gráficos prontos")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta o parser de linha de comando com os subcomandos collect, summarize e plot."""
+    parser = argparse.ArgumentParser(description='Lab01 - Análise de repositórios populares no GitHub')
+    subparsers = parser.add_subparsers(dest='command')
+
     # Coletar 1000 repositórios, conforme a especificação do laboratório
-    # github_service = GitHubService(TOKEN)
-    # data = github_service.collect_repositories(1000)
-
-    # Define o diretório base para os arquivos
-    base_dir = './lab01/relatorios'
-    csv_path = os.path.join(base_dir, 'lab01s01_repositories.csv')
-    
-    # Salva CSV em relatorios/
-    # SaveToCSV.save_to_csv(data, csv_path)
-    df = pd.read_csv(csv_path, encoding='utf-8') # Ajuste o encoding se necessário
-    repositories = df.to_dict(orient='records')
+    collect_parser = subparsers.add_parser('collect', help='Coleta os repositórios pela API GraphQL')
+    collect_parser.add_argument('--total', type=int, default=1000, help='Número de repositórios a coletar')
+    collect_parser.add_argument('--token-file', default='token.txt', help='Arquivo com o token do GitHub')
+    collect_parser.add_argument('--async', dest='use_async', action='store_true',
+                                help='Coleta várias faixas de estrelas em paralelo')
+    collect_parser.add_argument('--concurrency', type=int, default=4, help='Requisições simultâneas (com --async)')
+    collect_parser.add_argument('--no-resume', action='store_true', help='Ignora o checkpoint e recomeça a coleta')
+    collect_parser.add_argument('--parquet', action='store_true', help='Gera também o arquivo Parquet')
+    collect_parser.add_argument('--no-cache', action='store_true',
+                                help='Não usa o cache persistente de respostas da API')
+    collect_parser.set_defaults(func=collect)
 
-    print(f"Total repositories loaded: {len(repositories)}")
-    CalculateMetrics.print_summary(repositories, os.path.join(base_dir, 'lab01s01_summary.md'))
+    for name, func, help_text in (
+        ('summarize', summarize, 'Gera o resumo .md e os gráficos'),
+        ('plot', plot, 'Gera apenas os gráficos'),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--workers', type=int, default=None, help='Processos para gerar os gráficos')
+        sub.add_argument('--force', action='store_true', help='Regera os gráficos mesmo sem mudança nos dados')
+        sub.set_defaults(func=func)
+
+    return parser
+
+
+def main(argv: List[str] = None):
+    args = build_parser().parse_args(argv)
+
+    # Sem subcomando, mantém o comportamento anterior: gera o resumo
+    if args.command is None:
+        args = build_parser().parse_args(['summarize'])
+
+    args.func(args)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
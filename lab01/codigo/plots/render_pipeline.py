@@ -0,0 +1,207 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+MANIFEST_FILENAME = '.charts_manifest.json'
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """Descreve um gráfico a ser gerado: a função generate de uma classe RQ e seus argumentos."""
+    key: str
+    generate: Callable
+    args: Tuple
+
+
+def _init_worker():
+    """Garante o backend Agg (sem janela) nos processos de renderização."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render(spec: ChartSpec) -> Any:
+    """Executa a geração de um gráfico (roda no processo filho)."""
+    return spec.generate(*spec.args)
+
+
+class ChartManifest:
+    """
+    Manifesto dos gráficos já gerados em um diretório.
+
+    Para cada gráfico guarda o hash das séries de entrada, dos parâmetros e
+    do código-fonte do módulo que o desenha. Se o hash não mudou e as imagens
+    ainda existem, o gráfico não precisa ser desenhado de novo.
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Carrega o manifesto do diretório de gráficos
+
+        Args:
+            output_dir: Diretório onde os gráficos são salvos
+        """
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"Manifesto de gráficos inválido em {self.path}; todos serão regerados")
+
+    @staticmethod
+    def _update(digest, value):
+        """Alimenta o hash com um argumento (arrays pelo conteúdo binário, o resto pelo repr)."""
+        if isinstance(value, np.ndarray):
+            digest.update(f'ndarray:{value.dtype.str}:{value.shape}'.encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, (list, tuple)):
+            digest.update(f'{type(value).__name__}:{len(value)}'.encode())
+            for item in value:
+                ChartManifest._update(digest, item)
+        else:
+            digest.update(repr(value).encode('utf-8'))
+
+    @staticmethod
+    def fingerprint(spec: ChartSpec) -> str:
+        """
+        Calcula o hash de um gráfico
+
+        Args:
+            spec: Gráfico a gerar
+
+        Returns:
+            Hash SHA-256 em hexadecimal
+        """
+        digest = hashlib.sha256()
+        digest.update(spec.generate.__qualname__.encode())
+        module = sys.modules.get(spec.generate.__module__)
+        if module is not None:
+            digest.update(inspect.getsource(module).encode('utf-8'))
+        ChartManifest._update(digest, spec.args)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _paths(result: Any) -> List[str]:
+        """Lista os caminhos de imagem devolvidos por generate."""
+        return list(result) if isinstance(result, (list, tuple)) else [result]
+
+    def lookup(self, spec: ChartSpec, fingerprint: str) -> Optional[Any]:
+        """
+        Retorna o resultado salvo se o gráfico estiver atualizado
+
+        Args:
+            spec: Gráfico a gerar
+            fingerprint: Hash atual do gráfico
+
+        Returns:
+            Retorno anterior de generate, ou None se o gráfico precisa ser regerado
+        """
+        entry = self.entries.get(spec.key)
+        if not entry or entry['hash'] != fingerprint:
+            return None
+
+        # generate devolve caminhos relativos ao relatório (./graficos/<arquivo>)
+        for path in self._paths(entry['result']):
+            if not os.path.exists(os.path.join(self.output_dir, os.path.basename(path))):
+                return None
+
+        result = entry['result']
+        return tuple(result) if isinstance(result, list) else result
+
+    def record(self, spec: ChartSpec, fingerprint: str, result: Any):
+        """Registra um gráfico recém-gerado."""
+        self.entries[spec.key] = {'hash': fingerprint, 'result': result}
+
+    def save(self):
+        """Grava o manifesto de forma atômica."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class ChartRenderer:
+    """
+    Renderiza os gráficos do relatório em paralelo.
+
+    As classes de gráficos usam a API orientada a objetos (Figure) em vez do
+    estado global do pyplot, então cada gráfico pode ser desenhado em um
+    processo separado. O tempo de geração passa a depender do número de
+    núcleos, e não do número de gráficos.
+    """
+
+    def __init__(self, workers: Optional[int] = None, output_dir: Optional[str] = None, force: bool = False):
+        """
+        Inicializa o renderizador
+
+        Args:
+            workers: Número de processos (padrão: número de CPUs). Com 1, renderiza em sequência
+            output_dir: Diretório dos gráficos; se informado, gráficos inalterados são pulados
+            force: Regera todos os gráficos, ignorando o manifesto
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest = ChartManifest(output_dir) if output_dir else None
+        self.force = force
+
+    def render(self, specs: List[ChartSpec]) -> Dict[str, Any]:
+        """
+        Gera todos os gráficos
+
+        Args:
+            specs: Lista de gráficos a gerar
+
+        Returns:
+            Dicionário chave do gráfico -> retorno de generate (caminhos das imagens)
+        """
+        if self.manifest is None:
+            return self._render_all(specs)
+
+        results = {}
+        fingerprints = {}
+        pending = []
+        for spec in specs:
+            fingerprints[spec.key] = ChartManifest.fingerprint(spec)
+            cached = None if self.force else self.manifest.lookup(spec, fingerprints[spec.key])
+            if cached is None:
+                pending.append(spec)
+            else:
+                results[spec.key] = cached
+
+        if results:
+            print(f"{len(results)} gráficos inalterados reaproveitados")
+
+        rendered = self._render_all(pending)
+        for spec in pending:
+            self.manifest.record(spec, fingerprints[spec.key], rendered[spec.key])
+        if pending:
+            self.manifest.save()
+
+        results.update(rendered)
+        return results
+
+    def _render_all(self, specs: List[ChartSpec]) -> Dict[str, Any]:
+        """Desenha os gráficos informados, em sequência ou no pool de processos."""
+        if not specs:
+            return {}
+
+        if self.workers == 1 or len(specs) <= 1:
+            _init_worker()
+            return {spec.key: _render(spec) for spec in specs}
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(specs)), initializer=_init_worker) as executor:
+            futures = {executor.submit(_render, spec): spec.key for spec in specs}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        print(f"{len(results)} gráficos gerados com {min(self.workers, len(specs))} processos")
+        return results
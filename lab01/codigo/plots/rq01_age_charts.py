@@ -1,12 +1,11 @@
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ01AgeCharts:
     @staticmethod
@@ -14,25 +13,27 @@ class RQ01AgeCharts:
         median_age = sorted(ages)[len(ages) // 2]
 
         # Histograma
-        plt.figure(figsize=(8, 6))
-        plt.hist(ages, bins=20, color='skyblue', edgecolor='black')
-        plt.axvline(median_age, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_age:.0f}')
-        plt.title(f'RQ01 - Distribuição da Idade dos Repositórios (Histograma)\nMediana: {median_age:.0f} dias')  # Adicionado ao título
-        plt.xlabel('Idade (dias)')
-        plt.ylabel('Repositórios')
-        plt.legend()
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.hist(ages, bins=20, color='skyblue', edgecolor='black')
+        ax.axvline(median_age, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_age:.0f}')
+        ax.set_title(f'RQ01 - Distribuição da Idade dos Repositórios (Histograma)\nMediana: {median_age:.0f} dias')  # Adicionado ao título
+        ax.set_xlabel('Idade (dias)')
+        ax.set_ylabel('Repositórios')
+        ax.legend()
         hist_path = os.path.join(base_dir, f'rq01_idade_hist_{top_n}.png')
-        BaseChart.save_chart(plt, hist_path)
+        BaseChart.save_chart(fig, hist_path)
         
 
         # Boxplot
-        plt.figure(figsize=(8, 6))
-        plt.boxplot(ages, vert=False, patch_artist=True, showfliers=False)
-        plt.title(f'RQ01 - Idade dos Repositórios (Box Plot)\nMediana: {median_age:.0f} dias')  # Adicionado ao título
-        plt.xlabel('Idade (dias)')
-        plt.ylabel(' ')
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.boxplot(ages, vert=False, patch_artist=True, showfliers=False)
+        ax.set_title(f'RQ01 - Idade dos Repositórios (Box Plot)\nMediana: {median_age:.0f} dias')  # Adicionado ao título
+        ax.set_xlabel('Idade (dias)')
+        ax.set_ylabel(' ')
         box_path = os.path.join(base_dir, f'rq01_idade_box_{top_n}.png' )
-        BaseChart.save_chart(plt, box_path)
+        BaseChart.save_chart(fig, box_path)
         box_path =  f'./graficos/rq01_idade_box_{top_n}.png'
         hist_path =  f'./graficos/rq01_idade_hist_{top_n}.png'
 
@@ -1,13 +1,12 @@
-import matplotlib.pyplot as plt
-import matplotlib.pyplot as np
+from matplotlib.figure import Figure
+import numpy as np
 import os
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ01CompareAgeCharts:
     @staticmethod
@@ -15,7 +14,8 @@ class RQ01CompareAgeCharts:
         """
         Gera um boxplot comparando a idade de todos os repositórios com os top 10.
         """
-        plt.figure(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
 
         # Calcula as medianas
         median_age_all = sorted(all_ages)[len(all_ages) // 2]
@@ -26,19 +26,21 @@ class RQ01CompareAgeCharts:
         std_age_top10 = np.std(top10_ages)
 
         # Cria o boxplot
-        plt.boxplot([all_ages, top10_ages], labels=['Todos os Repositórios', 'Top 10 Repositórios'], patch_artist=True)
+        ax.boxplot([all_ages, top10_ages], patch_artist=True)
+        ax.set_xticks([1, 2])
+        ax.set_xticklabels(['Todos os Repositórios', 'Top 10 Repositórios'])
 
         # Configurações do gráfico
-        plt.title(
+        ax.set_title(
             f'RQ01 - Comparação da Idade dos Repositórios\n'
             f'Mediana (Todos): {median_age_all:.0f} dias, Desvio Padrão: {std_age_all:.0f}\n'
             f'Mediana (Top 10): {median_age_top10:.0f} dias, Desvio Padrão: {std_age_top10:.0f}'
         )
-        plt.ylabel('Idade (dias)')
+        ax.set_ylabel('Idade (dias)')
 
         # Salva o gráfico
         compare_path = os.path.join(base_dir, 'rq01_comparacao_idade.png')
-        BaseChart.save_chart(plt, compare_path)
+        BaseChart.save_chart(fig, compare_path)
 
         compare_path =  f'./graficos/rq01_comparacao_idade.png'
-        return compare_path
\ No newline at end of file
+        return compare_path
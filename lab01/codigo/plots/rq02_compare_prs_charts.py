@@ -1,12 +1,11 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ02ComparePRsCharts:
     @staticmethod
@@ -14,22 +13,25 @@ class RQ02ComparePRsCharts:
         """
         Gera um boxplot comparando o número de pull requests aceitas entre todos os repositórios e os top 10.
         """
-        plt.figure(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
 
         # Calcula as medianas
         median_prs_all = sorted(all_prs)[len(all_prs) // 2]
         median_prs_top10 = sorted(top10_prs)[len(top10_prs) // 2]
 
         # Cria o boxplot
-        plt.boxplot([all_prs, top10_prs], labels=['Todos os Repositórios', 'Top 10 Repositórios'], patch_artist=True)
+        ax.boxplot([all_prs, top10_prs], patch_artist=True)
+        ax.set_xticks([1, 2])
+        ax.set_xticklabels(['Todos os Repositórios', 'Top 10 Repositórios'])
 
         # Configurações do gráfico
-        plt.title(f'RQ02 - Comparação do Número de Pull Requests Aceitas\nMediana (Todos): {median_prs_all:.0f}, Mediana (Top 10): {median_prs_top10:.0f}')
-        plt.ylabel('Número de Pull Requests Aceitas')
+        ax.set_title(f'RQ02 - Comparação do Número de Pull Requests Aceitas\nMediana (Todos): {median_prs_all:.0f}, Mediana (Top 10): {median_prs_top10:.0f}')
+        ax.set_ylabel('Número de Pull Requests Aceitas')
 
         # Salva o gráfico
         compare_path = os.path.join(base_dir, 'rq02_comparacao_prs_boxplot.png')
-        BaseChart.save_chart(plt, compare_path)
+        BaseChart.save_chart(fig, compare_path)
 
         compare_path =  f'./graficos/rq02_comparacao_prs_boxplot.png'
 
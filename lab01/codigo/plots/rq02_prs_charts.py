@@ -1,12 +1,11 @@
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ02PRsCharts:
     @staticmethod
@@ -14,23 +13,25 @@ class RQ02PRsCharts:
         median_prs = sorted(merged_prs)[len(merged_prs) // 2]
 
         # Histograma
-        plt.figure(figsize=(8, 6))
-        plt.hist(merged_prs, bins=20, color='lightgreen', edgecolor='black')
-        plt.axvline(median_prs, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_prs:.0f}')
-        plt.title(f'RQ02 - Distribuição de Pull Requests Aceitas (Histograma)\nMediana: {median_prs:.0f}')  # Adicionado ao título
-        plt.xlabel('Número de Pull Requests')
-        plt.ylabel('Frequência')
-        plt.legend()
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.hist(merged_prs, bins=20, color='lightgreen', edgecolor='black')
+        ax.axvline(median_prs, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_prs:.0f}')
+        ax.set_title(f'RQ02 - Distribuição de Pull Requests Aceitas (Histograma)\nMediana: {median_prs:.0f}')  # Adicionado ao título
+        ax.set_xlabel('Número de Pull Requests')
+        ax.set_ylabel('Frequência')
+        ax.legend()
         hist_path = os.path.join(base_dir, f'rq02_prs_hist_{top_n}.png')
-        BaseChart.save_chart(plt, hist_path)
+        BaseChart.save_chart(fig, hist_path)
         
         # Boxplot
-        plt.figure(figsize=(8, 6))
-        plt.boxplot(merged_prs, vert=False, patch_artist=True, showfliers=False)
-        plt.title(f'RQ02 - Pull Requests Aceitas (Box Plot)\nMediana: {median_prs:.0f}') # Adicionado ao título
-        plt.xlabel('Número de Pull Requests')
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.boxplot(merged_prs, vert=False, patch_artist=True, showfliers=False)
+        ax.set_title(f'RQ02 - Pull Requests Aceitas (Box Plot)\nMediana: {median_prs:.0f}') # Adicionado ao título
+        ax.set_xlabel('Número de Pull Requests')
         box_path = os.path.join(base_dir, f'rq02_prs_box_{top_n}.png')
-        BaseChart.save_chart(plt, box_path)
+        BaseChart.save_chart(fig, box_path)
         hist_path =  f'./graficos/rq02_prs_hist_{top_n}.png'
         box_path =  f'./graficos/rq02_prs_box_{top_n}.png'
 
@@ -1,12 +1,11 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ03CompareReleasesCharts:
     @staticmethod
@@ -14,21 +13,24 @@ class RQ03CompareReleasesCharts:
         """
         Gera um boxplot comparando o número de releases entre todos os repositórios e os top 10.
         """
-        plt.figure(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
 
         # Calcula as medianas
         median_releases_all = sorted(all_releases)[len(all_releases) // 2]
         median_releases_top10 = sorted(top10_releases)[len(top10_releases) // 2]
 
         # Cria o boxplot
-        plt.boxplot([all_releases, top10_releases], labels=['Todos os Repositórios', 'Top 10 Repositórios'], patch_artist=True)
+        ax.boxplot([all_releases, top10_releases], patch_artist=True)
+        ax.set_xticks([1, 2])
+        ax.set_xticklabels(['Todos os Repositórios', 'Top 10 Repositórios'])
 
         # Configurações do gráfico
-        plt.title(f'RQ03 - Comparação do Número de Releases (Boxplot)\nMediana (Todos): {median_releases_all:.0f}, Mediana (Top 10): {median_releases_top10:.0f}')
-        plt.ylabel('Número de Releases')
+        ax.set_title(f'RQ03 - Comparação do Número de Releases (Boxplot)\nMediana (Todos): {median_releases_all:.0f}, Mediana (Top 10): {median_releases_top10:.0f}')
+        ax.set_ylabel('Número de Releases')
 
         # Salva o gráfico
         compare_path = os.path.join(base_dir, 'rq03_comparacao_releases_boxplot.png')
-        BaseChart.save_chart(plt, compare_path)
+        BaseChart.save_chart(fig, compare_path)
         compare_path =  f'./graficos/rq03_comparacao_releases_boxplot.png'
         return compare_path
\ No newline at end of file
@@ -1,12 +1,11 @@
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ03ReleasesCharts:
     @staticmethod
@@ -14,23 +13,25 @@ class RQ03ReleasesCharts:
         median_releases = sorted(releases)[len(releases) // 2]
 
         # Histograma
-        plt.figure(figsize=(8, 6))
-        plt.hist(releases, bins=20, color='lightcoral', edgecolor='black')
-        plt.axvline(median_releases, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_releases:.0f}')
-        plt.title(f'RQ03 - Distribuição de Releases (Histograma)\nMediana: {median_releases:.0f}')
-        plt.xlabel('Número de Releases')
-        plt.ylabel('Frequência')
-        plt.legend()
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.hist(releases, bins=20, color='lightcoral', edgecolor='black')
+        ax.axvline(median_releases, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_releases:.0f}')
+        ax.set_title(f'RQ03 - Distribuição de Releases (Histograma)\nMediana: {median_releases:.0f}')
+        ax.set_xlabel('Número de Releases')
+        ax.set_ylabel('Frequência')
+        ax.legend()
         hist_path = os.path.join(base_dir, f'rq03_releases_hist_{top_n}.png')
-        BaseChart.save_chart(plt, hist_path)
+        BaseChart.save_chart(fig, hist_path)
 
         # Boxplot
-        plt.figure(figsize=(8, 6))
-        plt.boxplot(releases, vert=False, patch_artist=True, showfliers=False)
-        plt.title(f'RQ03 - Releases (Box Plot)\nMediana: {median_releases:.0f}')
-        plt.xlabel('Número de Releases')
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.boxplot(releases, vert=False, patch_artist=True, showfliers=False)
+        ax.set_title(f'RQ03 - Releases (Box Plot)\nMediana: {median_releases:.0f}')
+        ax.set_xlabel('Número de Releases')
         box_path = os.path.join(base_dir, f'rq03_releases_box_{top_n}.png')
-        BaseChart.save_chart(plt, box_path)
+        BaseChart.save_chart(fig, box_path)
         hist_path =  f'./graficos/rq03_releases_hist_{top_n}.png'
         box_path =  f'./graficos/rq03_releases_box_{top_n}.png'
 
@@ -1,12 +1,11 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ04CompareUpdatesCharts:
     @staticmethod
@@ -14,21 +13,24 @@ class RQ04CompareUpdatesCharts:
         """
         Gera um boxplot comparando os dias desde a última atualização entre todos os repositórios e os top 10.
         """
-        plt.figure(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
 
         # Calcula as medianas
         median_updates_all = sorted(all_updates)[len(all_updates) // 2]
         median_updates_top10 = sorted(top10_updates)[len(top10_updates) // 2]
 
         # Cria o boxplot
-        plt.boxplot([all_updates, top10_updates], labels=['Todos os Repositórios', 'Top 10 Repositórios'], patch_artist=True)
+        ax.boxplot([all_updates, top10_updates], patch_artist=True)
+        ax.set_xticks([1, 2])
+        ax.set_xticklabels(['Todos os Repositórios', 'Top 10 Repositórios'])
 
         # Configurações do gráfico
-        plt.title(f'RQ04 - Comparação dos Dias Desde a Última Atualização (Boxplot)\nMediana (Todos): {median_updates_all:.0f}, Mediana (Top 10): {median_updates_top10:.0f}')
-        plt.ylabel('Dias Desde a Última Atualização')
+        ax.set_title(f'RQ04 - Comparação dos Dias Desde a Última Atualização (Boxplot)\nMediana (Todos): {median_updates_all:.0f}, Mediana (Top 10): {median_updates_top10:.0f}')
+        ax.set_ylabel('Dias Desde a Última Atualização')
 
         # Salva o gráfico
         compare_path = os.path.join(base_dir, 'rq04_comparacao_updates_boxplot.png')
-        BaseChart.save_chart(plt, compare_path)
+        BaseChart.save_chart(fig, compare_path)
         compare_path =  f'./graficos/rq04_comparacao_updates_boxplot.png'
         return compare_path
\ No newline at end of file
@@ -1,12 +1,11 @@
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ04UpdatesCharts:
     @staticmethod
@@ -14,23 +13,25 @@ class RQ04UpdatesCharts:
         median_days = sorted(days_since_updates)[len(days_since_updates) // 2]
 
         # Histograma
-        plt.figure(figsize=(8, 6))
-        plt.hist(days_since_updates, bins=20, color='lightyellow', edgecolor='black')
-        plt.axvline(median_days, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_days:.0f}')
-        plt.title(f'RQ04 - Distribuição de Dias Desde a Última Atualização (Histograma)\nMediana: {median_days:.0f}')
-        plt.xlabel('Dias Desde a Última Atualização')
-        plt.ylabel('Frequência')
-        plt.legend()
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.hist(days_since_updates, bins=20, color='lightyellow', edgecolor='black')
+        ax.axvline(median_days, color='red', linestyle='dashed', linewidth=1, label=f'Mediana: {median_days:.0f}')
+        ax.set_title(f'RQ04 - Distribuição de Dias Desde a Última Atualização (Histograma)\nMediana: {median_days:.0f}')
+        ax.set_xlabel('Dias Desde a Última Atualização')
+        ax.set_ylabel('Frequência')
+        ax.legend()
         hist_path = os.path.join(base_dir, f'rq04_dias_hist_{top_n}.png')
-        BaseChart.save_chart(plt, hist_path)
+        BaseChart.save_chart(fig, hist_path)
 
         # Boxplot
-        plt.figure(figsize=(8, 6))
-        plt.boxplot(days_since_updates, vert=False, patch_artist=True, showfliers=False)
-        plt.title(f'RQ04 - Dias Desde a Última Atualização (Box Plot)\nMediana: {median_days:.0f}')
-        plt.xlabel('Dias Desde a Última Atualização')
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.boxplot(days_since_updates, vert=False, patch_artist=True, showfliers=False)
+        ax.set_title(f'RQ04 - Dias Desde a Última Atualização (Box Plot)\nMediana: {median_days:.0f}')
+        ax.set_xlabel('Dias Desde a Última Atualização')
         box_path = os.path.join(base_dir, f'rq04_dias_box_{top_n}.png')
-        BaseChart.save_chart(plt, box_path)
+        BaseChart.save_chart(fig, box_path)
 
         hist_path =  f'./graficos/rq04_dias_hist_{top_n}.png'
         box_path =  f'./graficos/rq04_dias_box_{top_n}.png'
@@ -1,12 +1,11 @@
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ05LanguagesCharts:
     @staticmethod
@@ -14,23 +13,26 @@ class RQ05LanguagesCharts:
         langs, counts = zip(*top_languages)
 
         # Barras
-        plt.figure(figsize=(10, 6))
-        plt.bar(langs, counts, color='skyblue')
-        plt.title('RQ05 - Linguagens Mais Populares')
-        plt.xlabel('Linguagens')
-        plt.ylabel('Número de Repositórios')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.bar(langs, counts, color='skyblue')
+        ax.set_title('RQ05 - Linguagens Mais Populares')
+        ax.set_xlabel('Linguagens')
+        ax.set_ylabel('Número de Repositórios')
+        ax.set_xticks(range(len(langs)))
+        ax.set_xticklabels(langs, rotation=45, ha='right')
+        fig.tight_layout()
         bar_path = os.path.join(base_dir, f'rq05_linguagens_bar_{top_n}.png')
-        BaseChart.save_chart(plt, bar_path)
+        BaseChart.save_chart(fig, bar_path)
 
         # Pizza
-        plt.figure(figsize=(8, 6))
-        plt.pie(counts, labels=langs, autopct='%1.1f%%', startangle=140)
-        plt.title('RQ05 - Linguagens Mais Populares')
-        plt.tight_layout()
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
+        ax.pie(counts, labels=langs, autopct='%1.1f%%', startangle=140)
+        ax.set_title('RQ05 - Linguagens Mais Populares')
+        fig.tight_layout()
         pie_path = os.path.join(base_dir, f'rq05_linguagens_pie_{top_n}.png')
-        BaseChart.save_chart(plt, pie_path)
+        BaseChart.save_chart(fig, pie_path)
         bar_path =  f'./graficos/rq05_linguagens_bar_{top_n}.png'
         pie_path =  f'./graficos/rq05_linguagens_pie_{top_n}.png'
 
@@ -1,12 +1,11 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import os
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ06CompareIssuesCharts:
     @staticmethod
@@ -14,21 +13,24 @@ class RQ06CompareIssuesCharts:
         """
         Gera um boxplot comparando o percentual de issues fechadas entre todos os repositórios e os top 10.
         """
-        plt.figure(figsize=(8, 6))
+        fig = Figure(figsize=(8, 6))
+        ax = fig.add_subplot()
 
         # Calcula as medianas
         median_ratios_all = sorted(all_ratios)[len(all_ratios) // 2]
         median_ratios_top10 = sorted(top10_ratios)[len(top10_ratios) // 2]
 
         # Cria o boxplot
-        plt.boxplot([all_ratios, top10_ratios], labels=['Todos os Repositórios', 'Top 10 Repositórios'], patch_artist=True)
+        ax.boxplot([all_ratios, top10_ratios], patch_artist=True)
+        ax.set_xticks([1, 2])
+        ax.set_xticklabels(['Todos os Repositórios', 'Top 10 Repositórios'])
 
         # Configurações do gráfico
-        plt.title(f'RQ06 - Comparação do Percentual de Issues Fechadas (Boxplot)\nMediana (Todos): {median_ratios_all:.2f}%, Mediana (Top 10): {median_ratios_top10:.2f}%')
-        plt.ylabel('Percentual de Issues Fechadas')
+        ax.set_title(f'RQ06 - Comparação do Percentual de Issues Fechadas (Boxplot)\nMediana (Todos): {median_ratios_all:.2f}%, Mediana (Top 10): {median_ratios_top10:.2f}%')
+        ax.set_ylabel('Percentual de Issues Fechadas')
 
         # Salva o gráfico
         compare_path = os.path.join(base_dir, 'rq06_comparacao_issues_boxplot.png')
-        BaseChart.save_chart(plt, compare_path)
+        BaseChart.save_chart(fig, compare_path)
         compare_path =  f'./graficos/rq06_comparacao_issues_boxplot.png'
         return compare_path
\ No newline at end of file
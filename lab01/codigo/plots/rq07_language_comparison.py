@@ -1,12 +1,11 @@
 import os
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
 class BaseChart:
     @staticmethod
-    def save_chart(plt, filename):
+    def save_chart(fig, filename):
         """Salva o gráfico em um arquivo."""
-        plt.savefig(filename)
-        plt.close()
+        fig.savefig(filename)
 
 class RQ07LanguageComparisonCharts:
     @staticmethod
@@ -23,20 +22,22 @@ class RQ07LanguageComparisonCharts:
         width = 0.35  # Largura das barras
 
         # Criar gráfico de barras
-        plt.figure(figsize=(10, 6))
-        plt.bar([i - width/2 for i in x], popular_values, width, label='Populares', color='skyblue')
-        plt.bar([i + width/2 for i in x], other_values, width, label='Outras', color='lightcoral')
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.bar([i - width/2 for i in x], popular_values, width, label='Populares', color='skyblue')
+        ax.bar([i + width/2 for i in x], other_values, width, label='Outras', color='lightcoral')
 
         # Adicionar rótulos e título
-        plt.xlabel('Métricas')
-        plt.ylabel('Valores')
-        plt.title('RQ07 - Comparação entre Linguagens Populares e Outras')
-        plt.xticks(x, metrics)
-        plt.legend()
+        ax.set_xlabel('Métricas')
+        ax.set_ylabel('Valores')
+        ax.set_title('RQ07 - Comparação entre Linguagens Populares e Outras')
+        ax.set_xticks(list(x))
+        ax.set_xticklabels(metrics)
+        ax.legend()
 
         # Salvar gráfico de barras
         bar_path = os.path.join(base_dir, 'rq07_comparacao_bar.png')
-        BaseChart.save_chart(plt, bar_path)
+        BaseChart.save_chart(fig, bar_path)
 
         bar_path =  './graficos/rq07_comparacao_bar.png'
         return bar_path
\ No newline at end of file
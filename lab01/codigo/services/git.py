@@ -3,90 +3,130 @@ import time
 from datetime import datetime
 from typing import Dict, List, Optional
 import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from shared import transport  # noqa: E402
+from shared.response_cache import ResponseCache  # noqa: E402
+
+DEFAULT_SEARCH = 'stars:>1'
+
+SEARCH_QUERY = """
+query PopularRepositories($searchQuery: String!, $first: Int!, $after: String) {
+  search(query: $searchQuery, type: REPOSITORY, first: $first, after: $after) {
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
+    repositoryCount
+    edges {
+      node {
+        ... on Repository {
+          name
+          owner {
+            login
+          }
+          stargazerCount
+          createdAt
+          updatedAt
+          primaryLanguage {
+            name
+          }
+          pullRequests(states: MERGED) {
+            totalCount
+          }
+          releases {
+            totalCount
+          }
+          issues {
+            totalCount
+          }
+          closedIssues: issues(states: CLOSED) {
+            totalCount
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
 
 class GitHubService:
-    def __init__(self, token: str):
+    def __init__(self, token: str, cache: Optional[ResponseCache] = None):
         """
         Inicializa o serviço do GitHub
 
         Args:
             token: Token de acesso pessoal do GitHub
+            cache: Cache persistente de respostas (opcional)
         """
         self.token = token
+        self.cache = cache
+        self.last_from_cache = False
         self.headers = {
             'Authorization': f'Bearer {token}',
             'Content-Type': 'application/json'
         }
-        self.url = 'https://api.github.com/graphql'
+        # Com HTTP_TRANSPORT=record/replay a URL aponta para o servidor local de cassettes
+        self.url = transport.url('https://api.github.com/graphql')
+
+    def create_query(self) -> str:
+        """
+        Retorna a query GraphQL para buscar repositórios populares
+
+        A query é fixa e parametrizada por variáveis ($searchQuery, $first e
+        $after), então não precisa ser remontada a cada página.
 
-    def create_query(self, first: int = 100, after: Optional[str] = None) -> str:
+        Returns:
+            String da query GraphQL
         """
-        Cria a query GraphQL para buscar repositórios populares
+        return SEARCH_QUERY
+
+    def create_variables(self, first: int = 100, after: Optional[str] = None,
+                         search: str = DEFAULT_SEARCH) -> Dict:
+        """
+        Cria as variáveis da query de busca
 
         Args:
             first: Número de repositórios para buscar
             after: Cursor para paginação
+            search: Filtro de busca do GitHub (ex: "stars:>1")
 
         Returns:
-            String da query GraphQL
+            Dicionário com as variáveis da query
         """
-        after_clause = f', after: "{after}"' if after else ''
-
-        query = f"""
-        {{
-          search(query: "stars:>1", type: REPOSITORY, first: {first}{after_clause}) {{
-            pageInfo {{
-              hasNextPage
-              endCursor
-            }}
-            repositoryCount
-            edges {{
-              node {{
-                ... on Repository {{
-                  name
-                  owner {{
-                    login
-                  }}
-                  stargazerCount
-                  createdAt
-                  updatedAt
-                  primaryLanguage {{
-                    name
-                  }}
-                  pullRequests(states: MERGED) {{
-                    totalCount
-                  }}
-                  releases {{
-                    totalCount
-                  }}
-                  issues {{
-                    totalCount
-                  }}
-                  closedIssues: issues(states: CLOSED) {{
-                    totalCount
-                  }}
-                }}
-              }}
-            }}
-          }}
-        }}
-        """
-        return query
+        return {'searchQuery': search, 'first': first, 'after': after}
 
-    def make_request(self, query: str) -> Dict:
+    def make_request(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """
         Faz a requisição para a API GraphQL do GitHub
 
         Args:
             query: Query GraphQL
+            variables: Variáveis da query (opcional)
 
         Returns:
             Resposta da API em formato dict
         """
+        if self.cache is not None:
+            cached = self.cache.get(query, variables)
+            self.last_from_cache = cached is not None
+            if cached is not None:
+                return cached
+
+        payload = {'query': query}
+        if variables is not None:
+            payload['variables'] = variables
+
         response = requests.post(
             self.url,
             headers=self.headers,
-            json={'query': query}
+            json=payload
         )
 
         if response.status_code != 200:
@@ -97,6 +137,9 @@ class GitHubService:
         if 'errors' in data:
             raise Exception(f"Erro na query GraphQL: {data['errors']}")
 
+        if self.cache is not None:
+            self.cache.set(query, variables, data)
+
         return data
 
     def extract_repository_data(self, repo_node: Dict) -> Dict:
@@ -137,41 +180,55 @@ class GitHubService:
             'closed_issues_ratio': round(closed_issues_ratio, 2)
         }
 
-    def collect_repositories(self, total_repos: int = 100) -> List[Dict]:
+    def collect_repositories(self, total_repos: int = 100, sink=None) -> List[Dict]:
         """
         Coleta dados dos repositórios mais populares com páginas menores
+
+        Args:
+            total_repos: Número de repositórios a coletar
+            sink: StreamingCSVSink opcional; cada página é gravada assim que chega
+                  e a coleta é retomada a partir do último cursor salvo
         """
         repositories = []
-        after_cursor = None
-        collected = 0
+        after_cursor = sink.cursor() if sink else None
+        collected = sink.rows() if sink else 0
 
         page_size = 40  # Tamanho da página menor para evitar timeouts
+        query = self.create_query()
 
+        if collected:
+            print(f"Retomando coleta a partir do repositório {collected + 1}...")
         print(f"Iniciando coleta de {total_repos} repositórios (páginas de {page_size})...")
 
         while collected < total_repos:
             remaining = total_repos - collected
             fetch_count = min(page_size, remaining)
 
-            query = self.create_query(fetch_count, after_cursor)
+            variables = self.create_variables(fetch_count, after_cursor)
 
             try:
-                response = self.make_request(query)
+                response = self.make_request(query, variables)
 
                 search_result = response['data']['search']
                 edges = search_result['edges']
+                page_info = search_result['pageInfo']
 
+                page = []
                 for edge in edges:
                     repo_data = self.extract_repository_data(edge['node'])
-                    repositories.append(repo_data)
+                    page.append(repo_data)
                     collected += 1
 
                     if collected % 10 == 0:
                         print(f"Coletados {collected}/{total_repos} repositórios...")
 
-                time.sleep(1)  
+                repositories.extend(page)
+                if sink:
+                    sink.append(page, page_info['endCursor'])
+
+                if not self.last_from_cache:
+                    time.sleep(1)
 
-                page_info = search_result['pageInfo']
                 if page_info['hasNextPage'] and collected < total_repos:
                     after_cursor = page_info['endCursor']
                 else:
@@ -182,5 +239,8 @@ class GitHubService:
                 time.sleep(1) 
                 continue
 
+        if sink:
+            sink.close()
+
         print(f"Coleta finalizada! {len(repositories)} repositórios coletados.")
         return repositories
\ No newline at end of file
@@ -0,0 +1,268 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from services.git import GitHubService, ResponseCache
+
+# A busca do GitHub devolve no máximo 1000 resultados por filtro
+SEARCH_RESULT_CAP = 1000
+
+
+class AsyncGitHubService(GitHubService):
+    def __init__(self, token: str, max_concurrency: int = 4, page_size: int = 40,
+                 min_stars: int = 2, rate_limit_floor: int = 50, max_retries: int = 5,
+                 cache: Optional[ResponseCache] = None):
+        """
+        Inicializa o coletor assíncrono do GitHub
+
+        A busca "stars:>1" é dividida em faixas disjuntas de estrelas
+        (shards) que são paginadas ao mesmo tempo, cada uma com seu próprio
+        cursor e seu próprio limite de 1000 resultados.
+
+        Args:
+            token: Token de acesso pessoal do GitHub
+            max_concurrency: Máximo de requisições simultâneas
+            page_size: Repositórios por página
+            min_stars: Menor número de estrelas considerado (stars:>1)
+            rate_limit_floor: Quantidade de pontos restantes que dispara a pausa até o reset
+            max_retries: Tentativas por requisição antes de desistir
+            cache: Cache persistente de respostas (opcional)
+        """
+        super().__init__(token, cache)
+        self.max_concurrency = max_concurrency
+        self.page_size = page_size
+        self.min_stars = min_stars
+        self.rate_limit_floor = rate_limit_floor
+        self.max_retries = max_retries
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._paused_until = 0.0
+
+    @staticmethod
+    def range_search(low: int, high: int) -> str:
+        """Filtro de busca para uma faixa fechada de estrelas, ordenada por estrelas."""
+        return f'stars:{low}..{high} sort:stars-desc'
+
+    def _update_rate_limit(self, headers) -> None:
+        """
+        Atualiza a pausa global a partir dos cabeçalhos de rate limit
+
+        Args:
+            headers: Cabeçalhos da resposta HTTP
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        retry_after = headers.get('Retry-After')
+
+        if retry_after is not None:
+            self._paused_until = max(self._paused_until, time.time() + int(retry_after))
+        elif remaining is not None and reset is not None and int(remaining) <= self.rate_limit_floor:
+            self._paused_until = max(self._paused_until, int(reset) + 1)
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Aguarda enquanto a cota da API estiver esgotada."""
+        wait = self._paused_until - time.time()
+        if wait > 0:
+            print(f"Rate limit baixo. Aguardando {wait:.0f} segundos...")
+            await asyncio.sleep(wait)
+
+    async def make_request_async(self, session: aiohttp.ClientSession, variables: Dict) -> Dict:
+        """
+        Faz a requisição GraphQL respeitando a concorrência máxima e o rate limit
+
+        Args:
+            session: Sessão HTTP compartilhada (pool de conexões)
+            variables: Variáveis da query de busca
+
+        Returns:
+            Resposta da API em formato dict
+        """
+        query = self.create_query()
+        if self.cache is not None:
+            cached = self.cache.get(query, variables)
+            if cached is not None:
+                return cached
+
+        payload = {'query': query, 'variables': variables}
+
+        for attempt in range(self.max_retries):
+            await self._wait_for_rate_limit()
+            # A espera entre tentativas fica fora do semáforo para não segurar a vaga dos outros shards
+            wait = None
+            async with self._semaphore:
+                try:
+                    async with session.post(self.url, json=payload) as response:
+                        self._update_rate_limit(response.headers)
+
+                        if response.status in (403, 429) or response.status >= 500:
+                            wait = 2 ** attempt
+                            print(f"Erro na requisição: {response.status}. Nova tentativa em {wait}s "
+                                  f"({attempt + 1}/{self.max_retries})")
+                        elif response.status != 200:
+                            raise Exception(f"Erro na requisição: {response.status}")
+                        else:
+                            data = await response.json()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    wait = 2 ** attempt
+                    print(f"Erro de conexão: {e}. Nova tentativa em {wait}s ({attempt + 1}/{self.max_retries})")
+
+            if wait is not None:
+                await asyncio.sleep(wait)
+                continue
+
+            if 'errors' in data:
+                raise Exception(f"Erro na query GraphQL: {data['errors']}")
+
+            if self.cache is not None:
+                self.cache.set(query, variables, data)
+            return data
+
+        raise Exception(f"Número máximo de tentativas excedido para {variables['searchQuery']}")
+
+    async def _count(self, session: aiohttp.ClientSession, low: int, high: int) -> int:
+        """Retorna quantos repositórios existem na faixa de estrelas [low, high]."""
+        variables = self.create_variables(1, None, self.range_search(low, high))
+        response = await self.make_request_async(session, variables)
+        return response['data']['search']['repositoryCount']
+
+    async def _max_stars(self, session: aiohttp.ClientSession) -> int:
+        """Retorna o número de estrelas do repositório mais popular."""
+        variables = self.create_variables(1, None, f'stars:>={self.min_stars} sort:stars-desc')
+        response = await self.make_request_async(session, variables)
+        edges = response['data']['search']['edges']
+        return edges[0]['node']['stargazerCount'] if edges else self.min_stars
+
+    async def plan_shards(self, session: aiohttp.ClientSession, total_repos: int) -> List[Tuple[int, int, int]]:
+        """
+        Divide a busca em faixas disjuntas de estrelas com até 1000 resultados cada
+
+        As faixas são subdivididas de cima para baixo (mais estrelas primeiro)
+        e o planejamento para assim que as faixas cobrem total_repos.
+
+        Args:
+            session: Sessão HTTP compartilhada
+            total_repos: Número de repositórios desejado
+
+        Returns:
+            Lista de (menor, maior, quantidade) em ordem decrescente de estrelas
+        """
+        high = await self._max_stars(session)
+        pending = [(self.min_stars, high, await self._count(session, self.min_stars, high))]
+        shards = []
+        covered = 0
+
+        while pending and covered < total_repos:
+            low, high, count = pending.pop()
+
+            if count <= SEARCH_RESULT_CAP or low == high:
+                if count:
+                    shards.append((low, high, count))
+                    covered += min(count, SEARCH_RESULT_CAP)
+                continue
+
+            # Divisão geométrica: a distribuição de estrelas é muito assimétrica
+            mid = min(max(int((low * high) ** 0.5), low), high - 1)
+            low_count, high_count = await asyncio.gather(
+                self._count(session, low, mid),
+                self._count(session, mid + 1, high)
+            )
+            pending.append((low, mid, low_count))
+            pending.append((mid + 1, high, high_count))
+
+        return shards
+
+    async def _collect_shard(self, session: aiohttp.ClientSession, low: int, high: int, limit: int,
+                             sink=None) -> List[Dict]:
+        """
+        Pagina uma faixa de estrelas até o limite informado
+
+        Args:
+            session: Sessão HTTP compartilhada
+            low: Menor número de estrelas da faixa
+            high: Maior número de estrelas da faixa
+            limit: Máximo de repositórios a coletar nesta faixa
+            sink: StreamingCSVSink opcional, com um cursor salvo por faixa
+
+        Returns:
+            Lista de repositórios processados nesta execução
+        """
+        repositories = []
+        search = self.range_search(low, high)
+        shard = f'{low}..{high}'
+        after_cursor = sink.cursor(shard) if sink else None
+        collected = sink.rows(shard) if sink else 0
+
+        while collected < limit:
+            fetch_count = min(self.page_size, limit - collected)
+            response = await self.make_request_async(session, self.create_variables(fetch_count, after_cursor, search))
+
+            search_result = response['data']['search']
+            page_info = search_result['pageInfo']
+            page = [self.extract_repository_data(edge['node']) for edge in search_result['edges']]
+            repositories.extend(page)
+            collected += len(page)
+            if sink:
+                sink.append(page, page_info['endCursor'], shard)
+
+            if not page_info['hasNextPage'] or not page:
+                break
+            after_cursor = page_info['endCursor']
+
+        print(f"Faixa {low}..{high} estrelas: {len(repositories)} repositórios coletados")
+        return repositories
+
+    async def collect_repositories_async(self, total_repos: int = 100, sink=None) -> List[Dict]:
+        """
+        Coleta os repositórios mais populares paginando várias faixas de estrelas ao mesmo tempo
+
+        Args:
+            total_repos: Número de repositórios a coletar
+            sink: StreamingCSVSink opcional; cada página é gravada assim que chega
+        """
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=60)
+
+        print(f"Iniciando coleta assíncrona de {total_repos} repositórios "
+              f"({self.max_concurrency} requisições simultâneas)...")
+
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector, timeout=timeout) as session:
+            # Ao retomar, usa as faixas do checkpoint: replanejar com as contagens
+            # atuais mudaria os limites e os cursores salvos por faixa se perderiam
+            plan = sink.shard_plan() if sink else None
+            if plan:
+                print(f"Retomando com as {len(plan)} faixas de estrelas do checkpoint")
+            else:
+                shards = await self.plan_shards(session, total_repos)
+                print(f"Busca dividida em {len(shards)} faixas de estrelas")
+
+                plan = []
+                remaining = total_repos
+                for low, high, count in shards:
+                    limit = min(count, SEARCH_RESULT_CAP, remaining)
+                    plan.append((low, high, limit))
+                    remaining -= limit
+                if sink:
+                    sink.save_shard_plan(plan)
+
+            tasks = [self._collect_shard(session, low, high, limit, sink) for low, high, limit in plan]
+            results = await asyncio.gather(*tasks)
+
+        # Faixas podem se sobrepor se um repositório ganhou estrelas durante a coleta
+        unique = {}
+        for shard_repositories in results:
+            for repo in shard_repositories:
+                unique.setdefault((repo['owner'], repo['name']), repo)
+
+        repositories = sorted(unique.values(), key=lambda r: r['stars'], reverse=True)[:total_repos]
+        if sink:
+            sink.close()
+        print(f"Coleta finalizada! {len(repositories)} repositórios coletados.")
+        return repositories
+
+    def collect_repositories(self, total_repos: int = 100, sink=None) -> List[Dict]:
+        """
+        Versão síncrona de collect_repositories_async, com a mesma assinatura de GitHubService
+        """
+        return asyncio.run(self.collect_repositories_async(total_repos, sink))
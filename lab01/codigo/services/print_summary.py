@@ -1,35 +1,27 @@
 import os
-from typing import Dict, List
-from collections import defaultdict
+from typing import Dict, List, Union
 
-import os
-import matplotlib.pyplot as plt
-
-# Import das classes de gráficos
-from plots.rq01_age_charts import RQ01AgeCharts
-from plots.rq02_prs_charts import RQ02PRsCharts
-from plots.rq03_releases_charts import RQ03ReleasesCharts
-from plots.rq04_updates_charts import RQ04UpdatesCharts
-from plots.rq05_languages_charts import RQ05LanguagesCharts
-from plots.rq06_issues_charts import RQ06IssuesCharts
+import numpy as np
 
-from plots.rq01_compare_idade import RQ01CompareAgeCharts
-from plots.rq02_compare_prs_charts import RQ02ComparePRsCharts 
-from plots.rq03_compare_releases_charts import RQ03CompareReleasesCharts
-from plots.rq04_compare_updates_charts import RQ04CompareUpdatesCharts
-from plots.rq06_compare_issues_charts import RQ06CompareIssuesCharts
+from services.repository_table import RepositoryTable
+from services.stats_engine import StatsEngine
 
+# Diretório de saída dos gráficos
+CHARTS_DIR = './lab01/relatorios/graficos'
 
 
 class CalculateMetrics:
     @staticmethod
-    def print_summary(repositories: List[Dict], output_md_filename: str = None):
+    def print_summary(repositories: Union[RepositoryTable, List[Dict]], output_md_filename: str = None, chart_workers: int = None,
+                      force_charts: bool = False):
         """
         Imprime um resumo dos dados coletados e salva em um arquivo .md
 
         Args:
-            repositories: Lista de repositórios
+            repositories: Tabela de repositórios (ou lista de repositórios)
             output_md_filename: Nome do arquivo .md para salvar o resumo (opcional)
+            chart_workers: Processos usados para gerar os gráficos (padrão: número de CPUs)
+            force_charts: Regera todos os gráficos mesmo que os dados não tenham mudado
         """
         if not repositories:
             print("Nenhum dado para resumir.")
@@ -40,57 +32,36 @@ class CalculateMetrics:
             print(line)
             output_lines.append(line + "\n")
         
-        # Dados básicos para todos os repositórios
-        ages = [repo['age_days'] for repo in repositories]
-        merged_prs = [repo['merged_pull_requests'] for repo in repositories]
-        releases = [repo['total_releases'] for repo in repositories]
-        days_since_updates = [repo['days_since_update'] for repo in repositories]
-        closed_ratios = [repo['closed_issues_ratio'] for repo in repositories if repo['total_issues'] > 0]
-
-        # Dados básicos para os 10 primeiros repositórios
-        top_10_repos = repositories[:10]  # Pega os 10 primeiros repositórios
-        top_10_ages = [repo['age_days'] for repo in top_10_repos]
-        top_10_merged_prs = [repo['merged_pull_requests'] for repo in top_10_repos]
-        top_10_releases = [repo['total_releases'] for repo in top_10_repos]
-        top_10_days_since_updates = [repo['days_since_update'] for repo in top_10_repos]
-        top_10_closed_ratios = [repo['closed_issues_ratio'] for repo in top_10_repos if repo['total_issues'] > 0]
-
-        languages = {}
-        for repo in repositories:
-            lang = repo['primary_language']
-            languages[lang] = languages.get(lang, 0) + 1
-        sorted_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)
-        top_languages = sorted_languages[:10]
-        
-        # Diretório de saída dos gráficos
-        base_dir = './lab01/relatorios/graficos'
-        if not os.path.exists(base_dir):
-            os.makedirs(base_dir)
+        # As estatísticas usam as colunas da tabela diretamente, sem copiar
+        engine = StatsEngine(repositories)
 
-        # Geração dos gráficos para todos os repos
-        rq01_hist_path, rq01_box_path = RQ01AgeCharts.generate(ages, base_dir, 'AllRepos')
-        rq02_hist_path, rq02_box_path = RQ02PRsCharts.generate(merged_prs, base_dir, 'AllRepos')
-        rq03_hist_path, rq03_box_path = RQ03ReleasesCharts.generate(releases, base_dir, 'AllRepos')
-        rq04_hist_path, rq04_box_path = RQ04UpdatesCharts.generate(days_since_updates, base_dir, 'AllRepos')
-        rq05_bar_path, rq05_pie_path = RQ05LanguagesCharts.generate(top_languages, base_dir, 'AllRepos')
-        
-        # Geração dos gráficos para top10 os repos
-        rq01_hist_top10, rq01_box_top10 = RQ01AgeCharts.generate(top_10_ages, base_dir, 'Top10Repos')
-        rq02_hist_top10, rq02_box_top10 = RQ02PRsCharts.generate(top_10_merged_prs, base_dir, 'Top10Repos')
-        rq03_hist_top10, rq03_box_top10 = RQ03ReleasesCharts.generate(top_10_releases, base_dir, 'Top10Repos')
-        rq04_hist_top10, rq04_box_top10 = RQ04UpdatesCharts.generate(top_10_days_since_updates, base_dir, 'Top10Repos')
-
-        rq06_hist_path, rq06_box_path = RQ06IssuesCharts.generate(closed_ratios, base_dir, 'AllRepos')
-        rq06_hist_top10, rq06_box_top10 = RQ06IssuesCharts.generate(top_10_closed_ratios, base_dir, 'Top10Repos')
-            
-        rq07_analysis = CalculateMetrics.analyze_rq07(repositories)
+        # Estatísticas de todos os repositórios e dos 10 primeiros
+        all_stats = engine.describe_metrics()
+        top_10_stats = engine.describe_metrics(10)
+        sorted_languages = engine.language_counts()
 
+        charts = CalculateMetrics.generate_charts(engine, chart_workers=chart_workers, force=force_charts)
 
-        rq01_compare_idade = RQ01CompareAgeCharts.generate(ages, top_10_ages, base_dir)
-        rq02_compare_prs = RQ02ComparePRsCharts.generate(merged_prs, top_10_merged_prs, base_dir)
-        rq03_compare_releases = RQ03CompareReleasesCharts.generate(releases, top_10_releases, base_dir)
-        rq04_compare_updates = RQ04CompareUpdatesCharts.generate(days_since_updates, top_10_days_since_updates, base_dir)
-        rq06_compare_issues = RQ06CompareIssuesCharts.generate(closed_ratios, top_10_closed_ratios, base_dir)
+        rq01_hist_path, rq01_box_path = charts['rq01_all']
+        rq02_hist_path, rq02_box_path = charts['rq02_all']
+        rq03_hist_path, rq03_box_path = charts['rq03_all']
+        rq04_hist_path, rq04_box_path = charts['rq04_all']
+        rq05_bar_path, rq05_pie_path = charts['rq05_all']
+        rq06_hist_path, rq06_box_path = charts['rq06_all']
+
+        rq01_hist_top10, rq01_box_top10 = charts['rq01_top10']
+        rq02_hist_top10, rq02_box_top10 = charts['rq02_top10']
+        rq03_hist_top10, rq03_box_top10 = charts['rq03_top10']
+        rq04_hist_top10, rq04_box_top10 = charts['rq04_top10']
+        rq06_hist_top10, rq06_box_top10 = charts['rq06_top10']
+
+        rq01_compare_idade = charts['rq01_compare']
+        rq02_compare_prs = charts['rq02_compare']
+        rq03_compare_releases = charts['rq03_compare']
+        rq04_compare_updates = charts['rq04_compare']
+        rq06_compare_issues = charts['rq06_compare']
+
+        rq07_analysis = CalculateMetrics.analyze_rq07(engine)
 
         # Início da impressão do resumo
         add_line("\n" + "=" * 50)
@@ -103,16 +74,16 @@ class CalculateMetrics:
         add_line(f"\n### Métrica: idade do repositório")
         
         add_line(f"\n**Para todos os repositórios:**")
-        median_age = sorted(ages)[len(ages) // 2]
+        median_age = all_stats['age_days']['median']
         add_line(f"  Mediana: {median_age} dias")
-        add_line(f"  Mín: {min(ages)} dias, Máx: {max(ages)} dias")
+        add_line(f"  Mín: {all_stats['age_days']['min']} dias, Máx: {all_stats['age_days']['max']} dias")
         add_line(f"![RQ01 Hist]({rq01_hist_path})\n")
         add_line(f"![RQ01 Box]({rq01_box_path})\n")
         
         add_line(f"\n**Para top10 repositórios:**")
-        top10_median_age = sorted(top_10_ages)[len(top_10_ages) // 2]
+        top10_median_age = top_10_stats['age_days']['median']
         add_line(f"  Mediana: {top10_median_age} dias")
-        add_line(f"  Mín: {min(top_10_ages)} dias, Máx: {max(top_10_ages)} dias")
+        add_line(f"  Mín: {top_10_stats['age_days']['min']} dias, Máx: {top_10_stats['age_days']['max']} dias")
         add_line(f"![RQ01 Hist]({rq01_hist_top10})\n")
         add_line(f"![RQ01 Box]({rq01_box_top10})\n")
         
@@ -126,16 +97,16 @@ class CalculateMetrics:
         add_line(f"\n### Métrica: Pull Requests Aceitas")
 
         add_line(f"\n**Para todos os repositórios:**")
-        median_prs = sorted(merged_prs)[len(merged_prs) // 2]
+        median_prs = all_stats['merged_pull_requests']['median']
         add_line(f"  Mediana: {median_prs}")
-        add_line(f"  Mín: {min(merged_prs)}, Máx: {max(merged_prs)}")
+        add_line(f"  Mín: {all_stats['merged_pull_requests']['min']}, Máx: {all_stats['merged_pull_requests']['max']}")
         add_line(f"![RQ02 Hist]({rq02_hist_path})\n")
         add_line(f"![RQ02 Box]({rq02_box_path})\n")
         
         add_line(f"\n**Para top10 repositórios:**")
-        top10_median_prs = sorted(top_10_merged_prs)[len(top_10_merged_prs) // 2]
+        top10_median_prs = top_10_stats['merged_pull_requests']['median']
         add_line(f"  Mediana: {top10_median_prs}")
-        add_line(f"  Mín: {min(top_10_merged_prs)}, Máx: {max(top_10_merged_prs)}")
+        add_line(f"  Mín: {top_10_stats['merged_pull_requests']['min']}, Máx: {top_10_stats['merged_pull_requests']['max']}")
         add_line(f"![RQ02 Hist]({rq02_hist_top10})\n")
         add_line(f"![RQ02 Box]({rq02_box_top10})\n")
         
@@ -148,16 +119,16 @@ class CalculateMetrics:
         add_line(f"\n### Métrica: Releases")
 
         add_line(f"\n**Para todos os repositórios:**")
-        median_releases = sorted(releases)[len(releases) // 2]
+        median_releases = all_stats['total_releases']['median']
         add_line(f"  Mediana: {median_releases}")
-        add_line(f"  Mín: {min(releases)}, Máx: {max(releases)}")
+        add_line(f"  Mín: {all_stats['total_releases']['min']}, Máx: {all_stats['total_releases']['max']}")
         add_line(f"![RQ03 Hist]({rq03_hist_path})\n")
         add_line(f"![RQ03 Box]({rq03_box_path})\n")
         
         add_line(f"\n**Para top10 repositórios:**")
-        top10_median_releases = sorted(top_10_releases)[len(top_10_releases) // 2]
+        top10_median_releases = top_10_stats['total_releases']['median']
         add_line(f"  Mediana: {top10_median_releases}")
-        add_line(f"  Mín: {min(top_10_releases)}, Máx: {max(top_10_releases)}")
+        add_line(f"  Mín: {top_10_stats['total_releases']['min']}, Máx: {top_10_stats['total_releases']['max']}")
         add_line(f"![RQ03 Hist]({rq03_hist_top10})\n")
         add_line(f"![RQ03 Box]({rq03_box_top10})\n")
 
@@ -170,16 +141,16 @@ class CalculateMetrics:
         add_line(f"\n### Métrica: Dias desde a última atualização")
         
         add_line(f"\n**Para todos os repositórios:**")
-        median_days_since_updates = sorted(days_since_updates)[len(days_since_updates) // 2]
+        median_days_since_updates = all_stats['days_since_update']['median']
         add_line(f"  Mediana: {median_days_since_updates} dias")
-        add_line(f"  Mín: {min(days_since_updates)} dias, Máx: {max(days_since_updates)} dias")
+        add_line(f"  Mín: {all_stats['days_since_update']['min']} dias, Máx: {all_stats['days_since_update']['max']} dias")
         add_line(f"![RQ04 Hist]({rq04_hist_path})\n")
         add_line(f"![RQ04 Box]({rq04_box_path})\n")
         
         add_line(f"\n**Para top10 repositórios:**")
-        top10_median_days_since_updates = sorted(top_10_days_since_updates)[len(top_10_days_since_updates) // 2]
+        top10_median_days_since_updates = top_10_stats['days_since_update']['median']
         add_line(f"  Mediana: {top10_median_days_since_updates} dias")
-        add_line(f"  Mín: {min(top_10_days_since_updates)} dias, Máx: {max(top_10_days_since_updates)} dias")
+        add_line(f"  Mín: {top_10_stats['days_since_update']['min']} dias, Máx: {top_10_stats['days_since_update']['max']} dias")
         add_line(f"![RQ04 Hist]({rq04_hist_top10})\n")
         add_line(f"![RQ04 Box]({rq04_box_top10})\n")
 
@@ -201,18 +172,18 @@ class CalculateMetrics:
         # RQ06: Percentual de issues fechadas       
         add_line(f"\n## RQ 06. Sistemas populares possuem um alto percentual de issues fechadas? ")
         add_line(f"\n### Razão entre número de issues fechadas pelo total de issues")
-        median_closed_ratios = sorted(closed_ratios)[len(closed_ratios) // 2]
+        median_closed_ratios = all_stats['closed_issues_ratio']['median']
 
         add_line(f"\n**Para todos os repositórios:**")
         add_line(f"  Mediana: {median_closed_ratios:.2f}%")
-        add_line(f"  Mín: {min(closed_ratios):.2f}%, Máx: {max(closed_ratios):.2f}%")
+        add_line(f"  Mín: {all_stats['closed_issues_ratio']['min']:.2f}%, Máx: {all_stats['closed_issues_ratio']['max']:.2f}%")
         add_line(f"![RQ06 Hist]({rq06_hist_path})\n")
         add_line(f"![RQ06 Box]({rq06_box_path})\n")
 
         add_line(f"\n**Para top10 repositórios:**")
-        top10_median_closed_ratios = sorted(top_10_closed_ratios)[len(top_10_closed_ratios) // 2]
+        top10_median_closed_ratios = top_10_stats['closed_issues_ratio']['median']
         add_line(f"  Mediana: {top10_median_closed_ratios:.2f}%")
-        add_line(f"  Mín: {min(top_10_closed_ratios):.2f}%, Máx: {max(top_10_closed_ratios):.2f}%")
+        add_line(f"  Mín: {top_10_stats['closed_issues_ratio']['min']:.2f}%, Máx: {top_10_stats['closed_issues_ratio']['max']:.2f}%")
         add_line(f"![RQ06 Hist]({rq06_hist_top10})\n")
         add_line(f"![RQ06 Box]({rq06_box_top10})\n")
 
@@ -274,102 +245,155 @@ class CalculateMetrics:
             print(f"\nResumo salvo em {output_md_filename}")
             
     @staticmethod
-    def analyze_by_language(repositories: List[Dict]) -> Dict:
+    def generate_charts(engine: StatsEngine, base_dir: str = CHARTS_DIR, chart_workers: int = None,
+                        force: bool = False) -> Dict:
+        """
+        Gera os gráficos das RQs 01 a 06 (todos os repositórios, top 10 e comparativos)
+
+        As classes de gráficos (e o matplotlib) só são importadas aqui, para que
+        a coleta e o resumo sem gráficos não paguem esse custo.
+
+        Args:
+            engine: Colunas dos repositórios
+            base_dir: Diretório de saída dos gráficos
+            chart_workers: Processos usados para gerar os gráficos (padrão: número de CPUs)
+            force: Regera todos os gráficos mesmo que os dados não tenham mudado
+
+        Returns:
+            Dicionário chave do gráfico -> caminhos das imagens
+        """
+        from plots.rq01_age_charts import RQ01AgeCharts
+        from plots.rq02_prs_charts import RQ02PRsCharts
+        from plots.rq03_releases_charts import RQ03ReleasesCharts
+        from plots.rq04_updates_charts import RQ04UpdatesCharts
+        from plots.rq05_languages_charts import RQ05LanguagesCharts
+        from plots.rq06_issues_charts import RQ06IssuesCharts
+
+        from plots.rq01_compare_idade import RQ01CompareAgeCharts
+        from plots.rq02_compare_prs_charts import RQ02ComparePRsCharts
+        from plots.rq03_compare_releases_charts import RQ03CompareReleasesCharts
+        from plots.rq04_compare_updates_charts import RQ04CompareUpdatesCharts
+        from plots.rq06_compare_issues_charts import RQ06CompareIssuesCharts
+        from plots.render_pipeline import ChartRenderer, ChartSpec
+
+        # Dados para todos os repositórios
+        ages = engine.column('age_days')
+        merged_prs = engine.column('merged_pull_requests')
+        releases = engine.column('total_releases')
+        days_since_updates = engine.column('days_since_update')
+        closed_ratios = engine.column('closed_issues_ratio')
+        top_languages = engine.language_counts()[:10]
+
+        # Dados para os 10 primeiros repositórios
+        top_10_ages = engine.column('age_days', 10)
+        top_10_merged_prs = engine.column('merged_pull_requests', 10)
+        top_10_releases = engine.column('total_releases', 10)
+        top_10_days_since_updates = engine.column('days_since_update', 10)
+        top_10_closed_ratios = engine.column('closed_issues_ratio', 10)
+
+        if not os.path.exists(base_dir):
+            os.makedirs(base_dir)
+
+        # Geração dos gráficos (em paralelo; gráficos com os mesmos dados são pulados)
+        specs = [
+            # Todos os repos
+            ChartSpec('rq01_all', RQ01AgeCharts.generate, (ages, base_dir, 'AllRepos')),
+            ChartSpec('rq02_all', RQ02PRsCharts.generate, (merged_prs, base_dir, 'AllRepos')),
+            ChartSpec('rq03_all', RQ03ReleasesCharts.generate, (releases, base_dir, 'AllRepos')),
+            ChartSpec('rq04_all', RQ04UpdatesCharts.generate, (days_since_updates, base_dir, 'AllRepos')),
+            ChartSpec('rq05_all', RQ05LanguagesCharts.generate, (top_languages, base_dir, 'AllRepos')),
+            ChartSpec('rq06_all', RQ06IssuesCharts.generate, (closed_ratios, base_dir, 'AllRepos')),
+
+            # Top10 repos
+            ChartSpec('rq01_top10', RQ01AgeCharts.generate, (top_10_ages, base_dir, 'Top10Repos')),
+            ChartSpec('rq02_top10', RQ02PRsCharts.generate, (top_10_merged_prs, base_dir, 'Top10Repos')),
+            ChartSpec('rq03_top10', RQ03ReleasesCharts.generate, (top_10_releases, base_dir, 'Top10Repos')),
+            ChartSpec('rq04_top10', RQ04UpdatesCharts.generate, (top_10_days_since_updates, base_dir, 'Top10Repos')),
+            ChartSpec('rq06_top10', RQ06IssuesCharts.generate, (top_10_closed_ratios, base_dir, 'Top10Repos')),
+
+            # Comparativos
+            ChartSpec('rq01_compare', RQ01CompareAgeCharts.generate, (ages, top_10_ages, base_dir)),
+            ChartSpec('rq02_compare', RQ02ComparePRsCharts.generate, (merged_prs, top_10_merged_prs, base_dir)),
+            ChartSpec('rq03_compare', RQ03CompareReleasesCharts.generate, (releases, top_10_releases, base_dir)),
+            ChartSpec('rq04_compare', RQ04CompareUpdatesCharts.generate, (days_since_updates, top_10_days_since_updates, base_dir)),
+            ChartSpec('rq06_compare', RQ06CompareIssuesCharts.generate, (closed_ratios, top_10_closed_ratios, base_dir)),
+        ]
+        return ChartRenderer(chart_workers, output_dir=base_dir, force=force).render(specs)
+
+    @staticmethod
+    def analyze_by_language(engine: StatsEngine) -> Dict:
             """
             Analisa dados agrupados por linguagem para RQ07 (BÔNUS)
             Args:
-                repositories: Lista de repositórios
+                engine: StatsEngine com as colunas dos repositórios
             Returns:
                 Dicionário com análise por linguagem
             """
-            by_language = defaultdict(list)
-            for repo in repositories:
-                lang = repo['primary_language']
-                by_language[lang].append(repo)
+            groups = engine.group_stats(
+                ['merged_pull_requests', 'total_releases', 'days_since_update'], min_count=3
+            )
 
             language_stats = {}
-            for lang, repos in by_language.items():
-                if len(repos) < 3:
-                    continue
-                merged_prs = [repo['merged_pull_requests'] for repo in repos]
-                releases = [repo['total_releases'] for repo in repos]
-                days_since_update = [repo['days_since_update'] for repo in repos]
-
+            for lang, stats in groups.items():
                 language_stats[lang] = {
-                    'count': len(repos),
-                    'median_merged_prs': sorted(merged_prs)[len(merged_prs) // 2],
-                    'median_releases': sorted(releases)[len(releases) // 2],
-                    'median_days_since_update': sorted(days_since_update)[len(days_since_update) // 2],
-                    'avg_merged_prs': sum(merged_prs) / len(merged_prs),
-                    'avg_releases': sum(releases) / len(releases),
-                    'avg_days_since_update': sum(days_since_update) / len(days_since_update)
+                    'count': stats['count'],
+                    'median_merged_prs': stats['merged_pull_requests']['median'],
+                    'median_releases': stats['total_releases']['median'],
+                    'median_days_since_update': stats['days_since_update']['median'],
+                    'avg_merged_prs': stats['merged_pull_requests']['mean'],
+                    'avg_releases': stats['total_releases']['mean'],
+                    'avg_days_since_update': stats['days_since_update']['mean']
                 }
             return language_stats
         
     @staticmethod
-    def get_popular_languages(repositories: List[Dict], top_n: int = 5) -> List[str]:
+    def get_popular_languages(engine: StatsEngine, top_n: int = 5) -> List[str]:
             """
             Identifica as linguagens mais populares
 
             Args:
-                repositories: Lista de repositórios
+                engine: StatsEngine com as colunas dos repositórios
                 top_n: Número de linguagens mais populares para retornar
 
             Returns:
                 Lista das linguagens mais populares
             """
-            language_count = defaultdict(int)
-
-            for repo in repositories:
-                language_count[repo['primary_language']] += 1
-
-            sorted_languages = sorted(language_count.items(), key=lambda x: x[1], reverse=True)
-            return [lang for lang, count in sorted_languages[:top_n]]
+            return [lang for lang, count in engine.language_counts()[:top_n]]
 
     @staticmethod
-    def analyze_rq07(repositories: List[Dict]) -> Dict:
+    def analyze_rq07(engine: StatsEngine) -> Dict:
             """
             Análise específica para RQ07 (BÔNUS)
             Compara linguagens populares vs outras linguagens
 
             Args:
-                repositories: Lista de repositórios
+                engine: StatsEngine com as colunas dos repositórios
 
             Returns:
                 Dicionário com análise comparativa
             """
-            popular_languages = CalculateMetrics.get_popular_languages(repositories, 5)
+            popular_languages = CalculateMetrics.get_popular_languages(engine, 5)
+            popular_codes = [engine.languages.index(lang) for lang in popular_languages]
+            is_popular = np.isin(engine.language_codes, popular_codes)
 
-            popular_repos = []
-            other_repos = []
-
-            for repo in repositories:
-                if repo['primary_language'] in popular_languages:
-                    popular_repos.append(repo)
-                else:
-                    other_repos.append(repo)
-
-            def calc_medians(repos_list):
-                if not repos_list:
+            def calc_medians(mask):
+                count = int(mask.sum())
+                if count == 0:
                     return {'median_prs': 0, 'median_releases': 0, 'median_days_update': 0, 'count': 0}
 
-                prs = sorted([r['merged_pull_requests'] for r in repos_list])
-                releases = sorted([r['total_releases'] for r in repos_list])
-                days = sorted([r['days_since_update'] for r in repos_list])
-
                 return {
-                    'median_prs': prs[len(prs) // 2],
-                    'median_releases': releases[len(releases) // 2],
-                    'median_days_update': days[len(days) // 2],
-                    'count': len(repos_list)
+                    'median_prs': engine.describe(engine.columns['merged_pull_requests'][mask])['median'],
+                    'median_releases': engine.describe(engine.columns['total_releases'][mask])['median'],
+                    'median_days_update': engine.describe(engine.columns['days_since_update'][mask])['median'],
+                    'count': count
                 }
 
-            popular_stats = calc_medians(popular_repos)
-            other_stats = calc_medians(other_repos)
+            popular_stats = calc_medians(is_popular)
+            other_stats = calc_medians(~is_popular)
 
             return {
                 'popular_languages': popular_languages,
                 'popular_stats': popular_stats,
                 'other_stats': other_stats,
-                'by_language': CalculateMetrics.analyze_by_language(repositories)
-            }
\ No newline at end of file
+                'by_language': CalculateMetrics.analyze_by_language(engine)
+            }
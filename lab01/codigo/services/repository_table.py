@@ -0,0 +1,177 @@
+import csv
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from services.save_to_csv import REPOSITORY_FIELDS
+
+# Tipo de cada coluna; contagens cabem em int32 (o maior repositório tem ~500 mil estrelas)
+COLUMN_TYPES = {
+    'name': object,
+    'owner': object,
+    'stars': np.int32,
+    'created_at': 'datetime64[s]',
+    'updated_at': 'datetime64[s]',
+    'age_days': np.int32,
+    'days_since_update': np.int32,
+    'merged_pull_requests': np.int32,
+    'total_releases': np.int32,
+    'primary_language': np.int16,  # código da linguagem (ver RepositoryTable.languages)
+    'total_issues': np.int32,
+    'closed_issues': np.int32,
+    'closed_issues_ratio': np.float64,
+}
+
+DATE_FIELDS = ('created_at', 'updated_at')
+
+
+class RepositoryTable:
+    """
+    Repositórios coletados guardados em colunas NumPy tipadas.
+
+    Substitui a lista de dicionários (um dict por repositório) usada pelas
+    análises: cada métrica é um único array contíguo, as datas são
+    datetime64 e a linguagem é um código inteiro (int16) com a lista de
+    nomes em ``languages``, na ordem da primeira aparição. Fatias como o
+    top 10 são views, sem cópia.
+    """
+
+    __slots__ = ('size', 'columns', 'languages')
+
+    def __init__(self, columns: Dict[str, np.ndarray], languages: List[str]):
+        """
+        Inicializa a tabela
+
+        Args:
+            columns: Dicionário coluna -> array (já no tipo de COLUMN_TYPES)
+            languages: Nomes das linguagens, indexados pelo código da coluna primary_language
+        """
+        self.columns = columns
+        self.languages = languages
+        self.size = len(columns['stars'])
+
+    def __len__(self) -> int:
+        return self.size
+
+    @staticmethod
+    def _encode_languages(values: Iterable[str]):
+        """Converte nomes de linguagem em códigos, na ordem da primeira aparição."""
+        index = {}
+        codes = [index.setdefault(lang, len(index)) for lang in values]
+        return np.array(codes, dtype=COLUMN_TYPES['primary_language']), list(index)
+
+    @staticmethod
+    def _parse_dates(values: Iterable[str]) -> np.ndarray:
+        """Converte datas ISO 8601 do GitHub (ex: 2014-12-24T17:49:19Z) para datetime64."""
+        return np.array([value.rstrip('Z') for value in values], dtype='datetime64[s]')
+
+    @staticmethod
+    def from_columns(raw: Dict[str, Iterable]) -> 'RepositoryTable':
+        """
+        Monta a tabela a partir de colunas ainda não tipadas
+
+        Args:
+            raw: Dicionário coluna -> sequência de valores (strings ou números)
+
+        Returns:
+            RepositoryTable com as colunas convertidas
+        """
+        columns = {}
+        languages = []
+        for field in REPOSITORY_FIELDS:
+            values = raw[field]
+            if field == 'primary_language':
+                columns[field], languages = RepositoryTable._encode_languages(values)
+            elif field in DATE_FIELDS:
+                columns[field] = RepositoryTable._parse_dates(values)
+            elif COLUMN_TYPES[field] is object:
+                columns[field] = np.array(list(values), dtype=object)
+            else:
+                columns[field] = np.asarray(values, dtype=COLUMN_TYPES[field])
+        return RepositoryTable(columns, languages)
+
+    @staticmethod
+    def from_records(repositories: List[Dict]) -> 'RepositoryTable':
+        """
+        Monta a tabela a partir da lista de repositórios devolvida pelos coletores
+
+        Args:
+            repositories: Lista de repositórios
+
+        Returns:
+            RepositoryTable
+        """
+        return RepositoryTable.from_columns({
+            field: [repo[field] for repo in repositories] for field in REPOSITORY_FIELDS
+        })
+
+    @staticmethod
+    def read_csv(filename: str) -> 'RepositoryTable':
+        """
+        Lê o CSV de repositórios direto para colunas (sem pandas)
+
+        Args:
+            filename: Caminho do CSV
+
+        Returns:
+            RepositoryTable
+        """
+        raw = {field: [] for field in REPOSITORY_FIELDS}
+        with open(filename, newline='', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                for field in REPOSITORY_FIELDS:
+                    raw[field].append(row[field])
+
+        for field, dtype in COLUMN_TYPES.items():
+            if dtype == np.float64:
+                raw[field] = [float(value) for value in raw[field]]
+            elif dtype == np.int32:
+                raw[field] = [int(value) for value in raw[field]]
+        return RepositoryTable.from_columns(raw)
+
+    @staticmethod
+    def read_parquet(filename: str) -> 'RepositoryTable':
+        """
+        Lê o arquivo Parquet de repositórios
+
+        Args:
+            filename: Caminho do Parquet
+
+        Returns:
+            RepositoryTable
+        """
+        import pandas as pd
+
+        df = pd.read_parquet(filename, columns=REPOSITORY_FIELDS)
+        return RepositoryTable.from_columns({field: df[field].to_numpy() for field in REPOSITORY_FIELDS})
+
+    @staticmethod
+    def read(csv_filename: str, parquet_filename: Optional[str] = None) -> 'RepositoryTable':
+        """
+        Lê os repositórios do Parquet, se estiver atualizado, ou do CSV
+
+        Args:
+            csv_filename: Caminho do CSV
+            parquet_filename: Caminho do Parquet (opcional)
+
+        Returns:
+            RepositoryTable
+        """
+        if (parquet_filename and os.path.exists(parquet_filename)
+                and os.path.getmtime(parquet_filename) >= os.path.getmtime(csv_filename)):
+            return RepositoryTable.read_parquet(parquet_filename)
+        return RepositoryTable.read_csv(csv_filename)
+
+    def column(self, field: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Retorna uma coluna (view, sem cópia)
+
+        Args:
+            field: Nome da coluna
+            limit: Considera apenas os primeiros N repositórios (ex: top 10)
+
+        Returns:
+            Array da coluna
+        """
+        return self.columns[field][:limit]
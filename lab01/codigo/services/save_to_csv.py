@@ -1,26 +1,32 @@
 import csv
+import json
 import os
-from typing import Dict, List
-from collections import defaultdict
+from typing import Dict, List, Optional
+
+REPOSITORY_FIELDS = [
+    'name', 'owner', 'stars', 'created_at', 'updated_at', 'age_days',
+    'days_since_update', 'merged_pull_requests', 'total_releases',
+    'primary_language', 'total_issues', 'closed_issues', 'closed_issues_ratio'
+]
 
-import os
-import matplotlib.pyplot as plt
 
 class SaveToCSV:
     @staticmethod
-    def save_to_csv(self, repositories: List[Dict], filename: str = 'github_repositories.csv'):
+    def save_to_csv(repositories: List[Dict], filename: str = 'github_repositories.csv',
+                    parquet_filename: Optional[str] = None):
         """
         Salva os dados dos repositórios em arquivo CSV
 
         Args:
             repositories: Lista de repositórios
             filename: Nome do arquivo CSV
+            parquet_filename: Nome do arquivo Parquet (opcional)
         """
         # Verifica se o diretório existe e cria se não existir
         dir_name = os.path.dirname(filename)
-        if not os.path.exists(dir_name):
+        if dir_name and not os.path.exists(dir_name):
             os.makedirs(dir_name)
-        
+
         if not repositories:
             print("Nenhum dado para salvar.")
             return
@@ -32,4 +38,194 @@ class SaveToCSV:
             writer.writeheader()
             writer.writerows(repositories)
 
-        print(f"Dados salvos em {filename}")
\ No newline at end of file
+        print(f"Dados salvos em {filename}")
+
+        if parquet_filename:
+            SaveToCSV.csv_to_parquet(filename, parquet_filename)
+
+    @staticmethod
+    def csv_to_parquet(csv_filename: str, parquet_filename: str):
+        """
+        Converte o CSV de repositórios para Parquet (colunar), que carrega bem mais rápido
+
+        Args:
+            csv_filename: Caminho do CSV de origem
+            parquet_filename: Caminho do arquivo Parquet de destino
+        """
+        import pandas as pd
+
+        df = pd.read_csv(csv_filename, encoding='utf-8')
+        df.to_parquet(parquet_filename, index=False)
+        print(f"Dados salvos em {parquet_filename}")
+
+
+class StreamingCSVSink:
+    """
+    Grava repositórios no CSV página a página, com checkpoint após cada página.
+
+    As linhas vão para um arquivo temporário (<arquivo>.partial). Cada chamada
+    a append() grava as linhas, força o flush em disco (fsync) e atualiza o
+    checkpoint (<arquivo>.checkpoint.json) com o cursor da página e o tamanho
+    do temporário. Ao retomar, o temporário é truncado para o último
+    checkpoint, então uma página gravada pela metade não gera linhas
+    duplicadas. Só close() substitui o CSV definitivo (os.replace) e apaga o
+    checkpoint: até lá, o CSV da coleta anterior continua intacto.
+    """
+
+    def __init__(self, filename: str, fieldnames: Optional[List[str]] = None,
+                 parquet_filename: Optional[str] = None, resume: bool = True):
+        """
+        Inicializa o sink
+
+        Args:
+            filename: Caminho do CSV de saída
+            fieldnames: Colunas do CSV (padrão: REPOSITORY_FIELDS)
+            parquet_filename: Caminho do Parquet gerado em close() (opcional)
+            resume: Se False, descarta a coleta parcial e o checkpoint existentes. Sem
+                    checkpoint, a coleta recomeça do zero (o CSV antigo só é
+                    substituído ao final, em close())
+        """
+        self.filename = filename
+        self.partial_filename = f"{filename}.partial"
+        self.checkpoint_filename = f"{filename}.checkpoint.json"
+        self.fieldnames = fieldnames or REPOSITORY_FIELDS
+        self.parquet_filename = parquet_filename
+
+        dir_name = os.path.dirname(filename)
+        if dir_name and not os.path.exists(dir_name):
+            os.makedirs(dir_name)
+
+        # Checkpoint sem o temporário correspondente não tem como ser retomado
+        if (not resume or not os.path.exists(self.checkpoint_filename)
+                or not os.path.exists(self.partial_filename)):
+            for path in (self.partial_filename, self.checkpoint_filename):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self.checkpoint = self.load_checkpoint()
+        self._truncate_to_checkpoint()
+
+    def load_checkpoint(self) -> Dict:
+        """
+        Lê o último checkpoint salvo
+
+        Returns:
+            Dicionário com offset, rows e cursors (cursor e linhas por shard)
+        """
+        if not os.path.exists(self.checkpoint_filename):
+            return {'offset': 0, 'rows': 0, 'cursors': {}}
+
+        with open(self.checkpoint_filename, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _truncate_to_checkpoint(self):
+        """Remove do temporário o que foi gravado depois do último checkpoint."""
+        if not os.path.exists(self.partial_filename):
+            return
+
+        if os.path.getsize(self.partial_filename) > self.checkpoint['offset']:
+            with open(self.partial_filename, 'r+b') as f:
+                f.truncate(self.checkpoint['offset'])
+                f.flush()
+                os.fsync(f.fileno())
+
+    def cursor(self, shard: str = 'default') -> Optional[str]:
+        """Retorna o último cursor salvo para o shard, ou None."""
+        return self.checkpoint['cursors'].get(shard, {}).get('cursor')
+
+    def rows(self, shard: Optional[str] = None) -> int:
+        """Retorna quantas linhas já foram gravadas (no total ou no shard)."""
+        if shard is None:
+            return self.checkpoint['rows']
+        return self.checkpoint['cursors'].get(shard, {}).get('rows', 0)
+
+    def shard_plan(self) -> Optional[List[List[int]]]:
+        """Retorna as faixas (menor, maior, limite) salvas no checkpoint, ou None."""
+        return self.checkpoint.get('plan')
+
+    def save_shard_plan(self, plan: List):
+        """
+        Grava no checkpoint as faixas da coleta, reaproveitadas ao retomar
+
+        As faixas dependem do total de estrelas e das contagens da busca no
+        momento do planejamento; replanejar depois de uma falha mudaria os
+        limites e os cursores salvos por faixa deixariam de valer.
+
+        Args:
+            plan: Lista de (menor, maior, limite) por faixa
+        """
+        self.checkpoint['plan'] = [list(shard) for shard in plan]
+        self._write_checkpoint()
+
+    def append(self, repositories: List[Dict], cursor: Optional[str], shard: str = 'default'):
+        """
+        Acrescenta uma página ao CSV e grava o checkpoint
+
+        Args:
+            repositories: Repositórios da página
+            cursor: Cursor (endCursor) da página
+            shard: Identificador do shard da busca (ex: faixa de estrelas)
+        """
+        write_header = not os.path.exists(self.partial_filename) or os.path.getsize(self.partial_filename) == 0
+
+        with open(self.partial_filename, 'a', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=self.fieldnames, extrasaction='ignore')
+            if write_header:
+                writer.writeheader()
+            writer.writerows(repositories)
+            csvfile.flush()
+            os.fsync(csvfile.fileno())
+        offset = os.path.getsize(self.partial_filename)
+
+        shard_state = self.checkpoint['cursors'].setdefault(shard, {'cursor': None, 'rows': 0})
+        shard_state['cursor'] = cursor
+        shard_state['rows'] += len(repositories)
+        self.checkpoint['rows'] += len(repositories)
+        self.checkpoint['offset'] = offset
+        self._write_checkpoint()
+
+    def _write_checkpoint(self):
+        """Grava o checkpoint de forma atômica (arquivo temporário + rename)."""
+        tmp_filename = f"{self.checkpoint_filename}.tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.checkpoint_filename)
+
+    def _deduplicate(self):
+        """Remove do temporário repositórios repetidos (owner, name), mantendo a primeira ocorrência."""
+        if not {'owner', 'name'} <= set(self.fieldnames):
+            return
+
+        tmp_filename = f"{self.partial_filename}.tmp"
+        seen = set()
+        with open(self.partial_filename, newline='', encoding='utf-8') as src, \
+                open(tmp_filename, 'w', newline='', encoding='utf-8') as dst:
+            reader = csv.DictReader(src)
+            writer = csv.DictWriter(dst, fieldnames=reader.fieldnames)
+            writer.writeheader()
+            for row in reader:
+                key = (row['owner'], row['name'])
+                if key not in seen:
+                    seen.add(key)
+                    writer.writerow(row)
+        os.replace(tmp_filename, self.partial_filename)
+
+        if len(seen) < self.checkpoint['rows']:
+            print(f"{self.checkpoint['rows'] - len(seen)} repositórios repetidos removidos")
+            self.checkpoint['rows'] = len(seen)
+
+    def close(self):
+        """Publica o CSV completo no lugar do anterior, apaga o checkpoint e gera o Parquet, se configurado."""
+        if not self.checkpoint['rows']:
+            print(f"Nenhum repositório coletado; {self.filename} não foi alterado")
+            return
+
+        self._deduplicate()
+        os.replace(self.partial_filename, self.filename)
+        if os.path.exists(self.checkpoint_filename):
+            os.remove(self.checkpoint_filename)
+        print(f"{self.checkpoint['rows']} repositórios salvos em {self.filename}")
+        if self.parquet_filename:
+            SaveToCSV.csv_to_parquet(self.filename, self.parquet_filename)
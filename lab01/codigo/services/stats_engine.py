@@ -0,0 +1,146 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from services.repository_table import RepositoryTable
+
+# Métricas numéricas usadas nas RQs 01-04, 06 e 07
+METRIC_FIELDS = [
+    'age_days', 'merged_pull_requests', 'total_releases',
+    'days_since_update', 'closed_issues_ratio'
+]
+
+# RQ06 só considera repositórios que têm issues
+ISSUE_METRICS = {'closed_issues_ratio'}
+
+
+class StatsEngine:
+    """
+    Calcula as estatísticas do resumo a partir das colunas NumPy da RepositoryTable.
+
+    As medianas seguem a mesma convenção usada no relatório até aqui
+    (sorted(x)[len(x) // 2], ou seja, a mediana superior), então os números
+    não mudam; a diferença é que cada coluna é selecionada com np.partition
+    em vez de ser ordenada várias vezes, e as estatísticas por linguagem saem
+    de uma única ordenação por (linguagem, valor).
+    """
+
+    def __init__(self, repositories: Union[RepositoryTable, List[Dict]]):
+        """
+        Usa as colunas da tabela de repositórios
+
+        Args:
+            repositories: RepositoryTable (ou lista de repositórios, convertida uma vez)
+        """
+        if not isinstance(repositories, RepositoryTable):
+            repositories = RepositoryTable.from_records(repositories)
+
+        self.table = repositories
+        self.size = len(repositories)
+        self.columns = {field: repositories.column(field) for field in METRIC_FIELDS}
+        self.has_issues = repositories.column('total_issues') > 0
+
+        # A tabela já codifica as linguagens na ordem da primeira aparição
+        self.languages = repositories.languages
+        self.language_codes = repositories.column('primary_language').astype(np.intp)
+
+    def column(self, field: str, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Retorna os valores de uma métrica
+
+        Args:
+            field: Nome da métrica
+            limit: Considera apenas os primeiros N repositórios (ex: top 10)
+
+        Returns:
+            Array com os valores (sem repositórios sem issues, para a RQ06)
+        """
+        values = self.columns[field][:limit]
+        if field in ISSUE_METRICS:
+            values = values[self.has_issues[:limit]]
+        return values
+
+    @staticmethod
+    def describe(values: np.ndarray) -> Dict:
+        """
+        Calcula contagem, mínimo, quartis, mediana, máximo e média em uma única seleção
+
+        Args:
+            values: Valores da métrica
+
+        Returns:
+            Dicionário com as estatísticas
+        """
+        n = len(values)
+        if n == 0:
+            return {'count': 0, 'min': 0, 'q1': 0, 'median': 0, 'q3': 0, 'max': 0, 'mean': 0}
+
+        kth = [0, n // 4, n // 2, (3 * n) // 4, n - 1]
+        selected = np.partition(values, kth)[kth]
+        return {
+            'count': n,
+            'min': selected[0].item(),
+            'q1': selected[1].item(),
+            'median': selected[2].item(),
+            'q3': selected[3].item(),
+            'max': selected[4].item(),
+            'mean': values.mean().item()
+        }
+
+    def describe_metrics(self, limit: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Calcula as estatísticas de todas as métricas
+
+        Args:
+            limit: Considera apenas os primeiros N repositórios (ex: top 10)
+
+        Returns:
+            Dicionário métrica -> estatísticas
+        """
+        return {field: self.describe(self.column(field, limit)) for field in METRIC_FIELDS}
+
+    def language_counts(self) -> List[Tuple[str, int]]:
+        """
+        Conta repositórios por linguagem
+
+        Returns:
+            Lista (linguagem, quantidade) em ordem decrescente; empates ficam na ordem de aparição
+        """
+        counts = np.bincount(self.language_codes, minlength=len(self.languages))
+        order = np.argsort(-counts, kind='stable')
+        return [(self.languages[i], int(counts[i])) for i in order]
+
+    def group_stats(self, fields: Sequence[str], mask: Optional[np.ndarray] = None,
+                    min_count: int = 1) -> Dict[str, Dict]:
+        """
+        Calcula contagem, mediana e média de cada métrica por linguagem
+
+        Para cada métrica, os valores são ordenados uma única vez por
+        (linguagem, valor); as medianas de todos os grupos são então lidas
+        por indexação, sem laço em Python por grupo.
+
+        Args:
+            fields: Métricas a calcular
+            mask: Filtro booleano de repositórios (opcional)
+            min_count: Tamanho mínimo do grupo para ser incluído
+
+        Returns:
+            Dicionário linguagem -> {'count', '<métrica>': {'median', 'mean'}}
+        """
+        codes = self.language_codes if mask is None else self.language_codes[mask]
+        counts = np.bincount(codes, minlength=len(self.languages))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        present = np.flatnonzero(counts >= max(min_count, 1))
+
+        result = {self.languages[g]: {'count': int(counts[g])} for g in present}
+
+        for field in fields:
+            values = self.columns[field] if mask is None else self.columns[field][mask]
+            sorted_values = values[np.lexsort((values, codes))]
+            medians = sorted_values[starts[present] + counts[present] // 2]
+            means = np.bincount(codes, weights=values, minlength=len(self.languages))[present] / counts[present]
+
+            for g, median, mean in zip(present, medians, means):
+                result[self.languages[g]][field] = {'median': median.item(), 'mean': mean.item()}
+
+        return result
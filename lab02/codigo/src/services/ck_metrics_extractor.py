@@ -1,13 +1,37 @@
+import hashlib
+import json
+import mmap
 import os
+import re
 import shutil
 import subprocess
 import sys
+import time
 import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
+from git import Repo
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Protocol
+from typing import Dict, Any, List, Optional, Protocol, Tuple
 from abc import abstractmethod
 
+# Estimativa de heap da JVM do CK: base fixa + MB por MB de código Java, limitada ao intervalo abaixo
+CK_HEAP_BASE_MB = 256
+CK_HEAP_PER_SOURCE_MB = 8
+CK_HEAP_MIN_MB = 512
+CK_HEAP_MAX_MB = 4096
+# Memória da JVM fora do heap (metaspace, threads, code cache) contabilizada por job
+CK_JVM_OVERHEAD_MB = 256
+CK_TIMEOUT_SECONDS = 300
+# Versão do formato/cálculo das métricas em cache; incrementar quando a extração mudar
+METRICS_CACHE_VERSION = 3
+# Métricas que dependem só do conteúdo do commit (as demais vêm do CSV e da data atual)
+CACHED_PROCESS_METRICS = ('size_loc', 'size_comments_loc')
+# Diretórios ignorados na busca por arquivos Java (VCS e saídas de build)
+SKIPPED_DIRS = {'.git', 'target', 'build'}
+# Abaixo deste volume de código a contagem de linhas roda no próprio processo
+LOC_PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
 
 class MetricsExtractor(Protocol):
     """Interface para extrator de métricas."""
@@ -40,12 +64,228 @@ class MetricsStorage(Protocol):
         """
         pass
 
+# Arquivos Java por repositório durante a análise em andamento (ver find_java_files)
+_JAVA_FILES: Dict[str, List[Tuple[str, int]]] = {}
+
+
+def scan_java_files(repo_path: str) -> List[Tuple[str, int]]:
+    """
+    Varre o repositório com os.scandir, ignorando SKIPPED_DIRS.
+    
+    Args:
+        repo_path (str): Caminho do repositório
+        
+    Returns:
+        List[Tuple[str, int]]: (caminho, tamanho em bytes) de cada arquivo .java, em ordem
+    """
+    files = []
+    stack = [repo_path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIPPED_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.java') and entry.is_file():
+                            files.append((entry.path, entry.stat().st_size))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    files.sort()
+    return files
+
+
+def find_java_files(repo_path: str) -> List[Tuple[str, int]]:
+    """
+    Lista os arquivos .java do repositório com seus tamanhos.
+    
+    A varredura fica guardada até forget_java_files, então os extratores de
+    processo e de qualidade da mesma análise compartilham uma única
+    varredura. No pool, a lista feita pelo processo principal para estimar
+    o heap é entregue ao worker com share_java_files.
+    
+    Args:
+        repo_path (str): Caminho do repositório
+        
+    Returns:
+        List[Tuple[str, int]]: (caminho, tamanho em bytes) de cada arquivo, em ordem
+    """
+    key = os.path.abspath(repo_path)
+    if key not in _JAVA_FILES:
+        _JAVA_FILES[key] = scan_java_files(key)
+    return _JAVA_FILES[key]
+
+
+def share_java_files(repo_path: str, java_files: List[Tuple[str, int]]) -> None:
+    """Registra uma varredura já feita para ser usada por find_java_files."""
+    _JAVA_FILES[os.path.abspath(repo_path)] = list(java_files)
+
+
+def forget_java_files(repo_path: str) -> None:
+    """Descarta a varredura do repositório (o conteúdo pode mudar até a próxima análise)."""
+    _JAVA_FILES.pop(os.path.abspath(repo_path), None)
+
+
+_LINE_TOKENS = re.compile(rb'/\*|//|"|\'')
+
+
+def _classify_line(line: bytes, in_block: bool) -> Tuple[bool, bool, bool]:
+    """
+    Classifica uma linha Java que contém '/' ou está dentro de um comentário de bloco.
+    
+    Args:
+        line (bytes): Linha sem espaços nas pontas
+        in_block (bool): Se a linha começa dentro de /* ... */
+        
+    Returns:
+        Tuple[bool, bool, bool]: (tem código, tem comentário, termina dentro de bloco)
+    """
+    has_code = has_comment = False
+    i, n = 0, len(line)
+    while i < n:
+        if in_block:
+            has_comment = True
+            end = line.find(b'*/', i)
+            if end == -1:
+                break
+            in_block = False
+            i = end + 2
+            continue
+        
+        match = _LINE_TOKENS.search(line, i)
+        stop = match.start() if match else n
+        if line[i:stop].strip():
+            has_code = True
+        if match is None:
+            break
+        
+        token = match.group()
+        if token == b'//':
+            has_comment = True
+            break
+        if token == b'/*':
+            in_block = True
+            i = match.end()
+            continue
+        
+        # Literal de string/char: pula até a aspa de fechamento não escapada
+        has_code = True
+        j = match.end()
+        while True:
+            j = line.find(token, j)
+            if j == -1:
+                j = n
+                break
+            backslashes = 0
+            while line[j - 1 - backslashes] == 0x5C:
+                backslashes += 1
+            j += 1
+            if backslashes % 2 == 0:
+                break
+        i = j
+    return has_code, has_comment, in_block
+
+
+def _count_file_lines(path: str) -> Tuple[int, int]:
+    """
+    Conta linhas de código e de comentário de um arquivo Java.
+    
+    O arquivo é mapeado em memória e percorrido como bytes. Linhas sem '/'
+    fora de comentário são código sem mais análise; só as demais passam pelo
+    classificador. Linhas com código e comentário contam como código.
+    
+    Args:
+        path (str): Caminho do arquivo
+        
+    Returns:
+        Tuple[int, int]: (linhas de código, linhas de comentário)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm.find(b'/') == -1:
+                return sum(1 for line in mm.read().splitlines() if line.strip()), 0
+            lines = mm.read().splitlines()
+    
+    loc = comment_lines = 0
+    in_block = False
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        # Casos comuns resolvidos sem o classificador
+        if in_block:
+            end = line.find(b'*/')
+            if end == -1:
+                comment_lines += 1
+                continue
+            if end == len(line) - 2:
+                comment_lines += 1
+                in_block = False
+                continue
+        elif b'/' not in line:
+            loc += 1
+            continue
+        elif line.startswith(b'//'):
+            comment_lines += 1
+            continue
+        elif line.startswith(b'/*'):
+            end = line.find(b'*/', 2)
+            if end == -1 or end == len(line) - 2:
+                comment_lines += 1
+                in_block = end == -1
+                continue
+        elif b'/*' not in line and b'//' not in line:
+            loc += 1
+            continue
+        
+        has_code, has_comment, in_block = _classify_line(line, in_block)
+        if has_code:
+            loc += 1
+        elif has_comment:
+            comment_lines += 1
+    return loc, comment_lines
+
+
+def _count_files_lines(paths: List[str]) -> Tuple[int, int]:
+    """
+    Soma linhas de código e de comentário de um bloco de arquivos.
+    
+    Args:
+        paths (List[str]): Arquivos do bloco
+        
+    Returns:
+        Tuple[int, int]: (linhas de código, linhas de comentário)
+    """
+    total_loc = total_comment_lines = 0
+    for path in paths:
+        try:
+            loc, comment_lines = _count_file_lines(path)
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Erro ao processar arquivo {path}: {e}")
+            continue
+        total_loc += loc
+        total_comment_lines += comment_lines
+    return total_loc, total_comment_lines
+
+
 class ProcessMetricsExtractor:
     """Extrai métricas de processo do repositório usando dados do CSV."""
     
-    def __init__(self):
-        """Inicializa o extrator e carrega dados do CSV."""
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Inicializa o extrator e carrega dados do CSV.
+        
+        Args:
+            max_workers (Optional[int]): Processos da contagem de linhas (padrão: número de CPUs; 1 desativa o pool)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.csv_data = self._load_csv_data()
+        self._build_indexes()
     
     def _load_csv_data(self) -> pd.DataFrame:
         """
@@ -74,18 +314,127 @@ class ProcessMetricsExtractor:
             print(f"[ERRO] Falha ao carregar CSV: {e}")
             return pd.DataFrame()
     
-    def extract(self, repo_path: str) -> Dict[str, Any]:
+    @staticmethod
+    def _normalize(value: Any) -> str:
+        """Chave de busca: texto sem espaços nas pontas e em minúsculas."""
+        return str(value).strip().lower()
+    
+    @staticmethod
+    def _fuzzy_key(value: Any) -> str:
+        """Chave aproximada: só letras e dígitos, em minúsculas ("Phil-Jay/MP.Chart" -> "philjaympchart")."""
+        return re.sub(r'[^a-z0-9]', '', str(value).lower())
+    
+    @staticmethod
+    def _github_path(url: Any) -> str:
+        """
+        Extrai "owner/repo" de uma URL do GitHub (https ou ssh).
+        
+        Args:
+            url (Any): URL do repositório
+            
+        Returns:
+            str: Caminho normalizado ou '' se não for uma URL do GitHub
+        """
+        url = str(url).strip()
+        if url.endswith('.git'):
+            url = url[:-4]
+        for prefix in ('git@github.com:', 'https://github.com/', 'http://github.com/', 'ssh://git@github.com/'):
+            if url.startswith(prefix):
+                return url[len(prefix):].strip('/').lower()
+        return ''
+    
+    def _build_indexes(self) -> None:
+        """
+        Monta os índices de busca do CSV (chave -> posição da primeira linha).
+        
+        Índices: name_with_owner normalizado, name normalizado, caminho da
+        coluna url e a chave aproximada de name_with_owner, que casa com o
+        nome da pasta clonada ("owner-repo") mesmo quando o owner tem hífen.
+        """
+        self._by_name_with_owner: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        self._by_url_path: Dict[str, int] = {}
+        self._by_fuzzy: Dict[str, int] = {}
+        
+        df = self.csv_data
+        if df.empty:
+            return
+        
+        if 'name_with_owner' in df.columns:
+            for pos, value in enumerate(df['name_with_owner']):
+                if pd.notna(value):
+                    self._by_name_with_owner.setdefault(self._normalize(value), pos)
+                    self._by_fuzzy.setdefault(self._fuzzy_key(value), pos)
+        if 'name' in df.columns:
+            for pos, value in enumerate(df['name']):
+                if pd.notna(value):
+                    self._by_name.setdefault(self._normalize(value), pos)
+        if 'url' in df.columns:
+            for pos, value in enumerate(df['url']):
+                path = self._github_path(value) if pd.notna(value) else ''
+                if path:
+                    self._by_url_path.setdefault(path, pos)
+    
+    def _find_csv_row(self, repo_name: str, owner: Optional[str], repo_path: str) -> Optional[pd.Series]:
+        """
+        Localiza a linha do repositório no CSV pelos índices.
+        
+        A URL remota (GitPython) só é consultada quando nenhum índice casa
+        com o nome da pasta.
+        
+        Args:
+            repo_name (str): Nome do repositório
+            owner (Optional[str]): Nome do proprietário (owner)
+            repo_path (str): Caminho do repositório local
+            
+        Returns:
+            Optional[pd.Series]: Linha encontrada ou None
+        """
+        pos = None
+        if owner:
+            expected = f"{owner}/{repo_name}"
+            pos = self._by_name_with_owner.get(self._normalize(expected))
+            if pos is not None:
+                print(f"[DEBUG] Encontrado por name_with_owner: {expected}")
+            else:
+                pos = self._by_fuzzy.get(self._fuzzy_key(f"{owner}{repo_name}"))
+                if pos is not None:
+                    print(f"[DEBUG] Encontrado por nome aproximado: {owner}-{repo_name}")
+        
+        if pos is None:
+            pos = self._by_name.get(self._normalize(repo_name))
+            if pos is not None:
+                print(f"[DEBUG] Encontrado por nome: {repo_name}")
+        
+        if pos is None:
+            try:
+                remote_url = list(Repo(repo_path).remotes.origin.urls)[0]
+                path = self._github_path(remote_url)
+                if path:
+                    pos = self._by_name_with_owner.get(path)
+                    if pos is not None:
+                        print(f"[DEBUG] Encontrado por name_with_owner via URL: {path}")
+                    else:
+                        pos = self._by_url_path.get(path)
+                        if pos is not None:
+                            print(f"[DEBUG] Encontrado por URL: {path}")
+            except Exception as e:
+                print(f"[AVISO] Erro ao extrair URL remota: {e}")
+        
+        return self.csv_data.iloc[pos] if pos is not None else None
+    
+    def extract(self, repo_path: str, count_lines: bool = True) -> Dict[str, Any]:
         """
         Extrai métricas de processo usando dados do CSV.
         
         Args:
             repo_path (str): Caminho para o repositório Git local
+            count_lines (bool): Conta as linhas de código (False quando já estão em cache)
             
         Returns:
             Dict[str, Any]: Dicionário contendo métricas de processo
         """
         try:
-            repo = Repo(repo_path)
             repo_dir = os.path.basename(repo_path)   # ex: "PhilJay-MPAndroidChart"
 
             if '-' in repo_dir:
@@ -100,11 +449,12 @@ class ProcessMetricsExtractor:
                 'repository_name': repo_name
             }
             
-            csv_metrics = self._get_csv_metrics(repo_name, owner, repo)
+            csv_metrics = self._get_csv_metrics(repo_name, owner, repo_path)
             metrics.update(csv_metrics)
             
-            loc_metrics = self._count_lines_of_code(repo_path)
-            metrics.update(loc_metrics)
+            if count_lines:
+                loc_metrics = self._count_lines_of_code(repo_path)
+                metrics.update(loc_metrics)
             
             return metrics
             
@@ -112,14 +462,14 @@ class ProcessMetricsExtractor:
             print(f"Erro ao extrair métricas de processo: {e}")
             return self._get_default_process_metrics(repo_path)
 
-    def _get_csv_metrics(self, repo_name: str, owner: str, repo: Repo) -> Dict[str, Any]:
+    def _get_csv_metrics(self, repo_name: str, owner: str, repo_path: str) -> Dict[str, Any]:
         """
         Obtém métricas do repositório a partir do CSV.
 
         Args:
             repo_name (str): Nome do repositório
             owner (str): Nome do proprietário (owner)
-            repo (Repo): Objeto GitPython do repositório
+            repo_path (str): Caminho do repositório local
 
         Returns:
             Dict[str, Any]: Métricas extraídas do CSV
@@ -128,50 +478,9 @@ class ProcessMetricsExtractor:
             if self.csv_data.empty:
                 return self._get_default_csv_metrics()
 
-            df = self.csv_data
-            repo_row = None
-
-            if owner and 'name_with_owner' in df.columns:
-                expected = f"{owner}/{repo_name}"
-                match = df[df['name_with_owner'] == expected]
-                if not match.empty:
-                    repo_row = match
-                    print(f"[DEBUG] Encontrado por name_with_owner: {expected}")
-
-            if repo_row is None or repo_row.empty:
-                if 'name' in df.columns:
-                    match2 = df[df['name'] == repo_name]
-                    if not match2.empty:
-                        repo_row = match2
-                        print(f"[DEBUG] Encontrado por nome: {repo_name}")
-
-            if (repo_row is None or repo_row.empty) and hasattr(repo, 'remotes'):
-                try:
-                    remote_url = list(repo.remotes.origin.urls)[0]
-                    if remote_url.endswith('.git'):
-                        remote_url = remote_url[:-4]
-                    if 'github.com' in remote_url:
-                        if remote_url.startswith('git@github.com:'):
-                            path = remote_url.split(':', 1)[1]
-                        elif remote_url.startswith('https://github.com/'):
-                            path = remote_url.split('https://github.com/', 1)[1]
-                        else:
-                            path = ''
-                        if path and 'name_with_owner' in df.columns:
-                            match3 = df[df['name_with_owner'] == path]
-                            if not match3.empty:
-                                repo_row = match3
-                                print(f"[DEBUG] Encontrado por name_with_owner via URL: {path}")
-                        if (repo_row is None or repo_row.empty) and 'url' in df.columns:
-                            match4 = df[df['url'].str.contains(path, na=False, regex=False)]
-                            if not match4.empty:
-                                repo_row = match4
-                                print(f"[DEBUG] Encontrado por URL: {path}")
-                except Exception as e:
-                    print(f"[AVISO] Erro ao extrair URL remota: {e}")
+            row = self._find_csv_row(repo_name, owner, repo_path)
 
-            if repo_row is not None and not repo_row.empty:
-                row = repo_row.iloc[0]
+            if row is not None:
                 print(f"[+] Repositório encontrado no CSV: {repo_name}")
 
                 metrics: Dict[str, Any] = {}
@@ -285,50 +594,34 @@ class ProcessMetricsExtractor:
         """
         Conta linhas de código Java no repositório.
         
+        Repositórios grandes são divididos em blocos de volume parecido e
+        contados em um pool de processos.
+        
         Args:
             repo_path (str): Caminho do repositório
             
         Returns:
             Dict[str, int]: Dicionário com contadores de linhas
         """
-        java_files = list(Path(repo_path).rglob("*.java"))
-        
-        total_loc = 0
-        total_comment_lines = 0
+        java_files = find_java_files(repo_path)
+        total_bytes = sum(size for _, size in java_files)
         
-        for java_file in java_files:
-            try:
-                with open(java_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                loc = 0
-                comment_lines = 0
-                in_block_comment = False
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                        
-                    if '/*' in line:
-                        in_block_comment = True
-                        comment_lines += 1
-                    elif '*/' in line:
-                        in_block_comment = False
-                        comment_lines += 1
-                    elif in_block_comment:
-                        comment_lines += 1
-                    elif line.startswith('//'):
-                        comment_lines += 1
-                    else:
-                        loc += 1
-                
-                total_loc += loc
-                total_comment_lines += comment_lines
-                
-            except Exception as e:
-                print(f"Aviso: Erro ao processar arquivo {java_file}: {e}")
-                continue
+        if self.max_workers == 1 or total_bytes < LOC_PARALLEL_MIN_BYTES:
+            total_loc, total_comment_lines = _count_files_lines([path for path, _ in java_files])
+        else:
+            n_chunks = self.max_workers * 4
+            chunks = [[] for _ in range(n_chunks)]
+            chunk_bytes = [0] * n_chunks
+            # Maiores primeiro, sempre no bloco mais leve
+            for path, size in sorted(java_files, key=lambda item: item[1], reverse=True):
+                lightest = chunk_bytes.index(min(chunk_bytes))
+                chunks[lightest].append(path)
+                chunk_bytes[lightest] += size
+            
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                counts = list(executor.map(_count_files_lines, [chunk for chunk in chunks if chunk]))
+            total_loc = sum(loc for loc, _ in counts)
+            total_comment_lines = sum(comment_lines for _, comment_lines in counts)
         
         return {
             'size_loc': total_loc,
@@ -361,18 +654,24 @@ class ProcessMetricsExtractor:
 class QualityMetricsExtractor:
     """Extrai métricas de qualidade CK do repositório com detecção robusta de Java."""
     
-    def __init__(self, ck_jar_path: str):
+    def __init__(self, ck_jar_path: str, timeout: int = CK_TIMEOUT_SECONDS, heap_mb: Optional[int] = None):
         """
         Inicializa o extrator de métricas CK.
         
         Args:
             ck_jar_path (str): Caminho para o arquivo JAR da ferramenta CK
+            timeout (int): Tempo limite de cada execução do CK, em segundos
+            heap_mb (Optional[int]): Heap máximo da JVM (-Xmx) em MB; None usa o padrão da JVM
             
         Raises:
             FileNotFoundError: Se o JAR não for encontrado
             EnvironmentError: Se Java não for encontrado
         """
         self.ck_jar_path = os.path.abspath(ck_jar_path)
+        self.timeout = timeout
+        self.heap_mb = heap_mb
+        # Argumentos do CK após o caminho: use_jars, max_files_per_partition, variables_and_fields
+        self.ck_options = ['false', '0', 'false']
         self.java_executable = self._find_java_executable()
         
         if not os.path.exists(self.ck_jar_path):
@@ -575,13 +874,13 @@ class QualityMetricsExtractor:
         java_files = self._find_java_files(repo_path)
         print(f"[DEBUG] Arquivos .java encontrados: {len(java_files)}")
         
-        cmd = [
-            self.java_executable,
+        cmd = [self.java_executable]
+        if self.heap_mb:
+            cmd.append(f'-Xmx{self.heap_mb}m')
+        cmd += [
             '-jar', self.ck_jar_path,
             repo_path,
-            'false',
-            '0',
-            'false',
+            *self.ck_options,
             ck_output_dir + os.sep
         ]
         
@@ -593,7 +892,7 @@ class QualityMetricsExtractor:
                 check=True,
                 capture_output=True,
                 text=True,
-                timeout=300
+                timeout=self.timeout
             )
             
             print(f"[+] CK Tool executado com sucesso")
@@ -609,7 +908,7 @@ class QualityMetricsExtractor:
                 print(f"[+] class.csv gerado com {class_csv_size} bytes")
                 
         except subprocess.TimeoutExpired:
-            raise Exception("CK Tool excedeu tempo limite de 5 minutos")
+            raise Exception(f"CK Tool excedeu tempo limite de {self.timeout} segundos")
         except subprocess.CalledProcessError as e:
             error_msg = f"CK Tool falhou com código {e.returncode}"
             if e.stderr:
@@ -630,12 +929,7 @@ class QualityMetricsExtractor:
         Returns:
             List[str]: Lista de caminhos para arquivos Java encontrados
         """
-        java_files = []
-        for root, dirs, files in os.walk(repo_path):
-            for file in files:
-                if file.endswith('.java'):
-                    java_files.append(os.path.join(root, file))
-        return java_files
+        return [path for path, _ in find_java_files(repo_path)]
     
     def _extract_ck_metrics_from_csv(self, class_csv_path: str) -> Dict[str, Any]:
         """
@@ -726,13 +1020,80 @@ class CSVMetricsStorage:
             print(f"Erro ao salvar métricas: {e}")
 
 
+def _json_default(value: Any) -> Any:
+    """Converte escalares numpy/pandas para tipos nativos ao gravar JSON."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class MetricsCache:
+    """
+    Cache em disco das métricas por repositório que dependem só do commit
+    (métricas CK e contagem de linhas).
+    
+    Cada entrada é um arquivo JSON nomeado pelo hash da chave (caminho do
+    repositório, SHA do HEAD, versão do ck.jar e opções do analisador).
+    Arquivos separados permitem que vários processos gravem ao mesmo tempo.
+    """
+    
+    def __init__(self, cache_dir: str = 'ck_metrics/cache'):
+        """
+        Inicializa o cache.
+        
+        Args:
+            cache_dir (str): Diretório das entradas do cache
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _entry_path(self, key: Dict[str, Any]) -> Path:
+        digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+    
+    def get(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Busca as métricas de uma chave.
+        
+        Args:
+            key (Dict[str, Any]): Chave do repositório
+            
+        Returns:
+            Optional[Dict[str, Any]]: Métricas em cache ou None
+        """
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry['metrics'] if entry.get('key') == key else None
+    
+    def put(self, key: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        """
+        Grava as métricas de uma chave (escrita atômica).
+        
+        Args:
+            key (Dict[str, Any]): Chave do repositório
+            metrics (Dict[str, Any]): Métricas a guardar
+        """
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'metrics': metrics}, f, default=_json_default, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[AVISO] Falha ao gravar cache de métricas: {e}")
+
+
 class RepositoryMetricsAnalyzer:
     """Classe principal que orquestra a extração de métricas."""
     
     def __init__(self,
                  process_extractor: ProcessMetricsExtractor,
                  quality_extractor: QualityMetricsExtractor,
-                 storage: CSVMetricsStorage):
+                 storage: CSVMetricsStorage,
+                 cache: Optional[MetricsCache] = None):
         """
         Inicializa o analisador de métricas.
         
@@ -740,10 +1101,13 @@ class RepositoryMetricsAnalyzer:
             process_extractor: Extrator de métricas de processo
             quality_extractor: Extrator de métricas de qualidade
             storage: Sistema de armazenamento
+            cache: Cache de métricas por commit (None desativa)
         """
         self.process_extractor = process_extractor
         self.quality_extractor = quality_extractor
         self.storage = storage
+        self.cache = cache
+        self._ck_jar_version: Optional[str] = None
     
     def analyze_repository(self, repo_path: str) -> Dict[str, Any]:
         """
@@ -765,18 +1129,42 @@ class RepositoryMetricsAnalyzer:
         print(f"[+] Analisando repositório: {repo_path}")
         print(f"{'='*60}")
         
-        print(f"\n[+] Extraindo métricas de processo...")
-        process_metrics = self.process_extractor.extract(repo_path)
-        
-        print(f"\n[+] Extraindo métricas de qualidade...")
-        quality_metrics = self.quality_extractor.extract(repo_path)
+        try:
+            cache_key = self._cache_key(repo_path) if self.cache else None
+            cached = self.cache.get(cache_key) if cache_key else None
         
-        all_metrics = {
-            **process_metrics,
-            **quality_metrics,
-            'analysis_timestamp': datetime.now().isoformat(),
-            'java_version': self._get_java_version(self.quality_extractor.java_executable)
-        }
+            if cached is not None:
+                # Só CK e LOC vêm do cache; dados do CSV e idade são recalculados a cada execução
+                print(f"[+] Métricas em cache para o commit {cache_key['head_sha'][:10]}, CK e LOC ignorados")
+                all_metrics = {
+                    **self.process_extractor.extract(repo_path, count_lines=False),
+                    **cached,
+                    'java_version': self._get_java_version(self.quality_extractor.java_executable)
+                }
+            else:
+                print(f"\n[+] Extraindo métricas de processo...")
+                process_metrics = self.process_extractor.extract(repo_path)
+            
+                print(f"\n[+] Extraindo métricas de qualidade...")
+                quality_metrics = self.quality_extractor.extract(repo_path)
+            
+                all_metrics = {
+                    **process_metrics,
+                    **quality_metrics,
+                    'analysis_timestamp': datetime.now().isoformat(),
+                    'java_version': self._get_java_version(self.quality_extractor.java_executable)
+                }
+            
+                # Falhas do CK voltam como zeros; só guarda análises que encontraram classes
+                if cache_key and quality_metrics.get('total_classes_analyzed', 0) > 0:
+                    self.cache.put(cache_key, {
+                        **{name: process_metrics[name] for name in CACHED_PROCESS_METRICS if name in process_metrics},
+                        **quality_metrics,
+                        'analysis_timestamp': all_metrics['analysis_timestamp']
+                    })
+        finally:
+            # A lista de arquivos vale só para esta análise; a próxima varre o repositório de novo
+            forget_java_files(repo_path)
         
         repo_name = os.path.basename(repo_path)
         filename = f"metrics_{repo_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
@@ -784,6 +1172,38 @@ class RepositoryMetricsAnalyzer:
         
         return all_metrics
     
+    def _cache_key(self, repo_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Monta a chave do cache de um repositório.
+        
+        Args:
+            repo_path (str): Caminho do repositório
+            
+        Returns:
+            Optional[Dict[str, Any]]: Chave ou None se o HEAD não puder ser lido
+        """
+        try:
+            head_sha = Repo(repo_path).head.commit.hexsha
+        except Exception as e:
+            print(f"[AVISO] HEAD não encontrado, cache ignorado: {e}")
+            return None
+        
+        if self._ck_jar_version is None:
+            # Hash do conteúdo do JAR: um novo build do CK invalida o cache
+            sha1 = hashlib.sha1()
+            with open(self.quality_extractor.ck_jar_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    sha1.update(block)
+            self._ck_jar_version = sha1.hexdigest()
+        
+        return {
+            'repository_path': os.path.abspath(repo_path),
+            'head_sha': head_sha,
+            'ck_jar_version': self._ck_jar_version,
+            'ck_options': list(self.quality_extractor.ck_options),
+            'metrics_version': METRICS_CACHE_VERSION,
+        }
+    
     def _get_java_version(self, java_executable: str) -> str:
         """
         Obtém a versão do Java usado.
@@ -873,7 +1293,8 @@ def analyze_single_repository():
     analyzer = RepositoryMetricsAnalyzer(
         process_extractor=process_extractor,
         quality_extractor=quality_extractor,
-        storage=storage
+        storage=storage,
+        cache=MetricsCache(script_dir / 'ck_metrics' / 'cache')
     )
     
     try:
@@ -889,8 +1310,106 @@ def analyze_single_repository():
         sys.exit(1)
 
 
-def analyze_all_repositories():
-    """Analisa todos os repositórios da pasta cloned_repos."""
+def estimate_ck_heap_mb(java_files: List[Tuple[str, int]]) -> int:
+    """
+    Estima o heap da JVM necessário para o CK a partir do tamanho do código Java.
+    
+    Args:
+        java_files (List[Tuple[str, int]]): Arquivos do repositório, como em find_java_files
+        
+    Returns:
+        int: Heap estimado em MB, entre CK_HEAP_MIN_MB e CK_HEAP_MAX_MB
+    """
+    source_bytes = sum(size for _, size in java_files)
+    heap_mb = CK_HEAP_BASE_MB + CK_HEAP_PER_SOURCE_MB * source_bytes / (1024 * 1024)
+    return int(min(max(heap_mb, CK_HEAP_MIN_MB), CK_HEAP_MAX_MB))
+
+
+def _available_memory_mb() -> Optional[int]:
+    """
+    Memória física disponível no momento, em MB.
+    
+    Usa MemAvailable de /proc/meminfo, que inclui o cache de páginas
+    recuperável; SC_AVPHYS_PAGES (só a memória livre) fica como alternativa
+    fora do Linux e subestima bastante a memória utilizável.
+    
+    Returns:
+        Optional[int]: Memória disponível ou None se o sistema não informar
+    """
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+# Analisador de cada processo do pool, criado uma vez pelo initializer (CSV e Java carregados uma só vez)
+_WORKER_ANALYZER: Optional[RepositoryMetricsAnalyzer] = None
+
+
+def _init_worker(ck_jar_path: str, timeout: int, use_cache: bool) -> None:
+    global _WORKER_ANALYZER
+    output_dir = Path(__file__).parent / 'ck_metrics'
+    _WORKER_ANALYZER = RepositoryMetricsAnalyzer(
+        # O pool já paraleliza entre repositórios; a contagem de linhas fica no processo
+        process_extractor=ProcessMetricsExtractor(max_workers=1),
+        quality_extractor=QualityMetricsExtractor(ck_jar_path, timeout=timeout),
+        storage=CSVMetricsStorage(output_dir, consolidate_only=True),
+        cache=MetricsCache(output_dir / 'cache') if use_cache else None
+    )
+
+
+def _analyze_repository_job(repo_path: str, heap_mb: int,
+                            java_files: List[Tuple[str, int]]) -> Tuple[Dict[str, Any], float]:
+    """
+    Analisa um repositório dentro de um processo do pool.
+    
+    Args:
+        repo_path (str): Caminho do repositório
+        heap_mb (int): Heap máximo da JVM do CK para este repositório
+        java_files (List[Tuple[str, int]]): Varredura feita pelo processo principal (evita varrer de novo)
+        
+    Returns:
+        Tuple[Dict[str, Any], float]: Métricas e duração da análise em segundos
+    """
+    start = time.monotonic()
+    share_java_files(repo_path, java_files)
+    _WORKER_ANALYZER.quality_extractor.heap_mb = heap_mb
+    metrics = _WORKER_ANALYZER.analyze_repository(repo_path)
+    return metrics, time.monotonic() - start
+
+
+def analyze_all_repositories(max_workers: int = 1, memory_fraction: float = 0.8,
+                             timeout: int = CK_TIMEOUT_SECONDS, use_cache: bool = True):
+    """
+    Analisa todos os repositórios da pasta cloned_repos.
+    
+    Com max_workers > 1 os repositórios são distribuídos em um pool de
+    processos. Cada job recebe um heap estimado pelo tamanho do código Java
+    e só é iniciado quando a soma dos heaps em execução cabe na fração
+    memory_fraction da memória disponível (um job maior que o orçamento
+    roda sozinho). Os repositórios maiores entram primeiro para não ficarem
+    no fim da fila. Cada resultado é gravado em um arquivo JSON Lines assim
+    que termina, então uma execução interrompida não perde o que já foi feito.
+    Com use_cache, repositórios cujo HEAD não mudou desde a última análise
+    (mesmo ck.jar e opções) reaproveitam as métricas do cache.
+    
+    Args:
+        max_workers (int): Número de análises simultâneas (1 roda em sequência no próprio processo)
+        memory_fraction (float): Fração da memória disponível reservada para as JVMs do CK
+        timeout (int): Tempo limite de cada execução do CK, em segundos
+        use_cache (bool): Reaproveita métricas de repositórios sem novos commits
+        
+    Returns:
+        List[Dict[str, Any]]: Métricas dos repositórios analisados, na ordem da pasta
+    """
     script_dir = Path(__file__).parent
     cloned_repos_dir = script_dir / "cloned_repos"
     
@@ -911,29 +1430,85 @@ def analyze_all_repositories():
     
     ck_jar_path = setup_ck_tool()
     
-    process_extractor = ProcessMetricsExtractor()
-    quality_extractor = QualityMetricsExtractor(ck_jar_path)
-    storage = CSVMetricsStorage(script_dir / 'ck_metrics', consolidate_only=True)  
-    
-    analyzer = RepositoryMetricsAnalyzer(
-        process_extractor=process_extractor,
-        quality_extractor=quality_extractor,
-        storage=storage
-    )
+    output_dir = script_dir / "ck_metrics"
+    output_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    stream_path = output_dir / f"all_metrics_{timestamp}.jsonl"
     
-    all_metrics = []
+    results: Dict[str, Dict[str, Any]] = {}
     errors = []
     
-    for i, repo_name in enumerate(repos, 1):
-        try:
-            print(f"\n[{i}/{len(repos)}] Processando: {repo_name}")
-            repo_path = cloned_repos_dir / repo_name
-            metrics = analyzer.analyze_repository(str(repo_path))
-            all_metrics.append(metrics)  # Acumula em memória
-        except Exception as e:
-            print(f"Erro ao processar {repo_name}: {e}")
-            errors.append({"repository": repo_name, "error": str(e)})
-            continue
+    with open(stream_path, 'w', encoding='utf-8') as stream:
+        def record(repo_name: str, metrics: Dict[str, Any]) -> None:
+            results[repo_name] = metrics
+            stream.write(json.dumps(metrics, default=_json_default, ensure_ascii=False) + '\n')
+            stream.flush()
+        
+        if max_workers <= 1:
+            process_extractor = ProcessMetricsExtractor()
+            quality_extractor = QualityMetricsExtractor(ck_jar_path, timeout=timeout)
+            storage = CSVMetricsStorage(output_dir, consolidate_only=True)
+            
+            analyzer = RepositoryMetricsAnalyzer(
+                process_extractor=process_extractor,
+                quality_extractor=quality_extractor,
+                storage=storage,
+                cache=MetricsCache(output_dir / 'cache') if use_cache else None
+            )
+            
+            for i, repo_name in enumerate(repos, 1):
+                try:
+                    print(f"\n[{i}/{len(repos)}] Processando: {repo_name}")
+                    repo_path = cloned_repos_dir / repo_name
+                    record(repo_name, analyzer.analyze_repository(str(repo_path)))
+                except Exception as e:
+                    print(f"Erro ao processar {repo_name}: {e}")
+                    errors.append({"repository": repo_name, "error": str(e)})
+                    continue
+        else:
+            # Varredura feita uma vez aqui: estima o heap e segue para o worker junto com o job
+            java_files = {repo_name: scan_java_files(str(cloned_repos_dir / repo_name)) for repo_name in repos}
+            heaps = {repo_name: estimate_ck_heap_mb(java_files[repo_name]) for repo_name in repos}
+            available_mb = _available_memory_mb()
+            budget_mb = available_mb * memory_fraction if available_mb else None
+            workers = min(max_workers, len(repos))
+            print(f"[+] Pool com {workers} processos; orçamento de memória: "
+                  f"{f'{budget_mb:.0f} MB' if budget_mb else 'desconhecido'}")
+            
+            pending = sorted(repos, key=lambda r: heaps[r], reverse=True)
+            running = {}
+            used_mb = 0
+            
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(ck_jar_path, timeout, use_cache)) as executor:
+                while pending or running:
+                    for repo_name in list(pending):
+                        if len(running) >= workers:
+                            break
+                        need_mb = heaps[repo_name] + CK_JVM_OVERHEAD_MB
+                        if running and budget_mb is not None and used_mb + need_mb > budget_mb:
+                            continue
+                        pending.remove(repo_name)
+                        future = executor.submit(_analyze_repository_job, str(cloned_repos_dir / repo_name),
+                                                 heaps[repo_name], java_files.pop(repo_name))
+                        running[future] = (repo_name, need_mb)
+                        used_mb += need_mb
+                    
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        repo_name, need_mb = running.pop(future)
+                        used_mb -= need_mb
+                        finished = len(results) + len(errors) + 1
+                        try:
+                            metrics, elapsed = future.result()
+                            record(repo_name, metrics)
+                            print(f"[{finished}/{len(repos)}] Concluído: {repo_name} "
+                                  f"({elapsed:.1f}s, heap {heaps[repo_name]} MB)")
+                        except Exception as e:
+                            print(f"Erro ao processar {repo_name}: {e}")
+                            errors.append({"repository": repo_name, "error": str(e)})
+    
+    all_metrics = [results[repo_name] for repo_name in repos if repo_name in results]
     
     print(f"\n{'='*60}")
     print(f"[+] Análise de {len(all_metrics)}/{len(repos)} repositórios concluída!")
@@ -942,14 +1517,14 @@ def analyze_all_repositories():
 
     if all_metrics:
         df = pd.DataFrame(all_metrics)
-        consolidated_path = script_dir / "ck_metrics" / f"all_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        consolidated_path = output_dir / f"all_metrics_{timestamp}.csv"
         df.to_csv(consolidated_path, index=False, encoding='utf-8')
         print(f"[+] Arquivo consolidado salvo em: {consolidated_path}")
     
 
     if errors:
         errors_df = pd.DataFrame(errors)
-        errors_path = script_dir / "ck_metrics" / f"errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        errors_path = output_dir / f"errors_{timestamp}.csv"
         errors_df.to_csv(errors_path, index=False, encoding='utf-8')
         print(f"[!] Arquivo de erros salvo em: {errors_path}")
     
@@ -969,9 +1544,12 @@ if __name__ == "__main__":
     print("Escolha o modo:")
     print("1. Analisar um repositório")
     print("2. Analisar todos os repositórios")
-    choice = input("Opção (1 ou 2): ").strip()
+    print("3. Analisar todos os repositórios em paralelo")
+    choice = input("Opção (1, 2 ou 3): ").strip()
     
     if choice == "2":
         analyze_all_repositories()
+    elif choice == "3":
+        analyze_all_repositories(max_workers=os.cpu_count() or 1)
     else:
         analyze_single_repository()
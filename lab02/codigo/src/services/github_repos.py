@@ -2,10 +2,18 @@ import requests
 import csv
 import time
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from shared import transport  # noqa: E402
+from shared.response_cache import ResponseCache  # noqa: E402
+
 # env_path = Path('../..') / '.env'
 # load_dotenv(env_path)
 # GITHUB_TOKEN = os.getenv('TOKEN')
@@ -16,6 +24,9 @@ with open("token.txt") as f:
 if not GITHUB_TOKEN:
     raise ValueError("Token não encontrado no arquivo .env")
 
+# Sessão HTTP (gravação/replay de cassettes com HTTP_TRANSPORT)
+SESSION = transport.session()
+
 HEADERS = {
     'Authorization': f'Bearer {GITHUB_TOKEN}',
     'Content-Type': 'application/json',
@@ -89,7 +100,7 @@ def format_disk_size(kb_size):
     else:
         return f"{kb_size} KB"
 
-def fetch_github_repos():
+def fetch_github_repos(cache=None):
     all_repos = []
     has_next_page = True
     end_cursor = None
@@ -107,18 +118,25 @@ def fetch_github_repos():
             }
             
             try:
-                response = requests.post(
-                    'https://api.github.com/graphql',
-                    json=payload,
-                    headers=HEADERS,
-                    timeout=30
-                )
+                data = cache.get(QUERY, variables) if cache is not None else None
+                if data is not None:
+                    response = None
+                else:
+                    response = SESSION.post(
+                        'https://api.github.com/graphql',
+                        json=payload,
+                        headers=HEADERS,
+                        timeout=30
+                    )
                 
-                if response.status_code == 200:
-                    data = response.json()
+                if response is None or response.status_code == 200:
+                    if response is not None:
+                        data = response.json()
                     if 'errors' in data:
                         print(f"Erros na resposta: {data['errors']}")
                         return all_repos
+                    if cache is not None and response is not None:
+                        cache.set(QUERY, variables, data)
                     
                     search_data = data['data']['search']
                     
@@ -146,6 +164,10 @@ def fetch_github_repos():
                     request_count += 1
                     print(f"Página {request_count}: {len(all_repos)} repositórios coletados")
                     
+                    if response is None:
+                        # Página reaproveitada do cache: sem custo de rate limit
+                        break
+                    
                     rate_limit_remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
                     if rate_limit_remaining < 10:
                         reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
@@ -224,7 +246,7 @@ def save_to_csv(repos):
 def main():
     print("Iniciando busca por repositórios Java Maven...")
     
-    repos = fetch_github_repos()
+    repos = fetch_github_repos(cache=ResponseCache())
     
     if repos:
         save_to_csv(repos)
@@ -1,41 +1,93 @@
 import pandas as pd
 import numpy as np
-import scipy.stats as stats
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import shapiro, spearmanr, pearsonr, mannwhitneyu
+from scipy.stats import mannwhitneyu
 import warnings
 warnings.filterwarnings('ignore')
+import argparse
 import os
+import sys
 
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from stats_engine import StatsEngine  # noqa: E402
+from bootstrap import BootstrapEngine  # noqa: E402
+from plot_renderer import (  # noqa: E402
+    FigureSpec, PlotRenderer, draw_boxplot, draw_distribution_grid, draw_qq_grid, histogram_inputs, qq_inputs,
+    scatter_spec,
+)
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    STRING_DTYPE = pd.StringDtype("python")
+
+# Colunas de texto lidas do CSV de PRs com strings Arrow (sem objetos Python por linha)
+TEXT_COLUMNS = ['repo_full_name', 'title', 'body', 'state']
+
+# Métricas numéricas dos PRs; o filtro de outliers corta cada uma no percentil 99
+OUTLIER_COLUMNS = ['diff_size', 'files_changed', 'time_to_close_hours',
+                   'body_length_chars', 'participant_count', 'total_comments', 'review_count']
+
+# Pares (variável, desfecho) de cada RQ, usados nos intervalos de confiança bootstrap
+RQ_PAIRS = {
+    'RQ01': ('diff_size', 'merged_bool'),
+    'RQ02': ('time_to_close_hours', 'merged_bool'),
+    'RQ03': ('body_length_chars', 'merged_bool'),
+    'RQ04_participant_count': ('participant_count', 'merged_bool'),
+    'RQ04_total_comments': ('total_comments', 'merged_bool'),
+    'RQ04_review_count': ('review_count', 'merged_bool'),
+    'RQ05': ('diff_size', 'review_count'),
+    'RQ06': ('time_to_close_hours', 'review_count'),
+    'RQ07': ('body_length_chars', 'review_count'),
+    'RQ08_participant_count': ('participant_count', 'review_count'),
+    'RQ08_total_comments': ('total_comments', 'review_count'),
+}
+# O bootstrap é opcional (--bootstrap): custa ~6 ms de CPU por reamostragem com ~60 mil PRs,
+# ou seja ~60 s de CPU para 10 mil reamostragens, divididos entre os núcleos disponíveis
+BOOTSTRAP_RESAMPLES = 10_000
+BOOTSTRAP_SEED = 42
 
 class PRDataAnalyzer:
     def __init__(self, repos_file, prs_file):
         self.repos_df = pd.read_csv(repos_file)
-        self.prs_df = pd.read_csv(prs_file)
+        self.prs_df = pd.read_csv(prs_file, dtype={col: STRING_DTYPE for col in TEXT_COLUMNS})
         self.results = {}
         self.normality_results = {}
+        self.outlier_thresholds = {}
+        self.engine = None
         
     def prepare_data(self):
+        """
+        Calcula as métricas derivadas e remove os outliers em uma única passada.
+
+        Os percentis 99 de todas as colunas são calculados juntos, sobre os
+        PRs fechados/mesclados, e aplicados com o filtro de estado em uma
+        única máscara: o resultado não depende da ordem das colunas.
+        """
         print("📊 Preparando dados para análise...")
         
-        self.prs_df['diff_size'] = self.prs_df['additions'] + self.prs_df['deletions']
-        self.prs_df['body_length_chars'] = self.prs_df['body'].fillna('').str.len()
-        self.prs_df['total_comments'] = self.prs_df['comments'] + self.prs_df['review_comments']
+        prs = self.prs_df.assign(
+            diff_size=self.prs_df['additions'] + self.prs_df['deletions'],
+            body_length_chars=self.prs_df['body'].astype(STRING_DTYPE).str.len().fillna(0).astype('int64'),
+            total_comments=self.prs_df['comments'] + self.prs_df['review_comments'],
+            merged_bool=self.prs_df['merged'] == True,
+        )
         
-        self.prs_df = self.prs_df[self.prs_df['state'].isin(['MERGED', 'CLOSED'])]
+        is_closed = prs['state'].isin(['MERGED', 'CLOSED']).to_numpy(dtype=bool, na_value=False)
         
-        self.prs_df['merged_bool'] = self.prs_df['merged'] == True
+        outlier_cols = [col for col in OUTLIER_COLUMNS if col in prs.columns]
+        values = prs[outlier_cols].to_numpy(dtype=float)
+        q99 = np.nanquantile(values[is_closed], 0.99, axis=0)
+        # NaN em qualquer coluna também descarta o PR (comparação falsa)
+        keep = is_closed & (values <= q99).all(axis=1)
         
-        numeric_cols = ['diff_size', 'files_changed', 'time_to_close_hours', 
-                       'body_length_chars', 'participant_count', 'total_comments', 'review_count']
-        
-        for col in numeric_cols:
-            if col in self.prs_df.columns:
-                q99 = self.prs_df[col].quantile(0.99)
-                self.prs_df = self.prs_df[self.prs_df[col] <= q99]
+        self.outlier_thresholds = dict(zip(outlier_cols, q99))
+        # Uma única seleção de linhas: as colunas de texto são copiadas uma vez só
+        self.prs_df = prs[keep]
+        self.engine = StatsEngine(self.prs_df, OUTLIER_COLUMNS + ['merged_bool'])
         
         print(f"✅ Dados preparados: {len(self.prs_df)} PRs válidos")
         
@@ -44,45 +96,30 @@ class PRDataAnalyzer:
         print("📈 ANÁLISE DE NORMALIDADE DOS DADOS")
         print("="*60)
         
-        numeric_vars = ['diff_size', 'files_changed', 'time_to_close_hours', 
-                       'body_length_chars', 'participant_count', 'total_comments', 'review_count']
-        
         normality_table = []
         
-        for var in numeric_vars:
+        for var in OUTLIER_COLUMNS:
             if var in self.prs_df.columns:
-                data = self.prs_df[var].dropna()
-                
-                if len(data) > 5000:
-                    data_sample = data.sample(5000, random_state=42)
-                else:
-                    data_sample = data
-                
-                shapiro_stat, shapiro_p = shapiro(data_sample)
-                
-                skewness = stats.skew(data)
-                kurtosis = stats.kurtosis(data)
-                
-                is_normal = shapiro_p > 0.05
-                normality_class = "Normal" if is_normal else "Não-Normal"
+                result = self.engine.normality(var)
+                normality_class = "Normal" if result['is_normal'] else "Não-Normal"
                 
                 normality_table.append({
                     'Variável': var,
-                    'n': len(data),
-                    'Média': data.mean(),
-                    'Mediana': data.median(),
-                    'Desvio Padrão': data.std(),
-                    'Assimetria (Skewness)': f"{skewness:.4f}",
-                    'Curtose (Kurtosis)': f"{kurtosis:.4f}",
-                    'Shapiro-Wilk p-value': f"{shapiro_p:.6f}",
+                    'n': result['n'],
+                    'Média': result['mean'],
+                    'Mediana': result['median'],
+                    'Desvio Padrão': result['std'],
+                    'Assimetria (Skewness)': f"{result['skewness']:.4f}",
+                    'Curtose (Kurtosis)': f"{result['kurtosis']:.4f}",
+                    'Shapiro-Wilk p-value': f"{result['shapiro_p']:.6f}",
                     'Normalidade': normality_class
                 })
                 
                 self.normality_results[var] = {
-                    'is_normal': is_normal,
-                    'shapiro_p': shapiro_p,
-                    'skewness': skewness,
-                    'kurtosis': kurtosis
+                    'is_normal': result['is_normal'],
+                    'shapiro_p': result['shapiro_p'],
+                    'skewness': result['skewness'],
+                    'kurtosis': result['kurtosis']
                 }
         
         normality_df = pd.DataFrame(normality_table)
@@ -94,70 +131,30 @@ class PRDataAnalyzer:
         
         return normality_df
     
-    def plot_normality_analysis(self):
-        print("\n📊 Gerando visualizações de normalidade...")
-        
-        numeric_vars = ['diff_size', 'files_changed', 'time_to_close_hours', 
-                       'body_length_chars', 'participant_count', 'total_comments', 'review_count']
-        
-        fig, axes = plt.subplots(3, 3, figsize=(15, 12))
-        axes = axes.ravel()
-        
-        for i, var in enumerate(numeric_vars):
-            if i < len(axes) and var in self.prs_df.columns:
-                data = self.prs_df[var].dropna()
-                
-                ax = axes[i]
-                n, bins, patches = ax.hist(data, bins=30, alpha=0.7, density=True, color='skyblue')
-                
-                xmin, xmax = ax.get_xlim()
-                x = np.linspace(xmin, xmax, 100)
-                p = stats.norm.pdf(x, data.mean(), data.std())
-                ax.plot(x, p, 'k', linewidth=2, label='Distribuição Normal')
-                
-                ax.set_title(f'Distribuição de {var}\n(p-value: {self.normality_results[var]["shapiro_p"]:.4f})')
-                ax.set_xlabel(var)
-                ax.set_ylabel('Densidade')
-                ax.legend()
-                ax.grid(True, alpha=0.3)
-        
-        for i in range(len(numeric_vars), len(axes)):
-            fig.delaxes(axes[i])
-        
-        plt.tight_layout()
-        plt.savefig('plots/normality_analysis.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        fig, axes = plt.subplots(3, 3, figsize=(15, 12))
-        axes = axes.ravel()
-        
-        for i, var in enumerate(numeric_vars):
-            if i < len(axes) and var in self.prs_df.columns:
-                data = self.prs_df[var].dropna()
-                
-                stats.probplot(data, dist="norm", plot=axes[i])
-                axes[i].set_title(f'Q-Q Plot: {var}')
-                axes[i].grid(True, alpha=0.3)
-        
-        for i in range(len(numeric_vars), len(axes)):
-            fig.delaxes(axes[i])
-        
-        plt.tight_layout()
-        plt.savefig('plots/qq_plots.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print("✅ Visualizações de normalidade salvas em: plots/normality_analysis.png e plots/qq_plots.png")
+    def normality_figures(self):
+        """Figuras de normalidade (histogramas e Q-Q plots), com as entradas já resumidas."""
+        names = [var for var in OUTLIER_COLUMNS if var in self.prs_df.columns]
+        values = [self.prs_df[var].dropna().to_numpy(dtype=float) for var in names]
+        
+        return [
+            FigureSpec('plots/normality_analysis.png', draw_distribution_grid, {
+                'names': names,
+                'histograms': [histogram_inputs(v) for v in values],
+                'p_values': [self.normality_results[var]['shapiro_p'] for var in names],
+            }, figsize=(15, 12)),
+            FigureSpec('plots/qq_plots.png', draw_qq_grid, {
+                'names': names,
+                'quantiles': [qq_inputs(v) for v in values],
+            }, figsize=(15, 12)),
+        ]
     
     def calculate_correlation(self, x, y):
         x_normal = self.normality_results.get(x, {}).get('is_normal', False)
         y_normal = self.normality_results.get(y, {}).get('is_normal', False)
         
-        if x_normal and y_normal:
-            method = 'pearson'
-            corr, p_value = pearsonr(self.prs_df[x].dropna(), self.prs_df[y].dropna())
-        else:
-            method = 'spearman'
-            corr, p_value = spearmanr(self.prs_df[x].dropna(), self.prs_df[y].dropna())
+        method = 'pearson' if x_normal and y_normal else 'spearman'
+        # Lido da matriz completa do método, calculada uma vez para todas as RQs
+        corr, p_value = self.engine.correlation(x, y, method)
         
         return corr, p_value, method
     
@@ -316,6 +313,26 @@ class PRDataAnalyzer:
                 }
                 print(f"   📈 {metric}: {corr:.4f} (p-value: {p_value:.6f})")
     
+    def bootstrap_confidence_intervals(self, n_resamples=BOOTSTRAP_RESAMPLES):
+        print("\n" + "="*60)
+        print("🎲 INTERVALOS DE CONFIANÇA (BOOTSTRAP)")
+        print("="*60)
+        
+        engine = BootstrapEngine(self.prs_df, RQ_PAIRS, n_resamples=n_resamples, seed=BOOTSTRAP_SEED)
+        ci_df = engine.run()
+        
+        for rq, rows in ci_df.groupby('Research Question', sort=False):
+            print(f"\n   {rq}:")
+            for _, row in rows.iterrows():
+                print(f"   📐 {row['Estatística']}: {row['Estimativa']:.4f} "
+                      f"[IC 95%: {row['IC Inferior']:.4f}, {row['IC Superior']:.4f}]")
+        
+        ci_df.to_csv('results/bootstrap_ci.csv', index=False)
+        print(f"\n💾 Intervalos de confiança salvos em: results/bootstrap_ci.csv "
+              f"({n_resamples} reamostragens, seed {BOOTSTRAP_SEED})")
+        
+        return ci_df
+    
     def generate_summary_tables(self):
         print("\n" + "="*60)
         print("📋 GERANDO TABELAS SUMARIZADAS")
@@ -378,40 +395,52 @@ class PRDataAnalyzer:
         
         return desc_df, comp_df, corr_df
     
-    def create_visualizations(self):
+    def rq_figures(self):
+        """Figuras das RQs; a dispersão da RQ05 vira mapa de densidade acima de SCATTER_MAX_POINTS PRs."""
+        merged = self.prs_df['merged_bool'].to_numpy()
+        status_label = 'Status (False=Closed, True=Merged)'
+        
+        return [
+            FigureSpec('plots/rq01_size_vs_status.png', draw_boxplot, {
+                'x': merged,
+                'y': self.prs_df['diff_size'].to_numpy(dtype=float),
+                'title': 'RQ01: Tamanho do PR vs Status (Merged/Closed)',
+                'xlabel': status_label,
+                'ylabel': 'Tamanho do PR (adições + deleções)',
+            }),
+            FigureSpec('plots/rq02_time_vs_status.png', draw_boxplot, {
+                'x': merged,
+                'y': self.prs_df['time_to_close_hours'].to_numpy(dtype=float),
+                'title': 'RQ02: Tempo de Análise vs Status (Merged/Closed)',
+                'xlabel': status_label,
+                'ylabel': 'Tempo para fechamento (horas)',
+            }),
+            scatter_spec('plots/rq05_size_vs_reviews.png',
+                         self.prs_df['diff_size'], self.prs_df['review_count'],
+                         title='RQ05: Tamanho do PR vs Número de Revisões',
+                         xlabel='Tamanho do PR (adições + deleções)',
+                         ylabel='Número de Revisões'),
+        ]
+    
+    def render_figures(self, force=False):
         print("\n" + "="*60)
         print("🎨 CRIANDO VISUALIZAÇÕES")
         print("="*60)
         
-        os.makedirs('plots', exist_ok=True)
+        renderer = PlotRenderer('plots', force=force)
+        rendered = renderer.render(self.normality_figures() + self.rq_figures())
         
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(x='merged_bool', y='diff_size', data=self.prs_df)
-        plt.title('RQ01: Tamanho do PR vs Status (Merged/Closed)')
-        plt.xlabel('Status (False=Closed, True=Merged)')
-        plt.ylabel('Tamanho do PR (adições + deleções)')
-        plt.savefig('plots/rq01_size_vs_status.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(x='merged_bool', y='time_to_close_hours', data=self.prs_df)
-        plt.title('RQ02: Tempo de Análise vs Status (Merged/Closed)')
-        plt.xlabel('Status (False=Closed, True=Merged)')
-        plt.ylabel('Tempo para fechamento (horas)')
-        plt.savefig('plots/rq02_time_vs_status.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        plt.figure(figsize=(10, 6))
-        plt.scatter(self.prs_df['diff_size'], self.prs_df['review_count'], alpha=0.5)
-        plt.title('RQ05: Tamanho do PR vs Número de Revisões')
-        plt.xlabel('Tamanho do PR (adições + deleções)')
-        plt.ylabel('Número de Revisões')
-        plt.savefig('plots/rq05_size_vs_reviews.png', dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print("✅ Visualizações salvas na pasta 'plots/'")
+        print(f"✅ {len(rendered)} visualizações atualizadas na pasta 'plots/'")
+        return rendered
     
-    def run_complete_analysis(self):
+    def run_complete_analysis(self, bootstrap=False, n_resamples=BOOTSTRAP_RESAMPLES):
+        """
+        Executa a análise completa.
+
+        Args:
+            bootstrap (bool): Calcula os intervalos de confiança bootstrap (ver custo em BOOTSTRAP_RESAMPLES)
+            n_resamples (int): Reamostragens do bootstrap
+        """
         print("🚀 INICIANDO ANÁLISE COMPLETA DOS DADOS")
         print("="*60)
         
@@ -421,12 +450,13 @@ class PRDataAnalyzer:
         self.prepare_data()
         
         normality_df = self.test_normality_comprehensive()
-        self.plot_normality_analysis()
         
         self.analyze_all_rqs()
+        if bootstrap:
+            self.bootstrap_confidence_intervals(n_resamples)
 
         desc_df, comp_df, corr_df = self.generate_summary_tables()
-        self.create_visualizations()
+        self.render_figures()
         
         print("\n" + "="*60)
         print("🎉 ANÁLISE CONCLUÍDA COM SUCESSO!")
@@ -436,6 +466,8 @@ class PRDataAnalyzer:
         print("   📊 results/descriptive_statistics.csv")
         print("   📊 results/merged_vs_closed_comparison.csv")
         print("   📊 results/correlation_results.csv")
+        if bootstrap:
+            print("   📊 results/bootstrap_ci.csv")
         print("   🎨 plots/normality_analysis.png")
         print("   🎨 plots/qq_plots.png")
         print("   🎨 plots/rq01_size_vs_status.png")
@@ -444,6 +476,13 @@ class PRDataAnalyzer:
         print("="*60)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Análise dos PRs coletados (RQ01-RQ08)')
+    parser.add_argument('--bootstrap', action='store_true',
+                        help='Calcula intervalos de confiança bootstrap (~60 s de CPU com 10 mil reamostragens)')
+    parser.add_argument('--resamples', type=int, default=BOOTSTRAP_RESAMPLES,
+                        help='Reamostragens do bootstrap')
+    args = parser.parse_args()
+    
     REPOS_FILE = "data/cloned_repos.csv"
     PRS_FILE = "data/collected_prs_details.csv"
     
@@ -455,4 +494,4 @@ if __name__ == "__main__":
         exit(1)
     
     analyzer = PRDataAnalyzer(REPOS_FILE, PRS_FILE)
-    analyzer.run_complete_analysis()
\ No newline at end of file
+    analyzer.run_complete_analysis(bootstrap=args.bootstrap, n_resamples=args.resamples)
\ No newline at end of file
@@ -0,0 +1,289 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sparse
+
+# Estado dos processos do pool, preenchido pelo initializer (evita reenviar os dados a cada tarefa)
+_WORKER_DATA: Optional[Dict] = None
+
+
+def _init_worker(data: Dict) -> None:
+    global _WORKER_DATA
+    _WORKER_DATA = data
+
+
+def _median(cum: np.ndarray, uniques: np.ndarray) -> np.ndarray:
+    """
+    Mediana de cada reamostragem a partir das contagens acumuladas por valor distinto.
+
+    Args:
+        cum (np.ndarray): Contagens acumuladas B x k (linha = reamostragem)
+        uniques (np.ndarray): Valores distintos da coluna, em ordem
+
+    Returns:
+        np.ndarray: B medianas (média dos dois centrais quando o total é par; NaN se vazio)
+    """
+    medians = np.full(len(cum), np.nan)
+    last = len(uniques) - 1
+    for i, row in enumerate(cum):
+        total = row[-1]
+        if total:
+            lo, hi = np.searchsorted(row, [(total - 1) // 2, total // 2], side='right')
+            medians[i] = (uniques[min(lo, last)] + uniques[min(hi, last)]) / 2
+    return medians
+
+
+def _statistics(data: Dict, weights: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Estatísticas de todas as RQs para um lote de reamostragens.
+
+    Cada reamostragem é representada pelas contagens de cada linha (quantas
+    vezes foi sorteada). Uma única multiplicação pela matriz esparsa de
+    indicadores dá as contagens por valor distinto de todas as colunas, por
+    (valor, grupo) e por célula (x, y); os postos médios saem da soma
+    acumulada dessas contagens, sem ordenar de novo. Só os pares com valores
+    distintos demais para contar por célula usam os postos linha a linha.
+
+    Args:
+        data (Dict): Dados preparados por BootstrapEngine
+        weights (np.ndarray): Contagens n x B das linhas em cada reamostragem
+
+    Returns:
+        Dict[str, np.ndarray]: "RQ:estatística" -> B valores
+    """
+    n = data['n']
+    mean_rank = (n + 1) / 2
+    n_batch = weights.shape[1]
+    # Contagens inteiras (exatas em float32 até 2^24 linhas); uma linha por reamostragem
+    all_counts = np.asarray(data['indicators'] @ weights).T.astype(np.float64, order='C')
+
+    def block(name):
+        start, size = data['blocks'][name]
+        return all_counts[:, start:start + size]
+
+    def rank_var(counts):
+        # Variância dos postos médios com a correção de empates: (n² - 1)/12 - Σ(t³ - t)/(12n)
+        return (n ** 2 - 1) / 12 - (counts ** 3 - counts).sum(axis=1) / (12 * n)
+
+    midranks, rank_vars, cums, rank_sums, group_medians, ranks = {}, {}, {}, {}, {}, {}
+    group = data['group']
+    if group is not None:
+        group_counts = block(('count', group))
+        group_ranks = np.cumsum(group_counts, axis=1) - (group_counts - 1) / 2
+        group_size = group_counts[:, 1]
+        rank_vars[group] = rank_var(group_counts)
+
+    for col, (uniques, codes) in data['columns'].items():
+        if col == group:
+            continue
+        k = len(uniques)
+        if col in data['grouped']:
+            # Contagem conjunta (grupo, valor): [:, 1] são os PRs mesclados
+            joint = block(('joint', col)).reshape(n_batch, 2, k)
+            col_counts = joint[:, 0] + joint[:, 1]
+        else:
+            col_counts = block(('count', col))
+
+        cums[col] = np.cumsum(col_counts, axis=1)
+        midranks[col] = cums[col] - (col_counts - 1) / 2
+        rank_vars[col] = rank_var(col_counts)
+        if col in data['grouped']:
+            rank_sums[col] = np.einsum('igk,ik->ig', joint, midranks[col])
+            merged_cum = np.cumsum(joint[:, 1], axis=1)
+            group_medians[col] = (_median(merged_cum, uniques), _median(cums[col] - merged_cum, uniques))
+        if col in data['ranked']:
+            ranks[col] = midranks[col][:, codes]
+
+    out, medians = {}, {}
+    for rq, (x, y) in data['pairs'].items():
+        if y == group:
+            # Soma dos postos de x em cada grupo vezes o posto médio do grupo
+            cross = np.einsum('ig,ig->i', rank_sums[x], group_ranks)
+        elif ('cells', rq) in data['blocks']:
+            kx, ky = len(data['columns'][x][0]), len(data['columns'][y][0])
+            cells = block(('cells', rq)).reshape(n_batch, kx, ky)
+            cross = np.einsum('ix,ix->i', np.matmul(cells, midranks[y][:, :, None])[:, :, 0], midranks[x])
+        else:
+            cross = np.einsum('ij,ij,ji->i', ranks[x], ranks[y], weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out[f'{rq}:spearman_rho'] = (cross / n - mean_rank ** 2) / np.sqrt(rank_vars[x] * rank_vars[y])
+
+        if y == group:
+            median_merged, median_closed = group_medians[x]
+            # Rank-biserial (efeito do Mann-Whitney): U do grupo mesclado normalizado para [-1, 1]
+            u_merged = rank_sums[x][:, 1] - group_size * (group_size + 1) / 2
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rank_biserial = 2 * u_merged / (group_size * (n - group_size)) - 1
+
+            out[f'{rq}:median_merged'] = median_merged
+            out[f'{rq}:median_closed'] = median_closed
+            out[f'{rq}:median_diff'] = median_merged - median_closed
+            out[f'{rq}:rank_biserial'] = rank_biserial
+        else:
+            for col in (x, y):
+                if col not in medians:
+                    medians[col] = _median(cums[col], data['columns'][col][0])
+                out[f'{rq}:median_{col}'] = medians[col]
+    return out
+
+
+def _resample_chunk(seed: np.random.SeedSequence, n_resamples: int, batch_size: int,
+                    data: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Executa um bloco de reamostragens em lotes vetorizados.
+
+    Args:
+        seed (np.random.SeedSequence): Semente do bloco
+        n_resamples (int): Reamostragens do bloco
+        batch_size (int): Reamostragens por lote
+        data (Dict): Dados (None usa os do processo do pool)
+
+    Returns:
+        Dict[str, np.ndarray]: "RQ:estatística" -> n_resamples valores
+    """
+    data = data if data is not None else _WORKER_DATA
+    n = data['n']
+    rng = np.random.default_rng(seed)
+    parts: Dict[str, List[np.ndarray]] = {}
+    for start in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - start)
+        indices = rng.integers(0, n, size=(size, n))
+        weights = np.empty((n, size), dtype=np.float32)
+        for b, row in enumerate(indices):
+            weights[:, b] = np.bincount(row, minlength=n)
+        for key, values in _statistics(data, weights).items():
+            parts.setdefault(key, []).append(values)
+    return {key: np.concatenate(values) for key, values in parts.items()}
+
+
+class BootstrapEngine:
+    """
+    Intervalos de confiança bootstrap (percentil) para as RQs.
+
+    As reamostragens são compartilhadas por todas as RQs: cada lote de
+    índices sorteados serve para calcular medianas, rank-biserial e Spearman
+    de uma vez. Os blocos de reamostragens são distribuídos em um pool de
+    processos, cada um com uma semente derivada de SeedSequence(seed), então
+    o resultado é o mesmo para qualquer número de workers.
+    """
+
+    def __init__(self, df: pd.DataFrame, pairs: Dict[str, Tuple[str, str]], group: Optional[str] = 'merged_bool',
+                 n_resamples: int = 10_000, confidence: float = 0.95, seed: int = 42,
+                 batch_size: int = 32, chunk_size: int = 250, max_workers: Optional[int] = None):
+        """
+        Inicializa o motor.
+
+        Args:
+            df (pd.DataFrame): PRs já preparados (sem NaN nas colunas usadas)
+            pairs (Dict[str, Tuple[str, str]]): RQ -> (variável, desfecho)
+            group (str): Coluna binária dos grupos (merged/closed); RQs com ela como desfecho ganham medianas por grupo e rank-biserial
+            n_resamples (int): Número de reamostragens
+            confidence (float): Nível de confiança dos intervalos
+            seed (int): Semente para reprodutibilidade
+            batch_size (int): Reamostragens por lote vetorizado
+            chunk_size (int): Reamostragens por tarefa do pool
+            max_workers (int): Processos do pool (padrão: número de CPUs; 1 roda no próprio processo)
+        """
+        self.pairs = pairs
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        used = sorted({col for pair in pairs.values() for col in pair})
+        values = df[used].astype(float).dropna()
+        n = len(values)
+        columns = {}
+        for col in used:
+            uniques, codes = np.unique(values[col].to_numpy(), return_inverse=True)
+            columns[col] = (uniques, codes.ravel())
+
+        group = group if group in columns else None
+        grouped = {x for x, y in pairs.values() if y == group} if group else set()
+
+        # Blocos da matriz de indicadores: nome -> (número de valores, código de cada linha)
+        blocks = {}
+        if group is not None:
+            blocks[('count', group)] = (2, columns[group][1])
+        for col, (uniques, codes) in columns.items():
+            if col in grouped:
+                blocks[('joint', col)] = (2 * len(uniques), columns[group][1] * len(uniques) + codes)
+            elif col != group:
+                blocks[('count', col)] = (len(uniques), codes)
+        ranked = set()
+        for rq, (x, y) in pairs.items():
+            if y == group:
+                continue
+            kx, ky = len(columns[x][0]), len(columns[y][0])
+            if kx * ky <= n:
+                # Poucas combinações de valores: contagem por célula (x, y)
+                blocks[('cells', rq)] = (kx * ky, columns[x][1] * ky + columns[y][1])
+            else:
+                ranked.update((x, y))
+
+        layout, rows, start = {}, [], 0
+        for name, (size, codes) in blocks.items():
+            layout[name] = (start, size)
+            rows.append(codes + start)
+            start += size
+        indicators = sparse.csr_matrix(
+            (np.ones(n * len(rows), dtype=np.float32), (np.concatenate(rows), np.tile(np.arange(n), len(rows)))),
+            shape=(start, n),
+        )
+
+        self.data = {
+            'n': n,
+            'columns': columns,
+            'pairs': pairs,
+            'group': group,
+            'grouped': grouped,
+            'ranked': ranked,
+            'blocks': layout,
+            'indicators': indicators,
+        }
+
+    def _resamples(self) -> Dict[str, np.ndarray]:
+        """Estatísticas de todas as reamostragens, na ordem dos blocos."""
+        sizes = [min(self.chunk_size, self.n_resamples - start)
+                 for start in range(0, self.n_resamples, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        if self.max_workers == 1 or len(sizes) == 1:
+            chunks = [_resample_chunk(s, size, self.batch_size, self.data) for s, size in zip(seeds, sizes)]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(sizes)),
+                                     initializer=_init_worker, initargs=(self.data,)) as executor:
+                chunks = list(executor.map(_resample_chunk, seeds, sizes, [self.batch_size] * len(sizes)))
+
+        return {key: np.concatenate([chunk[key] for chunk in chunks]) for key in chunks[0]}
+
+    def run(self) -> pd.DataFrame:
+        """
+        Calcula as estimativas e os intervalos de confiança.
+
+        Returns:
+            pd.DataFrame: Uma linha por (RQ, estatística) com estimativa, limites do IC e erro padrão
+        """
+        estimates = _statistics(self.data, np.ones((self.data['n'], 1), dtype=np.float32))
+        resamples = self._resamples()
+
+        alpha = (1 - self.confidence) / 2
+        rows = []
+        for key, estimate in estimates.items():
+            rq, statistic = key.split(':', 1)
+            values = resamples[key]
+            low, high = np.nanpercentile(values, [100 * alpha, 100 * (1 - alpha)])
+            rows.append({
+                'Research Question': rq,
+                'Estatística': statistic,
+                'Estimativa': float(estimate[0]),
+                'IC Inferior': low,
+                'IC Superior': high,
+                'Erro Padrão': np.nanstd(values, ddof=1),
+            })
+        return pd.DataFrame(rows)
@@ -1,7 +1,9 @@
 import os
+import sys
 import json
 import time
-import requests
+import asyncio
+import aiohttp
 import pandas as pd
 from tqdm import tqdm
 from datetime import datetime, timedelta
@@ -12,8 +14,14 @@ from datetime import datetime, timedelta
 TOKEN = os.environ.get("GITHUB_TOKEN", "SEU_GITHUB_TOKEN_AQUI") 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
+from shared import transport  # noqa: E402
+from shared.batch_query import BatchQuery  # noqa: E402
+
 os.makedirs(DATA_DIR, exist_ok=True)
 
 OUTPUT_CSV = os.path.join(DATA_DIR, "cloned_repos.csv")
@@ -21,174 +29,364 @@ TARGET_REPOS = 200
 MIN_PRS_WITH_REVIEW = 100
 MIN_PR_LIFESPAN_HOURS = 1 # PR deve ter levado pelo menos 1 hora para ser fechado/mesclado
 
+SEARCH_URL = "https://api.github.com/search/repositories"
+GRAPHQL_URL = "https://api.github.com/graphql"
+SCREEN_CONCURRENCY = 20 # Requisições simultâneas durante a triagem
+MAX_PRS_TO_CHECK = 1000 # Verifica até 1000 PRs mais recentes de cada repositório
+PR_SCREEN_PAGE_SIZE = 100 # Número de PRs por requisição GraphQL
+MAX_RETRIES = 5
+
+# Modo de triagem: "counts" usa contagens da busca de issues e só pagina os PRs dos
+# repositórios no limite; "full" pagina os PRs de todos os repositórios
+SCREEN_MODE = "counts"
+# Com pelo menos COUNT_ACCEPT_RATIO vezes o mínimo de PRs revisados, o repositório é
+# aceito só pela contagem (aproximação: o critério de tempo de vida não é verificado)
+COUNT_ACCEPT_RATIO = 3
+
+# Campos dos PRs fechados/mesclados usados na triagem: reviews e datas
+PR_SCREEN_FIELDS = """
+            totalCount
+            nodes {
+                reviews { totalCount }
+                createdAt
+                closedAt
+            }
+            pageInfo { hasNextPage endCursor }
+"""
+
+# Consulta para buscar uma página de PRs de um repositório a partir de um cursor
+PR_SCREEN_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+    repository(owner: $owner, name: $name) {
+        pullRequests(states: [MERGED, CLOSED], first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {%s        }
+    }
+}
+""" % PR_SCREEN_FIELDS
+
+def pr_first_page_batch():
+    """Lote com a primeira página de PRs de vários repositórios por requisição."""
+    return BatchQuery.repositories(
+        "pullRequests(states: [MERGED, CLOSED], first: %d, orderBy: {field: CREATED_AT, direction: DESC}) {%s}"
+        % (PR_SCREEN_PAGE_SIZE, PR_SCREEN_FIELDS)
+    )
+
+def pr_count_batch():
+    """Lote com as contagens da busca de issues de vários repositórios por requisição:
+    PRs fechados/mesclados e, entre eles, os sem nenhum review."""
+    return BatchQuery(
+        {
+            "closed": "search(query: $closed, type: ISSUE, first: 1) { issueCount }",
+            "unreviewed": "search(query: $unreviewed, type: ISSUE, first: 1) { issueCount }",
+        },
+        {"closed": "String!", "unreviewed": "String!"},
+    )
+
 # --- FUNÇÕES AUXILIARES ---
 
-def handle_rate_limit(response, fallback_wait=600):
-    """Lida com erros de limite de taxa (Rate Limit) da API do GitHub."""
-    if response.status_code == 403 and int(response.headers.get("X-RateLimit-Remaining", 1)) == 0:
-        reset_timestamp = int(response.headers.get("X-RateLimit-Reset", time.time() + fallback_wait))
-        now = int(time.time())
-        wait_seconds = max(reset_timestamp - now + 10, 10) # Espera até o reset + 10s de buffer
-        
-        tqdm.write(f"\n🚦 Limite de requisições da API atingido (403).")
-        tqdm.write(f"⏳ Esperando {wait_seconds} segundos até a liberação.")
-        time.sleep(wait_seconds)
-        return True
-    
-    if response.status_code != 200:
-        tqdm.write(f"\n⚠️ Erro na requisição: {response.status_code} - {response.reason}")
-        # Tenta esperar um pouco por outros erros temporários
-        time.sleep(10) 
-        return True
-        
-    return False
+async def request_json(session, semaphore, pause, method, url, **kwargs):
+    """
+    Faz uma requisição à API do GitHub respeitando a concorrência e o rate limit.
+
+    Quando a cota acaba (403 com X-RateLimit-Remaining = 0), todas as
+    requisições em andamento esperam juntas até o reset, via pause["until"].
+    Outros erros temporários são tentados de novo até MAX_RETRIES vezes.
+
+    Returns:
+        dict: Corpo JSON da resposta
+    """
+    attempt = 0
+    while attempt < MAX_RETRIES:
+        wait_seconds = pause["until"] - time.time()
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+
+        async with semaphore:
+            try:
+                async with session.request(method, transport.url(url), **kwargs) as response:
+                    if response.status in (403, 429) and int(response.headers.get("X-RateLimit-Remaining", 1)) == 0:
+                        reset_timestamp = int(response.headers.get("X-RateLimit-Reset", time.time() + 600))
+                        if reset_timestamp + 10 > pause["until"]:
+                            pause["until"] = reset_timestamp + 10 # Espera até o reset + 10s de buffer
+                            tqdm.write(f"\n🚦 Limite de requisições da API atingido ({response.status}).")
+                            tqdm.write(f"⏳ Esperando {max(pause['until'] - int(time.time()), 0)} segundos até a liberação.")
+                        continue
+
+                    if response.status == 422:
+                        # A busca REST não passa dos 1000 primeiros resultados
+                        return {}
+
+                    if response.status != 200:
+                        tqdm.write(f"\n⚠️ Erro na requisição: {response.status} - {response.reason}")
+                        attempt += 1
+                        await asyncio.sleep(min(10 * attempt, 60))
+                        continue
+
+                    return await response.json()
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                tqdm.write(f"\n⚠️ Erro de conexão: {type(e).__name__} - {e}")
+                attempt += 1
+                await asyncio.sleep(min(10 * attempt, 60))
+
+    raise Exception(f"Número máximo de tentativas excedido para {url}")
+
+def is_valid_pr(pr):
+    """PR com pelo menos um review e que levou mais de MIN_PR_LIFESPAN_HOURS para ser fechado/mesclado."""
+    # 1. Checa se o PR tem review
+    if pr["reviews"]["totalCount"] == 0:
+        return False
+
+    # 2. Checa o critério de tempo de vida (Closed - Created > 1 hora)
+    pr_closed_at = pr.get("closedAt")
+    pr_created_at = pr.get("createdAt")
+    if not (pr_closed_at and pr_created_at):
+        return False
+
+    try:
+        t_closed = datetime.fromisoformat(pr_closed_at.replace('Z', '+00:00'))
+        t_created = datetime.fromisoformat(pr_created_at.replace('Z', '+00:00'))
+    except ValueError:
+        # Ignora se as datas estiverem inválidas
+        return False
+    return t_closed - t_created > timedelta(hours=MIN_PR_LIFESPAN_HOURS)
+
+async def fetch_search_page(session, semaphore, pause, page):
+    """Busca uma página (100 repositórios) da API REST, ordenada por estrelas."""
+    params = {
+        "q": "stars:>1000",
+        "sort": "stars",
+        "order": "desc",
+        "per_page": 100,
+        "page": page
+    }
+    response = await request_json(session, semaphore, pause, "GET", SEARCH_URL, params=params)
+    return response.get("items", [])
+
+async def graphql_json(session, semaphore, pause, query, variables):
+    """Executa uma query GraphQL com request_json."""
+    return await request_json(session, semaphore, pause, "POST", GRAPHQL_URL,
+                              json={"query": query, "variables": variables})
+
+async def count_valid_prs(session, semaphore, pause, repo, min_prs, first_page=None):
+    """
+    Conta os PRs válidos de um repositório, parando assim que min_prs é atingido.
+
+    Também para cedo quando os PRs que faltam verificar não bastam mais para
+    chegar a min_prs.
+
+    Args:
+        first_page: Conexão pullRequests da primeira página, se já veio de um lote
+
+    Returns:
+        int: PRs válidos encontrados (até o ponto em que a contagem parou)
+    """
+    owner, name = repo["full_name"].split("/")
+    valid_prs_count = 0
+    checked_count = 0
+    cursor = None
+    pr_data = first_page
+
+    # Limita a busca para evitar requisições infinitas e muito longas
+    while checked_count < MAX_PRS_TO_CHECK:
+        if pr_data is None:
+            variables = {"owner": owner, "name": name, "first": PR_SCREEN_PAGE_SIZE, "after": cursor}
+            try:
+                response_json = await graphql_json(session, semaphore, pause, PR_SCREEN_QUERY, variables)
+            except Exception as e:
+                tqdm.write(f"  ❌ Erro ao buscar PRs do repo {repo['full_name']}: {type(e).__name__} - {e}")
+                break
+
+            # Lida com erros do GraphQL, como repositório não encontrado
+            pr_data = ((response_json.get("data") or {}).get("repository") or {}).get("pullRequests")
+            if "errors" in response_json or not pr_data:
+                break
+
+        valid_prs_count += sum(1 for pr in pr_data["nodes"] if is_valid_pr(pr))
+        checked_count += len(pr_data["nodes"])
+
+        if valid_prs_count >= min_prs or not pr_data["pageInfo"]["hasNextPage"]:
+            break # Para se já atingiu o mínimo ou se não houver mais páginas
+
+        still_checkable = min(pr_data["totalCount"], MAX_PRS_TO_CHECK) - checked_count
+        if valid_prs_count + still_checkable < min_prs:
+            break # Mesmo que todos os PRs restantes sejam válidos, não chega ao mínimo
+
+        cursor = pr_data["pageInfo"]["endCursor"]
+        pr_data = None
+
+    return valid_prs_count
 
-def filter_repos_with_min_prs(token, needed=TARGET_REPOS, min_prs=MIN_PRS_WITH_REVIEW):
+async def run_batch(session, semaphore, pause, batch, items, description):
+    """
+    Executa um BatchQuery; se o lote falhar por completo, todos os itens voltam como None.
+    """
+    async def execute(query, variables):
+        return await graphql_json(session, semaphore, pause, query, variables)
+
+    try:
+        return await batch.run_async(items, execute)
+    except Exception as e:
+        tqdm.write(f"  ❌ Erro no lote de {description}: {type(e).__name__} - {e}")
+        return [None] * len(items)
+
+async def count_reviewed_prs(session, semaphore, pause, repos, batch):
+    """
+    Limite superior de PRs válidos de cada repositório, pelas contagens da busca.
+
+    PRs fechados/mesclados menos os com "review:none", para vários
+    repositórios por requisição. A busca não compara closedAt com createdAt,
+    então o critério de tempo de vida fica de fora.
+
+    Returns:
+        list: PRs fechados/mesclados com review de cada repositório (None se a contagem falhar)
+    """
+    items = []
+    for repo in repos:
+        closed = f"repo:{repo['full_name']} is:pr is:closed"
+        items.append({"closed": closed, "unreviewed": f"{closed} review:none"})
+
+    upper_bounds = []
+    for result in await run_batch(session, semaphore, pause, batch, items, "contagens"):
+        if not result or not result["closed"] or not result["unreviewed"]:
+            upper_bounds.append(None)
+        else:
+            upper_bounds.append(result["closed"]["issueCount"] - result["unreviewed"]["issueCount"])
+    return upper_bounds
+
+async def fetch_first_pr_pages(session, semaphore, pause, repos, batch):
+    """
+    Primeira página de PRs de cada repositório, vários repositórios por requisição.
+
+    Returns:
+        list: Conexão pullRequests de cada repositório (None se não veio no lote)
+    """
+    items = [dict(zip(("owner", "name"), repo["full_name"].split("/"))) for repo in repos]
+    pages = []
+    for result in await run_batch(session, semaphore, pause, batch, items, "PRs"):
+        pages.append(((result or {}).get("repository") or {}).get("pullRequests"))
+    return pages
+
+async def screen_page(session, semaphore, pause, repos, min_prs, batches, screen_mode=SCREEN_MODE):
+    """
+    Verifica todos os repositórios de uma página ao mesmo tempo.
+
+    No modo "counts", rejeita pela contagem quando nem o limite superior chega a
+    min_prs e aceita quando ele passa de COUNT_ACCEPT_RATIO * min_prs; só os
+    repositórios no meio do caminho (ou com a contagem indisponível) têm os PRs
+    paginados. A primeira página de PRs de todos eles vem em lotes e só os
+    que precisam de mais páginas continuam um a um.
+
+    Args:
+        batches (dict): BatchQuery de "counts" e "prs", reaproveitados entre páginas
+
+    Returns:
+        list: Repositórios válidos (com "pr_count" e "pr_count_source"), na ordem da busca.
+            "pr_count_source" diz como pr_count foi obtido: "search_upper_bound" é o
+            limite superior da contagem (fechados menos review:none, sem o filtro de
+            MIN_PR_LIFESPAN_HOURS); "paged" é a contagem de PRs válidos paginados,
+            que para ao atingir min_prs
+    """
+    pr_counts = {}
+    sources = {}
+    to_page = list(repos)
+
+    if screen_mode == "counts":
+        upper_bounds = await count_reviewed_prs(session, semaphore, pause, repos, batches["counts"])
+        to_page = []
+        for repo, upper_bound in zip(repos, upper_bounds):
+            if upper_bound is not None and (upper_bound < min_prs or upper_bound >= min_prs * COUNT_ACCEPT_RATIO):
+                pr_counts[repo["full_name"]] = upper_bound
+                sources[repo["full_name"]] = "search_upper_bound"
+            else:
+                to_page.append(repo)
+
+    first_pages = await fetch_first_pr_pages(session, semaphore, pause, to_page, batches["prs"])
+    tasks = [asyncio.ensure_future(count_valid_prs(session, semaphore, pause, repo, min_prs, first_page))
+             for repo, first_page in zip(to_page, first_pages)]
+    progress = tqdm(asyncio.as_completed(tasks), total=len(tasks),
+                    desc=f"  ⚙️ Filtrando PRs revisados e com tempo > {MIN_PR_LIFESPAN_HOURS}h", ncols=120)
+    for finished in progress:
+        await finished
+    for repo, task in zip(to_page, tasks):
+        pr_counts[repo["full_name"]] = task.result()
+        sources[repo["full_name"]] = "paged"
+
+    valid_repos = []
+    for repo in repos:
+        # 3. Verifica se o repositório é válido
+        if pr_counts[repo["full_name"]] >= min_prs:
+            repo["pr_count"] = pr_counts[repo["full_name"]]
+            repo["pr_count_source"] = sources[repo["full_name"]]
+            valid_repos.append(repo)
+
+    if screen_mode == "counts":
+        tqdm.write(f"  🔢 {len(repos) - len(to_page)} repositórios decididos pela contagem, {len(to_page)} paginados.")
+    return valid_repos
+
+async def filter_repos_with_min_prs_async(token, needed=TARGET_REPOS, min_prs=MIN_PRS_WITH_REVIEW,
+                                          screen_mode=SCREEN_MODE):
     """
     Usa a API REST para buscar repos e a API GraphQL para verificar PRs revisados.
     Inclui a filtragem de PRs com tempo de vida mínimo.
+
+    Os repositórios de cada página são verificados em paralelo (até
+    SCREEN_CONCURRENCY requisições simultâneas) e a próxima página da busca
+    é baixada enquanto a atual é verificada. No modo "counts" (padrão), a
+    maioria dos repositórios é decidida com uma única requisição de contagem.
     """
-    headers_rest = {
-        "Authorization": f"token {token}",
+    headers = {
+        "Authorization": f"bearer {token}",
         "Accept": "application/vnd.github.v3+json"
     }
-    headers_graphql = {
-        "Authorization": f"bearer {token}"
-    }
+    semaphore = asyncio.Semaphore(SCREEN_CONCURRENCY)
+    pause = {"until": 0.0}
+    connector = aiohttp.TCPConnector(limit=SCREEN_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    # Os lotes guardam o tamanho aprendido pelo custo entre uma página e outra
+    batches = {"counts": pr_count_batch(), "prs": pr_first_page_batch()}
 
     all_filtered = []
     page = 1
-    max_pr_fetch = 100 # Número de PRs por requisição GraphQL
-    
+
     print(f"🔍 Iniciando coleta de repositórios: +1000 estrelas e pelo menos {min_prs} PRs válidos...")
 
-    while len(all_filtered) < needed:
+    async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as session:
         # 1. API REST: Busca repositórios por popularidade
-        params = {
-            "q": "stars:>1000",
-            "sort": "stars",
-            "order": "desc",
-            "per_page": 100,
-            "page": page
-        }
-
-        response = requests.get("https://api.github.com/search/repositories", headers=headers_rest, params=params)
-        
-        if handle_rate_limit(response):
-            continue
+        next_page = asyncio.ensure_future(fetch_search_page(session, semaphore, pause, page))
 
-        repos = response.json().get("items", [])
-        if not repos:
-            print("\n🏁 Não há mais repositórios para buscar na API REST.")
-            break
+        while len(all_filtered) < needed:
+            repos = await next_page
+            if not repos:
+                print("\n🏁 Não há mais repositórios para buscar na API REST.")
+                break
 
-        tqdm.write(f"\n🔄 Processando página {page} da API REST ({len(repos)} repositórios)...")
-        
-        # 2. API GraphQL: Filtra PRs por review e tempo de vida
-        repos_nesta_pagina = []
-        
-        for repo in tqdm(repos, desc=f"  ⚙️ Filtrando PRs revisados e com tempo > {MIN_PR_LIFESPAN_HOURS}h", ncols=120):
-            owner, name = repo["full_name"].split("/")
-            valid_prs_count = 0
-            cursor = None
-            
-            # Limita a busca para evitar requisições infinitas e muito longas
-            max_prs_to_check = 1000 # Verifica até 1000 PRs mais recentes do repositório
-            checked_count = 0
-            
-            while checked_count < max_prs_to_check:
-                after_clause = f', after: "{cursor}"' if cursor else ""
-                
-                # Consulta para buscar PRs fechados/mesclados, reviews e datas
-                query = {
-                    "query": f"""
-                    {{
-                        repository(owner: \"{owner}\", name: \"{name}\") {{
-                            pullRequests(states: [MERGED, CLOSED], first: {max_pr_fetch}{after_clause}, orderBy: {{field: CREATED_AT, direction: DESC}}) {{
-                                nodes {{
-                                    reviews {{ totalCount }}
-                                    createdAt
-                                    closedAt
-                                }}
-                                pageInfo {{ hasNextPage endCursor }}
-                            }}
-                        }}
-                    }}
-                    """
-                }
-
-                try:
-                    r = requests.post("https://api.github.com/graphql", headers=headers_graphql, json=query)
-                    
-                    if handle_rate_limit(r):
-                        # Se o rate limit for atingido, a pausa já ocorreu, tenta o loop novamente.
-                        continue 
-                        
-                    response_json = r.json()
-
-                    # Lida com erros do GraphQL, como repositório não encontrado
-                    if "errors" in response_json or not response_json.get("data", {}).get("repository", {}).get("pullRequests"):
-                         break
-
-                    pr_data = response_json["data"]["repository"]["pullRequests"]
-                    
-                    for pr in pr_data["nodes"]:
-                        # 1. Checa se o PR tem review
-                        has_review = pr["reviews"]["totalCount"] > 0
-
-                        # 2. Checa o critério de tempo de vida (Closed - Created > 1 hora)
-                        pr_closed_at = pr.get("closedAt")
-                        pr_created_at = pr.get("createdAt")
-                        
-                        time_valid = False
-                        if pr_closed_at and pr_created_at:
-                            try:
-                                t_closed = datetime.fromisoformat(pr_closed_at.replace('Z', '+00:00'))
-                                t_created = datetime.fromisoformat(pr_created_at.replace('Z', '+00:00'))
-                                
-                                # Verifica se a diferença de tempo é maior que 1 hora
-                                time_diff = t_closed - t_created
-                                if time_diff > timedelta(hours=MIN_PR_LIFESPAN_HOURS):
-                                    time_valid = True
-                            except:
-                                # Ignora se as datas estiverem inválidas
-                                pass
-
-                        if has_review and time_valid:
-                            valid_prs_count += 1
-
-                    checked_count += len(pr_data["nodes"])
-                    
-                    if not pr_data["pageInfo"]["hasNextPage"] or valid_prs_count >= min_prs:
-                        break # Para se não houver mais páginas ou se já atingiu o mínimo
-                    
-                    cursor = pr_data["pageInfo"]["endCursor"]
-
-                except Exception as e:
-                    tqdm.write(f"  ❌ Erro ao buscar PRs do repo {repo['full_name']}: {type(e).__name__} - {e}")
-                    break
-            
-            # 3. Verifica se o repositório é válido
-            if valid_prs_count >= min_prs:
-                repo["pr_count"] = valid_prs_count
-                repos_nesta_pagina.append(repo)
-        
-        all_filtered.extend(repos_nesta_pagina)
-        
-        print(f"\n✅ Página {page} finalizada. Total acumulado: {len(all_filtered)} repositórios válidos.")
-        print("-" * 50)
-        
-        # 4. Salva o progresso
-        if all_filtered:
-            save_repos_to_files(all_filtered, OUTPUT_CSV)
+            # Pré-busca da próxima página enquanto esta é verificada
+            next_page = asyncio.ensure_future(fetch_search_page(session, semaphore, pause, page + 1))
+
+            tqdm.write(f"\n🔄 Processando página {page} da API REST ({len(repos)} repositórios)...")
 
-        if len(all_filtered) >= needed:
-            break
-            
-        page += 1
+            # 2. API GraphQL: Filtra PRs por review e tempo de vida
+            all_filtered.extend(await screen_page(session, semaphore, pause, repos, min_prs, batches, screen_mode))
+
+            print(f"\n✅ Página {page} finalizada. Total acumulado: {len(all_filtered)} repositórios válidos.")
+            print("-" * 50)
+
+            # 4. Salva o progresso
+            if all_filtered:
+                save_repos_to_files(all_filtered, OUTPUT_CSV)
+
+            page += 1
+
+        if not next_page.done():
+            next_page.cancel()
 
     return all_filtered[:needed]
 
+def filter_repos_with_min_prs(token, needed=TARGET_REPOS, min_prs=MIN_PRS_WITH_REVIEW, screen_mode=SCREEN_MODE):
+    """Versão síncrona de filter_repos_with_min_prs_async."""
+    return asyncio.run(filter_repos_with_min_prs_async(token, needed, min_prs, screen_mode))
+
 def save_repos_to_files(repos, file_path):
     """Salva a lista de repositórios em um arquivo CSV."""
     if not repos:
@@ -198,7 +396,7 @@ def save_repos_to_files(repos, file_path):
     # Colunas requeridas no output
     selected = [
         "id", "full_name", "description", "language",
-        "stargazers_count", "forks_count", "open_issues_count", "pr_count"
+        "stargazers_count", "forks_count", "open_issues_count", "pr_count", "pr_count_source"
     ]
     
     rows = [{k: r.get(k) for k in selected} for r in repos]
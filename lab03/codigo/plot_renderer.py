@@ -0,0 +1,334 @@
+import hashlib
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.stats as stats
+from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+
+MANIFEST_FILENAME = '.plots_manifest.json'
+PLOT_STYLE = 'seaborn-v0_8'
+PLOT_PALETTE = 'husl'
+
+# Acima disso, dispersões viram mapas de densidade e Q-Q plots são desenhados com quantis amostrados
+SCATTER_MAX_POINTS = 20_000
+DENSITY_BINS = 200
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """Descreve uma figura: a função que a desenha, os dados de entrada e o arquivo de saída."""
+    path: str
+    draw: Callable
+    data: Dict = field(default_factory=dict)
+    figsize: Tuple[float, float] = (10, 6)
+    dpi: int = 300
+
+
+def _init_worker():
+    """Backend Agg (sem janela) e o mesmo estilo do analysis.py nos processos de renderização."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use(PLOT_STYLE)
+    sns.set_palette(PLOT_PALETTE)
+
+
+def _render(spec: FigureSpec) -> str:
+    """Desenha e salva uma figura (roda no processo filho)."""
+    fig = Figure(figsize=spec.figsize)
+    spec.draw(fig, **spec.data)
+    fig.savefig(spec.path, dpi=spec.dpi, bbox_inches='tight')
+    return spec.path
+
+
+def histogram_inputs(values: np.ndarray, bins: int = 30) -> Dict:
+    """
+    Histograma (densidade) e parâmetros da normal ajustada, calculados antes do envio ao worker.
+
+    Args:
+        values (np.ndarray): Valores da variável
+        bins (int): Número de classes
+
+    Returns:
+        Dict: density, edges, mean e std
+    """
+    density, edges = np.histogram(values, bins=bins, density=True)
+    return {'density': density, 'edges': edges, 'mean': float(np.mean(values)), 'std': float(np.std(values, ddof=1))}
+
+
+def qq_inputs(values: np.ndarray, max_points: int = SCATTER_MAX_POINTS) -> Dict:
+    """
+    Quantis do Q-Q plot normal, com no máximo max_points pontos (amostrados em posições uniformes, extremos incluídos).
+
+    Args:
+        values (np.ndarray): Valores da variável
+        max_points (int): Número máximo de pontos desenhados
+
+    Returns:
+        Dict: theoretical, ordered e fit (inclinação, intercepto, r)
+    """
+    (theoretical, ordered), fit = stats.probplot(values, dist='norm')
+    if len(ordered) > max_points:
+        keep = np.unique(np.linspace(0, len(ordered) - 1, max_points).round().astype(int))
+        theoretical, ordered = theoretical[keep], ordered[keep]
+    return {'theoretical': theoretical, 'ordered': ordered, 'fit': tuple(float(v) for v in fit)}
+
+
+def draw_distribution_grid(fig: Figure, names: List[str], histograms: List[Dict], p_values: List[float]):
+    """Grade 3x3 de histogramas com a curva normal ajustada."""
+    axes = fig.subplots(3, 3).ravel()
+    for ax, var, hist, p_value in zip(axes, names, histograms, p_values):
+        edges = hist['edges']
+        ax.hist(edges[:-1], bins=edges, weights=hist['density'], alpha=0.7, color='skyblue')
+
+        xmin, xmax = ax.get_xlim()
+        x = np.linspace(xmin, xmax, 100)
+        ax.plot(x, stats.norm.pdf(x, hist['mean'], hist['std']), 'k', linewidth=2, label='Distribuição Normal')
+
+        ax.set_title(f'Distribuição de {var}\n(p-value: {p_value:.4f})')
+        ax.set_xlabel(var)
+        ax.set_ylabel('Densidade')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    for ax in axes[len(names):]:
+        fig.delaxes(ax)
+    fig.tight_layout()
+
+
+def draw_qq_grid(fig: Figure, names: List[str], quantiles: List[Dict]):
+    """Grade 3x3 de Q-Q plots contra a normal."""
+    axes = fig.subplots(3, 3).ravel()
+    for ax, var, qq in zip(axes, names, quantiles):
+        slope, intercept, _ = qq['fit']
+        ax.plot(qq['theoretical'], qq['ordered'], 'bo')
+        ax.plot(qq['theoretical'], slope * qq['theoretical'] + intercept, 'r-')
+        ax.set_xlabel('Theoretical quantiles')
+        ax.set_ylabel('Ordered Values')
+        ax.set_title(f'Q-Q Plot: {var}')
+        ax.grid(True, alpha=0.3)
+
+    for ax in axes[len(names):]:
+        fig.delaxes(ax)
+    fig.tight_layout()
+
+
+def draw_boxplot(fig: Figure, x: np.ndarray, y: np.ndarray, title: str, xlabel: str, ylabel: str):
+    """Boxplot de y agrupado por x."""
+    import seaborn as sns
+
+    ax = fig.add_subplot()
+    sns.boxplot(x=x, y=y, ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def draw_scatter(fig: Figure, x: np.ndarray, y: np.ndarray, title: str, xlabel: str, ylabel: str):
+    """Dispersão ponto a ponto."""
+    ax = fig.add_subplot()
+    ax.scatter(x, y, alpha=0.5)
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def draw_density(fig: Figure, xedges: np.ndarray, yedges: np.ndarray, counts: np.ndarray,
+                 title: str, xlabel: str, ylabel: str):
+    """Mapa de densidade (contagens por célula, escala log) no lugar de uma dispersão grande."""
+    ax = fig.add_subplot()
+    mesh = ax.pcolormesh(xedges, yedges, np.ma.masked_equal(counts.T, 0), norm=LogNorm(), cmap='viridis')
+    fig.colorbar(mesh, ax=ax, label='PRs')
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+
+def scatter_spec(path: str, x: np.ndarray, y: np.ndarray, title: str, xlabel: str, ylabel: str,
+                 max_points: int = SCATTER_MAX_POINTS, bins: int = DENSITY_BINS) -> FigureSpec:
+    """
+    Figura de dispersão; com mais de max_points pontos, os dados são agrupados em células antes de ir ao worker.
+
+    Args:
+        path (str): Arquivo de saída
+        x (np.ndarray): Valores do eixo x
+        y (np.ndarray): Valores do eixo y
+        title (str): Título
+        xlabel (str): Rótulo do eixo x
+        ylabel (str): Rótulo do eixo y
+        max_points (int): Limite de pontos para a dispersão ponto a ponto
+        bins (int): Células por eixo do mapa de densidade
+
+    Returns:
+        FigureSpec: Figura pronta para o PlotRenderer
+    """
+    labels = {'title': title, 'xlabel': xlabel, 'ylabel': ylabel}
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(x) <= max_points:
+        return FigureSpec(path, draw_scatter, {'x': x, 'y': y, **labels})
+
+    # Eixos com poucos valores distintos (ex.: número de revisões) ganham uma célula por valor
+    edges = []
+    for values in (x, y):
+        uniques = np.unique(values)
+        if len(uniques) <= bins:
+            mids = (uniques[:-1] + uniques[1:]) / 2
+            step = np.diff(uniques).min() / 2 if len(uniques) > 1 else 0.5
+            edges.append(np.concatenate([[uniques[0] - step], mids, [uniques[-1] + step]]))
+        else:
+            edges.append(bins)
+    counts, xedges, yedges = np.histogram2d(x, y, bins=edges)
+    return FigureSpec(path, draw_density, {'xedges': xedges, 'yedges': yedges, 'counts': counts, **labels})
+
+
+class FigureManifest:
+    """
+    Manifesto das figuras já salvas em um diretório.
+
+    Para cada arquivo guarda o hash dos dados de entrada, das dimensões e do
+    código-fonte deste módulo. Se o hash não mudou e o arquivo ainda existe,
+    a figura não precisa ser desenhada de novo.
+    """
+
+    def __init__(self, output_dir: str):
+        """
+        Carrega o manifesto do diretório de figuras.
+
+        Args:
+            output_dir (str): Diretório onde as figuras são salvas
+        """
+        self.path = os.path.join(output_dir, MANIFEST_FILENAME)
+        self.entries: Dict[str, str] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"⚠️  Manifesto de figuras inválido em {self.path}; todas serão regeradas")
+
+    @staticmethod
+    def _update(digest, value):
+        """Alimenta o hash com um valor (arrays pelo conteúdo binário, coleções item a item, o resto pelo repr)."""
+        if isinstance(value, np.ndarray):
+            digest.update(f'ndarray:{value.dtype.str}:{value.shape}'.encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, dict):
+            digest.update(f'dict:{len(value)}'.encode())
+            for key in sorted(value):
+                digest.update(repr(key).encode('utf-8'))
+                FigureManifest._update(digest, value[key])
+        elif isinstance(value, (list, tuple)):
+            digest.update(f'{type(value).__name__}:{len(value)}'.encode())
+            for item in value:
+                FigureManifest._update(digest, item)
+        else:
+            digest.update(repr(value).encode('utf-8'))
+
+    @staticmethod
+    def fingerprint(spec: FigureSpec) -> str:
+        """
+        Hash de uma figura.
+
+        Args:
+            spec (FigureSpec): Figura a desenhar
+
+        Returns:
+            str: Hash SHA-256 em hexadecimal
+        """
+        digest = hashlib.sha256()
+        digest.update(spec.draw.__qualname__.encode())
+        module = sys.modules.get(spec.draw.__module__)
+        if module is not None:
+            digest.update(inspect.getsource(module).encode('utf-8'))
+        FigureManifest._update(digest, (spec.data, spec.figsize, spec.dpi))
+        return digest.hexdigest()
+
+    def is_current(self, spec: FigureSpec, fingerprint: str) -> bool:
+        """Indica se o arquivo da figura existe e foi gerado com as mesmas entradas."""
+        return self.entries.get(spec.path) == fingerprint and os.path.exists(spec.path)
+
+    def record(self, spec: FigureSpec, fingerprint: str):
+        """Registra uma figura recém-salva."""
+        self.entries[spec.path] = fingerprint
+
+    def save(self):
+        """Grava o manifesto de forma atômica."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class PlotRenderer:
+    """
+    Renderiza as figuras da análise em paralelo.
+
+    As funções de desenho usam a API orientada a objetos (Figure) em vez do
+    estado global do pyplot, então cada figura pode ser desenhada em um
+    processo separado. Figuras cujas entradas não mudaram desde a última
+    execução são puladas.
+    """
+
+    def __init__(self, output_dir: str = 'plots', workers: Optional[int] = None, force: bool = False):
+        """
+        Inicializa o renderizador.
+
+        Args:
+            output_dir (str): Diretório das figuras (onde fica o manifesto)
+            workers (int): Número de processos (padrão: número de CPUs). Com 1, renderiza em sequência
+            force (bool): Regera todas as figuras, ignorando o manifesto
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest = FigureManifest(output_dir)
+        self.force = force
+
+    def render(self, specs: List[FigureSpec]) -> List[str]:
+        """
+        Gera as figuras desatualizadas.
+
+        Args:
+            specs (List[FigureSpec]): Figuras a gerar
+
+        Returns:
+            List[str]: Caminhos das figuras efetivamente desenhadas
+        """
+        fingerprints = {spec.path: FigureManifest.fingerprint(spec) for spec in specs}
+        pending = [spec for spec in specs
+                   if self.force or not self.manifest.is_current(spec, fingerprints[spec.path])]
+
+        skipped = len(specs) - len(pending)
+        if skipped:
+            print(f"♻️  {skipped} figuras inalteradas reaproveitadas")
+
+        rendered = self._render_all(pending)
+        for spec in pending:
+            self.manifest.record(spec, fingerprints[spec.path])
+        if pending:
+            self.manifest.save()
+        return rendered
+
+    def _render_all(self, specs: List[FigureSpec]) -> List[str]:
+        """Desenha as figuras informadas, em sequência ou no pool de processos."""
+        if not specs:
+            return []
+
+        if self.workers == 1 or len(specs) == 1:
+            _init_worker()
+            return [_render(spec) for spec in specs]
+
+        workers = min(self.workers, len(specs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_render, spec) for spec in specs]
+            rendered = [future.result() for future in as_completed(futures)]
+
+        print(f"🎨 {len(rendered)} figuras geradas com {workers} processos")
+        return rendered
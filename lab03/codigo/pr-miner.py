@@ -7,19 +7,74 @@ from datetime import datetime, timedelta
 from github import Github
 from github import RateLimitExceededException, UnknownObjectException
 import concurrent.futures
-import random
 import sys
 import threading
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(BASE_DIR))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from shared.graphql_client import GraphQLClient, TokenPool, RATE_LIMIT_FIELD  # noqa: E402
+from shared.response_cache import ResponseCache  # noqa: E402
+from pr_store import PRStore, ResumeIndex  # noqa: E402
+from repo_scheduler import RepoScheduler  # noqa: E402
+
 DATA_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
 INPUT_REPOS_CSV = os.path.join(DATA_DIR, "cloned_repos.csv")
 OUTPUT_PRS_CSV = os.path.join(DATA_DIR, "collected_prs_details.csv")
+OUTPUT_PRS_DB = os.path.join(DATA_DIR, "collected_prs.sqlite")
 MAX_THREADS = 4
+# Requisições GraphQL estimadas por repositório, usadas para dimensionar as threads pelo saldo
+REQUESTS_PER_REPO = 3
+# Intervalo mínimo entre linhas de métricas da fila, em segundos
+METRICS_INTERVAL = 30
 MAX_PRS_PER_REPO = 101
 
+# Modo em lote: lista os PRs com os detalhes já incluídos, PR_PAGE_SIZE por requisição GraphQL.
+# Com False, usa o modo antigo (listagem REST + uma requisição GraphQL por PR).
+BATCHED_MODE = True
+PR_PAGE_SIZE = 100
+MIN_PR_PAGE_SIZE = 25
+
+# Campos de cada PR, usados tanto na busca individual quanto na paginada
+PR_DETAIL_FIELDS = """
+    number
+    id
+    title
+    body
+    state
+    merged
+    createdAt
+    closedAt
+    mergedAt
+    additions
+    deletions
+    changedFiles
+    reviews { totalCount }
+    comments { totalCount }
+    reviewThreads { totalCount }
+    participants { totalCount }
+"""
+
+PR_PAGE_QUERY = f"""
+query ClosedPullRequests($owner: String!, $name: String!, $first: Int!, $after: String) {{
+    repository(owner: $owner, name: $name) {{
+        pullRequests(states: [CLOSED, MERGED], orderBy: {{field: CREATED_AT, direction: DESC}},
+                     first: $first, after: $after) {{
+            totalCount
+            pageInfo {{ hasNextPage endCursor }}
+            nodes {{ {PR_DETAIL_FIELDS} }}
+        }}
+    }}
+    {RATE_LIMIT_FIELD}
+}}
+"""
+
 class GitHubTokenManager:
     """Gerencia a rotação de múltiplos tokens do GitHub para resiliência."""
     def __init__(self):
@@ -39,6 +94,10 @@ class GitHubTokenManager:
         self.g = self._init_github_instance(self.active_token)
         self.lock = threading.Lock()
 
+        # Requisições GraphQL vão para o token com mais saldo, sem esperar o 403
+        self.pool = TokenPool(self.tokens)
+        self.client = GraphQLClient(self.pool)
+
         tqdm.write(f"\n🔑 Gerenciador de Tokens iniciado com {self.max_tokens} token(s).")
     
     def _init_github_instance(self, token):
@@ -81,7 +140,7 @@ class GitHubTokenManager:
                 
                 reset_timestamp = limit_info.reset.timestamp()
                 now = time.time()
-                wait_seconds = max(int(reset_timestamp - now + 10), 600) 
+                wait_seconds = max(int(reset_timestamp - now + 10), 10)
                 
                 tqdm.write(f" Todos os {self.max_tokens} tokens atingiram o limite.")
                 tqdm.write(f" Estimativa de espera: {time.strftime('%H:%M:%S', time.gmtime(wait_seconds))} (Reset: {time.ctime(reset_timestamp)})...")
@@ -111,117 +170,197 @@ def load_repos(file_path):
     
     return pd.read_csv(file_path)
 
-def load_collected_prs(file_path):
-    """Carrega PRs já coletados para garantir continuidade."""
-    required_cols = [
-        "repo_full_name", "pr_number", "created_at", "closed_at", 
-        "review_count", "time_to_close_hours" 
-    ]
-    if os.path.exists(file_path):
-        try:
-            df = pd.read_csv(file_path)
-            if all(col in df.columns for col in required_cols):
-                 return df
-            else:
-                tqdm.write(f" Arquivo '{file_path}' tem colunas incorretas. Iniciando novo arquivo.")
-        except Exception as e:
-            tqdm.write(f" Erro ao ler '{file_path}': {e}. Iniciando novo arquivo.")
-    
-    cols = required_cols + [
-        "title", "body", "merged", "merged_at", "files_changed", 
-        "additions", "deletions", "comments", "review_comments", "participant_count"
-    ]
-    return pd.DataFrame(columns=cols)
-
-def save_prs_to_file(df, file_path):
-    """Salva o DataFrame de PRs no arquivo CSV de forma incremental."""
-    df.to_csv(file_path, index=False, encoding='utf-8')
-    tqdm.write(f"Progresso salvo: {df.shape[0]} PRs em {file_path}")
-
-def filter_remaining_repos(repos_df, collected_df):
+def filter_remaining_repos(repos_df, index):
     """
-    Filtra os repositórios que já tiveram todos os seus PRs coletados.
-    Se um repositório estiver no CSV de PRs, ele é considerado 'iniciado'.
-    Para o propósito de continuidade simples, vamos considerar que, se o repositório
-    estiver no arquivo de PRs, ele foi processado. Você pode refinar isso depois.
+    Filtra os repositórios que ainda não foram concluídos.
+    Um repositório está concluído se atingiu MAX_PRS_PER_REPO PRs válidos ou se
+    sua listagem de PRs terminou; repositórios parciais continuam do último cursor.
     """
-    if collected_df.empty:
-        return repos_df['full_name'].tolist()
-        
-    collected_repos = set(collected_df['repo_full_name'].unique())
-    all_repos = repos_df['full_name'].tolist()
-    remaining = [repo for repo in all_repos if repo not in collected_repos]
-    
-    
-    return remaining
+    return index.remaining(repos_df['full_name'].tolist())
 
-
-
-def fetch_pr_details_graphql(manager, owner, repo_name, pr_number):
+def fetch_pr_details_graphql(manager, owner, repo_name, pr_number, cache=None):
     """
     Busca todos os detalhes de um único PR (reviews, comments, files, etc.)
     em uma única requisição GraphQL.
+    Se um cache for informado, respostas já obtidas em execuções anteriores
+    são reaproveitadas sem consumir o rate limit.
+    Retorna None se a requisição falhar em todos os tokens.
     """
     query = {
         "query": f"""
         {{
             repository(owner: "{owner}", name: "{repo_name}") {{
                 pullRequest(number: {pr_number}) {{
-                    id
-                    title
-                    body
-                    state
-                    merged
-                    createdAt
-                    closedAt
-                    mergedAt
-                    additions
-                    deletions
-                    changedFiles
-                    reviews {{ totalCount }}
-                    comments {{ totalCount }}
-                    reviewThreads {{ totalCount }}
-                    participants {{ totalCount }}
+                    {PR_DETAIL_FIELDS}
                 }}
             }}
+            {RATE_LIMIT_FIELD}
         }}
         """
     }
     
-    headers = {"Authorization": f"bearer {manager.active_token}"}
-    
+    if cache is not None:
+        cached = cache.get(query["query"])
+        if cached is not None:
+            return cached["data"]["repository"]["pullRequest"]
+
     try:
-        r = requests.post("https://api.github.com/graphql", headers=headers, json=query)
-        
-        if r.status_code == 403:
-            
-            return None 
-            
-        r.raise_for_status() 
-        
-        response_json = r.json()
+        # O cliente escolhe o token com mais saldo e troca de token sozinho em caso de 403
+        response_json = manager.client.execute(query["query"])
 
         if "errors" in response_json or not response_json.get("data", {}).get("repository", {}).get("pullRequest"):
             tqdm.write(f"   GraphQL Error para PR #{pr_number}: {response_json.get('errors', ['Desconhecido'])}")
             return None
 
+        if cache is not None:
+            cache.set(query["query"], None, response_json)
+
         return response_json["data"]["repository"]["pullRequest"]
     
     except requests.exceptions.RequestException as e:
         tqdm.write(f"    Erro de requisição GraphQL para PR #{pr_number}: {type(e).__name__}")
         return None
 
-def process_single_repo(manager, repo_name, collected_prs_df):
+def fetch_pr_page(manager, owner, repo_name, after=None, cache=None, first=PR_PAGE_SIZE):
+    """
+    Busca uma página de PRs fechados/mergeados (mais recentes primeiro) já com
+    todos os detalhes, em uma única requisição GraphQL.
+    Retorna a resposta completa da API ou None se a requisição falhar em todos os tokens.
+    """
+    variables = {"owner": owner, "name": repo_name, "first": first, "after": after}
+
+    if cache is not None:
+        cached = cache.get(PR_PAGE_QUERY, variables)
+        if cached is not None:
+            return cached
+
+    try:
+        response_json = manager.client.execute(PR_PAGE_QUERY, variables)
+    except requests.exceptions.RequestException as e:
+        tqdm.write(f"    Erro de requisição GraphQL para a página de PRs de {owner}/{repo_name}: {type(e).__name__}")
+        return None
+
+    if cache is not None and "errors" not in response_json:
+        cache.set(PR_PAGE_QUERY, variables, response_json)
+
+    return response_json
+
+def build_pr_record(repo_name, pr_number, pr_data_raw):
+    """
+    Monta a linha do CSV para um PR, ou retorna None se o PR não for válido
+    (sem datas, fechado em menos de 1 hora ou sem reviews).
+    """
+    pr_closed_at_str = pr_data_raw.get("closedAt")
+    pr_created_at_str = pr_data_raw.get("createdAt")
+
+    if not pr_closed_at_str or not pr_created_at_str:
+        return None
+
+    t_closed = datetime.fromisoformat(pr_closed_at_str.replace('Z', '+00:00'))
+    t_created = datetime.fromisoformat(pr_created_at_str.replace('Z', '+00:00'))
+
+    time_diff = t_closed - t_created
+    if time_diff.total_seconds() < 3600:
+        return None
+
+    review_count = pr_data_raw.get("reviews", {}).get("totalCount", 0)
+    if review_count == 0:
+        return None
+
+    return {
+        "repo_full_name": repo_name,
+        "pr_number": pr_number,
+        "title": pr_data_raw.get("title") or "",
+        "body": pr_data_raw.get("body") or "",
+        "state": pr_data_raw.get("state"),
+        "merged": pr_data_raw.get("merged"),
+        "created_at": pr_created_at_str,
+        "closed_at": pr_closed_at_str,
+        "merged_at": pr_data_raw.get("mergedAt"),
+        "files_changed": pr_data_raw.get("changedFiles"),
+        "additions": pr_data_raw.get("additions"),
+        "deletions": pr_data_raw.get("deletions"),
+        "review_count": review_count,
+        "comments": pr_data_raw.get("comments", {}).get("totalCount", 0),
+        "review_comments": pr_data_raw.get("reviewThreads", {}).get("totalCount", 0),
+        "participant_count": pr_data_raw.get("participants", {}).get("totalCount", 0),
+        "time_to_close_hours": time_diff.total_seconds() / 3600,
+    }
+
+def collect_repo_prs_batched(manager, repo_name, index, repo_prs_data, cache=None):
+    """
+    Coleta os PRs de um repositório página a página (PR_PAGE_SIZE por requisição),
+    a partir do último cursor salvo no índice de retomada.
+    Os PRs válidos vão para repo_prs_data e cada página é gravada com seu cursor.
+    Retorna 'done', 'requeue' ou 'not_found'.
+    """
+    owner, name = repo_name.split("/")
+    processed_pr_numbers = index.processed(repo_name)
+    valid_pr_count = len(processed_pr_numbers)
+    page_size = PR_PAGE_SIZE
+    after = index.cursor(repo_name)
+
+    pr_bar = tqdm(total=MAX_PRS_PER_REPO, initial=valid_pr_count, desc=f" {repo_name}")
+    try:
+        while valid_pr_count < MAX_PRS_PER_REPO:
+            response_json = fetch_pr_page(manager, owner, name, after, cache, page_size)
+
+            if response_json is None:
+                # Páginas grandes (corpo dos PRs) podem estourar o tempo da API: tenta páginas menores
+                if page_size > MIN_PR_PAGE_SIZE:
+                    page_size //= 2
+                    continue
+                tqdm.write(f" Erro GraphQL (Possível Rate Limit) em '{repo_name}'. Retornando progresso parcial e re-enviando.")
+                return 'requeue'
+
+            repository = (response_json.get("data") or {}).get("repository")
+            if repository is None:
+                errors = response_json.get("errors", [])
+                if any(error.get("type") == "NOT_FOUND" for error in errors):
+                    return 'not_found'
+                tqdm.write(f"   GraphQL Error na página de PRs de '{repo_name}': {errors or ['Desconhecido']}")
+                return 'requeue'
+
+            connection = repository["pullRequests"]
+            page_start = len(repo_prs_data)
+            for node in connection["nodes"]:
+                if valid_pr_count >= MAX_PRS_PER_REPO:
+                    break
+                if node["number"] in processed_pr_numbers:
+                    continue
+
+                pr_data = build_pr_record(repo_name, node["number"], node)
+                if pr_data is None:
+                    continue
+
+                repo_prs_data.append(pr_data)
+                valid_pr_count += 1
+                pr_bar.update(1)
+
+            index.record_page(repo_name, repo_prs_data[page_start:], connection["pageInfo"]["endCursor"])
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            after = connection["pageInfo"]["endCursor"]
+    finally:
+        pr_bar.close()
+
+    if valid_pr_count >= MAX_PRS_PER_REPO:
+        tqdm.write(f" Limite de {MAX_PRS_PER_REPO} PRs válidos atingido para '{repo_name}'. Parando.")
+    return 'done'
+
+def process_single_repo(manager, repo_name, index, cache=None):
     """
     Coleta os detalhes dos PRs para um único repositório, limitado por MAX_PRS_PER_REPO.
+    Os PRs são gravados pelo índice de retomada à medida que são coletados.
     Retorna uma tupla: (DataFrame de PRs coletados, bool_needs_requeue).
-    Se bool_needs_requeue for True, o repositório deve ser re-enviado para a fila após salvar o progresso.
+    Se bool_needs_requeue for True, o repositório deve ser re-enviado para a fila.
     """
     tqdm.write(f"\n--- Iniciando coleta em: {repo_name} (Máx: {MAX_PRS_PER_REPO} PRs válidos) ---")
     owner, name = repo_name.split("/")
     repo_prs_data = []
     
-    processed_pr_numbers = set(collected_prs_df[collected_prs_df['repo_full_name'] == repo_name]['pr_number'])
+    processed_pr_numbers = index.processed(repo_name)
     
     valid_pr_count = len(processed_pr_numbers)
     
@@ -230,6 +369,19 @@ def process_single_repo(manager, repo_name, collected_prs_df):
         return pd.DataFrame(), False 
     
     try:
+        if BATCHED_MODE:
+            status = collect_repo_prs_batched(manager, repo_name, index, repo_prs_data, cache)
+            if status == 'not_found':
+                tqdm.write(f" Repositório '{repo_name}' não encontrado no GitHub. Pulando.")
+                index.mark_done(repo_name)
+                return pd.DataFrame(), False # SKIP
+            if status == 'requeue':
+                return pd.DataFrame(repo_prs_data), True # PARTIAL + REQUEUE
+
+            index.mark_done(repo_name)
+            tqdm.write(f" Repositório '{repo_name}' concluído com {len(repo_prs_data)} PRs coletados nesta sessão.")
+            return pd.DataFrame(repo_prs_data), False # SUCCESS
+
         repo = manager.g.get_repo(repo_name)
         prs_list = repo.get_pulls(state='closed', sort='created', direction='desc')
         
@@ -245,53 +397,22 @@ def process_single_repo(manager, repo_name, collected_prs_df):
                 pr_bar.set_description(f" {repo_name} (Pulando {len(processed_pr_numbers)} já coletados)")
                 continue
 
-            pr_data_raw = fetch_pr_details_graphql(manager, owner, name, pr.number)
+            pr_data_raw = fetch_pr_details_graphql(manager, owner, name, pr.number, cache)
             
             if pr_data_raw is None:
                 manager.rotate_token()
                 tqdm.write(f" Erro GraphQL (Possível Rate Limit) em '{repo_name}'. Retornando progresso parcial e re-enviando.")
                 return pd.DataFrame(repo_prs_data), True
             
-            pr_closed_at_str = pr_data_raw.get("closedAt")
-            pr_created_at_str = pr_data_raw.get("createdAt")
-            
-            if not pr_closed_at_str or not pr_created_at_str:
+            pr_data = build_pr_record(repo_name, pr.number, pr_data_raw)
+            if pr_data is None:
                 continue
 
-            t_closed = datetime.fromisoformat(pr_closed_at_str.replace('Z', '+00:00'))
-            t_created = datetime.fromisoformat(pr_created_at_str.replace('Z', '+00:00'))
-
-            time_diff = t_closed - t_created
-            if time_diff.total_seconds() < 3600:
-                continue
-            
-            review_count = pr_data_raw.get("reviews", {}).get("totalCount", 0)
-            if review_count == 0: 
-                continue
-
-            valid_pr_count += 1 
-
-            pr_data = {
-                "repo_full_name": repo_name,
-                "pr_number": pr.number,
-                "title": pr_data_raw.get("title") or "",
-                "body": pr_data_raw.get("body") or "",
-                "state": pr_data_raw.get("state"),
-                "merged": pr_data_raw.get("merged"),
-                "created_at": pr_created_at_str,
-                "closed_at": pr_closed_at_str,
-                "merged_at": pr_data_raw.get("mergedAt"),
-                "files_changed": pr_data_raw.get("changedFiles"),
-                "additions": pr_data_raw.get("additions"),
-                "deletions": pr_data_raw.get("deletions"),
-                "review_count": review_count, 
-                "comments": pr_data_raw.get("comments", {}).get("totalCount", 0),
-                "review_comments": pr_data_raw.get("reviewThreads", {}).get("totalCount", 0),
-                "participant_count": pr_data_raw.get("participants", {}).get("totalCount", 0),
-                "time_to_close_hours": time_diff.total_seconds() / 3600,
-            }
+            valid_pr_count += 1
             repo_prs_data.append(pr_data)
+            index.record_page(repo_name, [pr_data])
 
+        index.mark_done(repo_name)
         tqdm.write(f" Repositório '{repo_name}' concluído com {len(repo_prs_data)} PRs coletados nesta sessão.")
         return pd.DataFrame(repo_prs_data), False # SUCCESS
     
@@ -301,11 +422,12 @@ def process_single_repo(manager, repo_name, collected_prs_df):
     
     except UnknownObjectException:
         tqdm.write(f" Repositório '{repo_name}' não encontrado no GitHub. Pulando.")
+        index.mark_done(repo_name)
         return pd.DataFrame(), False # SKIP
         
     except Exception as e:
+        # Sem sleep aqui: o scheduler reenvia o repositório com atraso, sem segurar a thread
         tqdm.write(f" Erro geral durante a coleta de PRs de '{repo_name}': {type(e).__name__} - {e}")
-        time.sleep(random.randint(30, 90))
         return pd.DataFrame(repo_prs_data), True # PARTIAL + REQUEUE
 
         
@@ -313,49 +435,77 @@ def main():
     start_time = time.time()
     
     manager = GitHubTokenManager()
+    cache = ResponseCache()
+    store = PRStore(OUTPUT_PRS_DB)
+
+    # Migração: importa o CSV de execuções anteriores para o banco na primeira vez
+    if store.count() == 0 and os.path.exists(OUTPUT_PRS_CSV):
+        imported = store.import_csv(OUTPUT_PRS_CSV)
+        tqdm.write(f" {imported} PRs importados de '{OUTPUT_PRS_CSV}' para '{OUTPUT_PRS_DB}'.")
     
     repos_df = load_repos(INPUT_REPOS_CSV)
     if repos_df.empty:
         return
-    collected_prs_df = load_collected_prs(OUTPUT_PRS_CSV)
+    # Índice de retomada carregado uma vez e compartilhado pelas threads
+    index = ResumeIndex(store, MAX_PRS_PER_REPO)
 
-    remaining_repos = filter_remaining_repos(repos_df, collected_prs_df)
+    remaining_repos = filter_remaining_repos(repos_df, index)
     
     if not remaining_repos:
+        # Uma execução anterior pode ter completado o banco e falhado antes de exportar
+        exported = store.export_csv(OUTPUT_PRS_CSV)
+        store.close()
         tqdm.write("\n Todos os repositórios foram processados. Fim da coleta.")
+        tqdm.write(f"Dados salvos em: {OUTPUT_PRS_CSV} ({exported} PRs)")
         return
 
     total_repos = len(remaining_repos)
-    tqdm.write(f"\n Iniciando coleta detalhada de {total_repos} repositórios restantes com {MAX_THREADS} threads...")
+    tqdm.write(f"\n Iniciando coleta detalhada de {total_repos} repositórios restantes com até {MAX_THREADS} threads...")
 
-    all_prs_data = collected_prs_df.to_dict(orient="records")
-    
-    repo_queue = list(remaining_repos)
+    scheduler = RepoScheduler(remaining_repos)
     repos_processed_count = 0
+    last_metrics = 0.0
     
     with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
         
         future_to_repo = {}
         
-        while repo_queue or future_to_repo:
-            
-            while repo_queue and len(future_to_repo) < MAX_THREADS:
-                repo_name = repo_queue.pop(0)
+        while len(scheduler) or future_to_repo:
+
+            # Threads ativas proporcionais ao saldo: perto do limite, menos repositórios em paralelo
+            requests_per_repo = REQUESTS_PER_REPO if BATCHED_MODE else MAX_PRS_PER_REPO
+            target = RepoScheduler.target_workers(
+                manager.pool, MAX_THREADS, requests_per_repo * manager.pool.estimated_cost
+            )
+
+            while len(future_to_repo) < target:
+                item = scheduler.pop_ready()
+                if item is None:
+                    break
+                repo_name, attempts = item
                 
-                future = executor.submit(process_single_repo, manager, repo_name, collected_prs_df)
-                future_to_repo[future] = repo_name
-                tqdm.write(f"Thread iniciada para: {repo_name}. (Fila: {len(repo_queue)}, Ativas: {len(future_to_repo)})")
+                future = executor.submit(process_single_repo, manager, repo_name, index, cache)
+                future_to_repo[future] = (repo_name, attempts)
+                tqdm.write(f"Thread iniciada para: {repo_name}. (Fila: {len(scheduler)}, Ativas: {len(future_to_repo)}/{target})")
 
             if not future_to_repo:
-                break 
+                # Só restam repositórios em backoff: espera o primeiro ser liberado
+                wait_seconds = scheduler.next_ready_in()
+                if wait_seconds is None:
+                    break
+                time.sleep(wait_seconds)
+                continue
 
+            # Com vaga livre, acorda também quando um repositório em backoff for liberado
+            timeout = scheduler.next_ready_in() if len(future_to_repo) < target else None
             done, _ = concurrent.futures.wait(
                 future_to_repo, 
+                timeout=timeout,
                 return_when=concurrent.futures.FIRST_COMPLETED
             )
             
             for future in done:
-                repo_name = future_to_repo.pop(future)
+                repo_name, attempts = future_to_repo.pop(future)
                 
                 try:
                     result = future.result()
@@ -366,38 +516,48 @@ def main():
                     result_df, needs_requeue = result
 
                     if needs_requeue:
-                        if not result_df.empty:
-                            all_prs_data.extend(result_df.to_dict(orient="records"))
-                            current_df = pd.DataFrame(all_prs_data)
-                            current_df.drop_duplicates(subset=["repo_full_name", "pr_number"], inplace=True)
-                            save_prs_to_file(current_df, OUTPUT_PRS_CSV) 
-                            tqdm.write(f"⚠️ Progresso PARCIAL de '{repo_name}' salvo: {len(result_df)} PRs novos. Repositório será re-enviado.")
+                        delay = scheduler.requeue(repo_name, attempts + 1, len(result_df))
+                        if delay is None:
+                            tqdm.write(f"❌ '{repo_name}' falhou {attempts + 1} vezes. Fica para a próxima execução.")
+                        elif not result_df.empty:
+                            tqdm.write(f"⚠️ Progresso PARCIAL de '{repo_name}' salvo: {len(result_df)} PRs novos. Repositório re-enviado em {delay:.0f}s.")
                         else:
-                            tqdm.write(f"⚠️ Rate Limit/Erro na thread de '{repo_name}'. Repositório será re-enviado.")
-                        repo_queue.insert(0, repo_name) 
+                            tqdm.write(f"⚠️ Rate Limit/Erro na thread de '{repo_name}'. Repositório re-enviado em {delay:.0f}s.")
 
                     elif result_df.empty:
                         tqdm.write(f"Repositório '{repo_name}' não retornou PRs válidos. Marcando como concluído.")
+                        scheduler.complete(repo_name)
                         repos_processed_count += 1
                         
                     else:
-                        all_prs_data.extend(result_df.to_dict(orient="records"))
-                        current_df = pd.DataFrame(all_prs_data)
-                        current_df.drop_duplicates(subset=["repo_full_name", "pr_number"], inplace=True)
-                        save_prs_to_file(current_df, OUTPUT_PRS_CSV) 
-                        
-                        tqdm.write(f" Repositório '{repo_name}' CONCLUÍDO. Total: {len(current_df)} PRs salvos.")
+                        tqdm.write(f" Repositório '{repo_name}' CONCLUÍDO. {len(result_df)} PRs novos salvos.")
+                        scheduler.complete(repo_name, len(result_df))
                         repos_processed_count += 1
 
                 except Exception as exc:
-                    tqdm.write(f" Erro fatal na thread de '{repo_name}': {exc}. Repositório re-enviado.")
-                    repo_queue.insert(0, repo_name) 
+                    delay = scheduler.requeue(repo_name, attempts + 1)
+                    if delay is None:
+                        tqdm.write(f" Erro fatal na thread de '{repo_name}': {exc}. Fica para a próxima execução.")
+                    else:
+                        tqdm.write(f" Erro fatal na thread de '{repo_name}': {exc}. Repositório re-enviado em {delay:.0f}s.")
+
+            if time.time() - last_metrics >= METRICS_INTERVAL:
+                tqdm.write(scheduler.status_line(len(future_to_repo), target, manager.pool))
+                last_metrics = time.time()
+
+    tqdm.write(scheduler.status_line(0, target, manager.pool))
             
+    # Exportação única do CSV final a partir do banco
+    exported = store.export_csv(OUTPUT_PRS_CSV)
+    store.close()
+
     print("\n" + "=" * 50)
     print(f" Processo Finalizado.")
     print(f"Total de Repositórios Processados: {repos_processed_count}")
+    if scheduler.abandoned:
+        print(f"Repositórios adiados para a próxima execução: {len(scheduler.abandoned)}")
     print(f"Tempo total de execução: {time.strftime('%H:%M:%S', time.gmtime(time.time() - start_time))}")
-    print(f"Dados salvos em: {OUTPUT_PRS_CSV}")
+    print(f"Dados salvos em: {OUTPUT_PRS_CSV} ({exported} PRs)")
     print("=" * 50)
 
 if __name__ == '__main__':
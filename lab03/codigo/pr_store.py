@@ -0,0 +1,298 @@
+import csv
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Colunas do CSV final de PRs, na ordem em que são exportadas
+PR_COLUMNS = {
+    "repo_full_name": "TEXT NOT NULL",
+    "pr_number": "INTEGER NOT NULL",
+    "title": "TEXT",
+    "body": "TEXT",
+    "state": "TEXT",
+    "merged": "INTEGER",
+    "created_at": "TEXT",
+    "closed_at": "TEXT",
+    "merged_at": "TEXT",
+    "files_changed": "INTEGER",
+    "additions": "INTEGER",
+    "deletions": "INTEGER",
+    "review_count": "INTEGER",
+    "comments": "INTEGER",
+    "review_comments": "INTEGER",
+    "participant_count": "INTEGER",
+    "time_to_close_hours": "REAL",
+}
+
+
+class PRStore:
+    """
+    Armazena os PRs coletados em SQLite, só com inserções.
+
+    Cada worker grava seus PRs assim que os coleta; a chave primária
+    (repo_full_name, pr_number) descarta duplicatas na própria inserção. O
+    custo de cada gravação não depende de quantos PRs já estão salvos, e o
+    CSV final é gerado uma única vez por export_csv().
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre (ou cria) o banco de PRs.
+
+        Args:
+            path (str): Caminho do arquivo SQLite
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        columns_sql = ", ".join(f"{name} {sql_type}" for name, sql_type in PR_COLUMNS.items())
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS prs ({columns_sql}, PRIMARY KEY (repo_full_name, pr_number))"
+        )
+        # Estado de retomada: último cursor da listagem de PRs e se o repositório terminou
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS repo_state (
+                repo_full_name TEXT PRIMARY KEY,
+                cursor TEXT,
+                done INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.commit()
+
+        placeholders = ", ".join("?" for _ in PR_COLUMNS)
+        self._insert_sql = f"INSERT OR IGNORE INTO prs ({', '.join(PR_COLUMNS)}) VALUES ({placeholders})"
+
+    def add(self, records: Iterable[Dict]) -> int:
+        """
+        Grava PRs (os já existentes são ignorados).
+
+        Args:
+            records (Iterable[Dict]): PRs no formato das linhas do CSV
+
+        Returns:
+            int: Quantidade de PRs novos gravados
+        """
+        return self.add_page(None, records)
+
+    def add_page(self, repo_full_name: Optional[str], records: Iterable[Dict], cursor: Optional[str] = None) -> int:
+        """
+        Grava uma página de PRs e o cursor da página na mesma transação.
+
+        Args:
+            repo_full_name (str): Repositório da página (None para gravar só os PRs)
+            records (Iterable[Dict]): PRs válidos da página
+            cursor (str): endCursor da página, de onde a coleta continua
+
+        Returns:
+            int: Quantidade de PRs novos gravados
+        """
+        rows = [tuple(record.get(column) for column in PR_COLUMNS) for record in records]
+
+        with self._lock:
+            before = self._conn.total_changes
+            if rows:
+                self._conn.executemany(self._insert_sql, rows)
+            inserted = self._conn.total_changes - before
+            if repo_full_name is not None and cursor is not None:
+                self._conn.execute(
+                    "INSERT INTO repo_state (repo_full_name, cursor) VALUES (?, ?) "
+                    "ON CONFLICT(repo_full_name) DO UPDATE SET cursor = excluded.cursor",
+                    (repo_full_name, cursor)
+                )
+            self._conn.commit()
+            return inserted
+
+    def mark_done(self, repo_full_name: str) -> None:
+        """Marca o repositório como concluído (não será minerado de novo)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO repo_state (repo_full_name, done) VALUES (?, 1) "
+                "ON CONFLICT(repo_full_name) DO UPDATE SET done = 1",
+                (repo_full_name,)
+            )
+            self._conn.commit()
+
+    def repo_states(self) -> Dict[str, Dict]:
+        """Estado salvo de cada repositório: {'cursor': str, 'done': bool}."""
+        with self._lock:
+            rows = self._conn.execute("SELECT repo_full_name, cursor, done FROM repo_state").fetchall()
+        return {repo: {"cursor": cursor, "done": bool(done)} for repo, cursor, done in rows}
+
+    def count(self, repo_full_name: Optional[str] = None) -> int:
+        """Quantidade de PRs salvos (no total ou de um repositório)."""
+        with self._lock:
+            if repo_full_name is None:
+                return self._conn.execute("SELECT COUNT(*) FROM prs").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM prs WHERE repo_full_name = ?", (repo_full_name,)
+            ).fetchone()[0]
+
+    def keys(self) -> List[Tuple[str, int]]:
+        """Pares (repo_full_name, pr_number) de todos os PRs salvos."""
+        with self._lock:
+            return self._conn.execute("SELECT repo_full_name, pr_number FROM prs").fetchall()
+
+    def pr_numbers(self, repo_full_name: str) -> Set[int]:
+        """Números dos PRs já salvos de um repositório."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pr_number FROM prs WHERE repo_full_name = ?", (repo_full_name,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def import_csv(self, csv_path: str) -> int:
+        """
+        Importa um CSV de PRs gerado por versões anteriores (migração).
+
+        Args:
+            csv_path (str): Caminho do CSV
+
+        Returns:
+            int: Quantidade de PRs importados
+        """
+        if not os.path.exists(csv_path):
+            return 0
+
+        imported = 0
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if not {"repo_full_name", "pr_number"} <= set(reader.fieldnames or []):
+                return 0
+
+            batch = []
+            for row in reader:
+                record = {column: (row.get(column) or None) for column in PR_COLUMNS}
+                if record["merged"] is not None:
+                    record["merged"] = int(record["merged"] in ("True", "true", "1"))
+                batch.append(record)
+                if len(batch) >= 5000:
+                    imported += self.add(batch)
+                    batch = []
+            imported += self.add(batch)
+        return imported
+
+    def export_csv(self, csv_path: str) -> int:
+        """
+        Exporta todos os PRs para CSV, na ordem em que foram coletados.
+
+        O arquivo é escrito em um temporário e renomeado, então uma
+        interrupção no meio não corrompe o CSV anterior.
+
+        Args:
+            csv_path (str): Caminho do CSV de saída
+
+        Returns:
+            int: Quantidade de PRs exportados
+        """
+        tmp_path = f"{csv_path}.tmp"
+        exported = 0
+        merged_index = list(PR_COLUMNS).index("merged")
+
+        with self._lock, open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(PR_COLUMNS)
+            cursor = self._conn.execute(f"SELECT {', '.join(PR_COLUMNS)} FROM prs ORDER BY rowid")
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                for row in rows:
+                    row = list(row)
+                    if row[merged_index] is not None:
+                        row[merged_index] = bool(row[merged_index])
+                    writer.writerow(row)
+                exported += len(rows)
+
+        os.replace(tmp_path, csv_path)
+        return exported
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+
+class ResumeIndex:
+    """
+    Índice de retomada da mineração, carregado uma vez e compartilhado entre as threads.
+
+    Guarda, por repositório, os números dos PRs já salvos (que também dão a
+    contagem de PRs válidos), o último cursor da listagem e se o
+    repositório terminou. Cada página coletada atualiza o índice e o PRStore
+    juntos, então uma execução interrompida continua exatamente de onde parou.
+    """
+
+    def __init__(self, store: PRStore, max_prs: int):
+        """
+        Carrega o índice a partir do banco.
+
+        Args:
+            store (PRStore): Banco de PRs
+            max_prs (int): PRs válidos por repositório para considerá-lo concluído
+        """
+        self.store = store
+        self.max_prs = max_prs
+        self._lock = threading.Lock()
+
+        self._processed = defaultdict(set)
+        for repo_full_name, pr_number in store.keys():
+            self._processed[repo_full_name].add(pr_number)
+        self._states = store.repo_states()
+
+    def processed(self, repo_full_name: str) -> Set[int]:
+        """Cópia dos números de PR já salvos do repositório."""
+        with self._lock:
+            return set(self._processed.get(repo_full_name, ()))
+
+    def valid_count(self, repo_full_name: str) -> int:
+        """Quantidade de PRs válidos já salvos do repositório."""
+        with self._lock:
+            return len(self._processed.get(repo_full_name, ()))
+
+    def cursor(self, repo_full_name: str) -> Optional[str]:
+        """Cursor de onde a listagem de PRs do repositório deve continuar."""
+        with self._lock:
+            return self._states.get(repo_full_name, {}).get("cursor")
+
+    def is_done(self, repo_full_name: str) -> bool:
+        """Se o repositório já foi concluído (marcado ou com max_prs PRs válidos)."""
+        with self._lock:
+            if self._states.get(repo_full_name, {}).get("done"):
+                return True
+            return len(self._processed.get(repo_full_name, ())) >= self.max_prs
+
+    def record_page(self, repo_full_name: str, records: List[Dict], cursor: Optional[str] = None) -> int:
+        """
+        Grava os PRs de uma página e avança o cursor do repositório.
+
+        Args:
+            repo_full_name (str): Repositório
+            records (List[Dict]): PRs válidos coletados
+            cursor (str): endCursor da página (None no modo sem cursor)
+
+        Returns:
+            int: Quantidade de PRs novos gravados
+        """
+        inserted = self.store.add_page(repo_full_name, records, cursor)
+        with self._lock:
+            self._processed[repo_full_name].update(record["pr_number"] for record in records)
+            if cursor is not None:
+                self._states.setdefault(repo_full_name, {"cursor": None, "done": False})["cursor"] = cursor
+        return inserted
+
+    def mark_done(self, repo_full_name: str) -> None:
+        """Marca o repositório como concluído."""
+        self.store.mark_done(repo_full_name)
+        with self._lock:
+            self._states.setdefault(repo_full_name, {"cursor": None, "done": False})["done"] = True
+
+    def remaining(self, repo_names: Iterable[str]) -> List[str]:
+        """Repositórios ainda não concluídos, na ordem recebida."""
+        return [repo for repo in repo_names if not self.is_done(repo)]
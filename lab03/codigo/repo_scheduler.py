@@ -0,0 +1,139 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+
+class RepoScheduler:
+    """
+    Fila de repositórios a minerar, ordenada por horário de liberação.
+
+    Repositórios novos saem na ordem em que foram enfileirados. Um
+    repositório que falhou volta para a fila com um atraso crescente
+    (backoff exponencial com jitter), sem segurar uma thread enquanto
+    espera. O scheduler também decide quantas threads manter ativas a
+    partir do saldo dos tokens e acompanha a vazão da coleta.
+    """
+
+    def __init__(self, repos: Iterable[str], base_delay: float = 5.0, max_delay: float = 600.0,
+                 max_attempts: int = 10):
+        """
+        Inicializa a fila.
+
+        Args:
+            repos (Iterable[str]): Repositórios a minerar, em ordem de prioridade
+            base_delay (float): Atraso da primeira retentativa, em segundos
+            max_delay (float): Atraso máximo entre retentativas
+            max_attempts (int): Tentativas por repositório antes de desistir nesta execução
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max_attempts
+
+        self._heap: List[Tuple[float, int, int, str]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+        self.started_at = time.time()
+        self.completed = 0
+        self.requeued = 0
+        self.abandoned: List[str] = []
+        self.prs_collected = 0
+
+        for repo in repos:
+            self.push(repo)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, repo: str, delay: float = 0.0, attempts: int = 0) -> None:
+        """Enfileira um repositório, liberado daqui a delay segundos."""
+        with self._lock:
+            heapq.heappush(self._heap, (time.time() + delay, next(self._sequence), attempts, repo))
+
+    def pop_ready(self) -> Optional[Tuple[str, int]]:
+        """
+        Retira o próximo repositório já liberado.
+
+        Returns:
+            (repositório, tentativas anteriores) ou None se nenhum estiver liberado
+        """
+        with self._lock:
+            if not self._heap or self._heap[0][0] > time.time():
+                return None
+            _, _, attempts, repo = heapq.heappop(self._heap)
+            return repo, attempts
+
+    def next_ready_in(self) -> Optional[float]:
+        """Segundos até o próximo repositório ser liberado (None se a fila estiver vazia)."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(self._heap[0][0] - time.time(), 0.0)
+
+    def waiting(self) -> int:
+        """Quantos repositórios da fila estão aguardando o atraso de retentativa."""
+        now = time.time()
+        with self._lock:
+            return sum(1 for ready_at, _, _, _ in self._heap if ready_at > now)
+
+    def requeue(self, repo: str, attempts: int, prs: int = 0) -> Optional[float]:
+        """
+        Reenvia um repositório que falhou, com backoff exponencial.
+
+        Args:
+            repo (str): Repositório
+            attempts (int): Tentativas já feitas (incluindo a que falhou)
+            prs (int): PRs salvos pela tentativa parcial
+
+        Returns:
+            float: Atraso aplicado, ou None se o repositório foi abandonado nesta execução
+        """
+        self.prs_collected += prs
+        if attempts >= self.max_attempts:
+            self.abandoned.append(repo)
+            return None
+
+        delay = min(self.base_delay * 2 ** (attempts - 1), self.max_delay)
+        delay *= random.uniform(0.8, 1.2)
+        self.requeued += 1
+        self.push(repo, delay, attempts)
+        return delay
+
+    def complete(self, repo: str, prs: int = 0) -> None:
+        """Registra um repositório concluído e quantos PRs ele rendeu."""
+        self.completed += 1
+        self.prs_collected += prs
+
+    @staticmethod
+    def target_workers(pool, max_workers: int, points_per_repo: int) -> int:
+        """
+        Quantidade de threads a manter ativas dado o saldo dos tokens.
+
+        Com saldo de sobra, usa max_workers; perto do limite, reduz para não
+        deixar threads paradas esperando o reset dentro do pool.
+
+        Args:
+            pool: TokenPool com os saldos
+            max_workers (int): Máximo de threads
+            points_per_repo (int): Pontos estimados para minerar um repositório
+
+        Returns:
+            int: Threads desejadas (pelo menos 1)
+        """
+        usable = pool.total_headroom() - pool.floor * len(pool)
+        affordable = usable // max(points_per_repo, 1)
+        return max(1, min(max_workers, affordable))
+
+    def status_line(self, active: int, target: int, pool=None) -> str:
+        """Resumo da fila e da vazão para o log."""
+        elapsed_min = max((time.time() - self.started_at) / 60, 1e-9)
+        line = (f"📊 Fila: {len(self)} ({self.waiting()} aguardando retry) | "
+                f"Ativas: {active}/{target} | Concluídos: {self.completed} | "
+                f"Reenvios: {self.requeued} | "
+                f"{self.completed / elapsed_min:.1f} repos/min, {self.prs_collected / elapsed_min:.0f} PRs/min")
+        if pool is not None:
+            line += f" | Saldo: {pool.total_headroom()} pontos"
+        return line
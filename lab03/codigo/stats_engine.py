@@ -0,0 +1,132 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+from scipy.stats import shapiro
+
+
+class StatsEngine:
+    """
+    Correlações e testes de normalidade calculados uma vez e reaproveitados.
+
+    As colunas numéricas viram uma matriz float; cada coluna é ranqueada uma
+    única vez e as matrizes completas de Pearson e Spearman (com p-values)
+    saem de uma chamada vetorizada cada, na primeira consulta. Os testes de
+    normalidade ficam memorizados pelo hash dos valores da coluna.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: List[str], sample_size: int = 5000, random_state: int = 42):
+        """
+        Inicializa o motor.
+
+        Args:
+            df (pd.DataFrame): PRs já preparados
+            columns (List[str]): Colunas numéricas (booleanas viram 0/1)
+            sample_size (int): Tamanho máximo da amostra do Shapiro-Wilk
+            random_state (int): Semente da amostragem
+        """
+        self.columns = [col for col in columns if col in df.columns]
+        self.sample_size = sample_size
+        self.random_state = random_state
+
+        self.data = df[self.columns].astype(float)
+        # Correlações usam só as linhas completas (o prepare_data já remove NaN)
+        self._values = self.data.dropna().to_numpy()
+        self._index = {col: i for i, col in enumerate(self.columns)}
+        self._ranks = None
+        self._matrices: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._normality: Dict[str, Dict] = {}
+
+    def column_hash(self, column: str) -> str:
+        """Hash SHA-1 dos valores da coluna."""
+        return hashlib.sha1(np.ascontiguousarray(self.data[column].to_numpy()).tobytes()).hexdigest()
+
+    def normality(self, column: str) -> Dict:
+        """
+        Estatísticas descritivas e teste de Shapiro-Wilk de uma coluna.
+
+        Args:
+            column (str): Nome da coluna
+
+        Returns:
+            Dict: n, média, mediana, desvio, skewness, kurtosis, shapiro_p e is_normal
+        """
+        key = f"{self.column_hash(column)}:{self.sample_size}:{self.random_state}"
+        if key in self._normality:
+            return self._normality[key]
+
+        data = self.data[column].dropna()
+        if len(data) > self.sample_size:
+            data_sample = data.sample(self.sample_size, random_state=self.random_state)
+        else:
+            data_sample = data
+
+        shapiro_stat, shapiro_p = shapiro(data_sample)
+        values = data.to_numpy()
+
+        result = {
+            'n': len(data),
+            'mean': values.mean(),
+            'median': np.median(values),
+            'std': data.std(),
+            'skewness': stats.skew(values),
+            'kurtosis': stats.kurtosis(values),
+            'shapiro_p': shapiro_p,
+            'is_normal': shapiro_p > 0.05,
+        }
+        self._normality[key] = result
+        return result
+
+    def _ranked(self) -> np.ndarray:
+        """Postos médios de cada coluna, calculados uma única vez."""
+        if self._ranks is None:
+            self._ranks = stats.rankdata(self._values, axis=0)
+        return self._ranks
+
+    def correlation_matrix(self, method: str = 'spearman') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Matriz de correlação completa com p-values.
+
+        Spearman é Pearson sobre os postos; os p-values usam o teste t com
+        n - 2 graus de liberdade, o mesmo de scipy.stats.pearsonr/spearmanr.
+
+        Args:
+            method (str): 'pearson' ou 'spearman'
+
+        Returns:
+            (correlações, p-values) como DataFrames colunas x colunas
+        """
+        if method not in self._matrices:
+            if method == 'spearman':
+                values = self._ranked()
+            elif method == 'pearson':
+                values = self._values
+            else:
+                raise ValueError(f"Método de correlação desconhecido: {method}")
+
+            n = len(values)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                r = np.clip(np.corrcoef(values, rowvar=False), -1.0, 1.0)
+                t = r * np.sqrt((n - 2) / (1.0 - r ** 2))
+            p = 2 * stats.t.sf(np.abs(t), n - 2)
+            p[np.isnan(r)] = np.nan
+            self._matrices[method] = (r, p)
+
+        r, p = self._matrices[method]
+        return (pd.DataFrame(r, index=self.columns, columns=self.columns),
+                pd.DataFrame(p, index=self.columns, columns=self.columns))
+
+    def correlation(self, x: str, y: str, method: str = 'spearman') -> Tuple[float, float]:
+        """
+        Correlação e p-value de um par, lidos da matriz do método.
+
+        Returns:
+            (correlação, p-value)
+        """
+        if method not in self._matrices:
+            self.correlation_matrix(method)
+        r, p = self._matrices[method]
+        i, j = self._index[x], self._index[y]
+        return float(r[i, j]), float(p[i, j])
@@ -1,8 +1,19 @@
 import requests
 import time
 import random
+import sys
+from pathlib import Path
 from tqdm import tqdm
 
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from shared import transport  # noqa: E402
+
+# Sessão HTTP (gravação/replay de cassettes com HTTP_TRANSPORT)
+SESSION = transport.session()
+
 def get_steam_news(appid, total_news=5000):
     url = "http://api.steampowered.com/ISteamNews/GetNewsForApp/v2"
     all_news = []
@@ -22,7 +33,7 @@ def get_steam_news(appid, total_news=5000):
             }
 
             try:
-                response = requests.get(url, params=params)
+                response = SESSION.get(url, params=params)
                 response.raise_for_status()
             except requests.exceptions.RequestException as e:
                 print(f"Erro na requisição: {e}")
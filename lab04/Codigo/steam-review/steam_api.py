@@ -1,8 +1,19 @@
 import requests
 import time
 import random
+import sys
+from pathlib import Path
 from tqdm import tqdm
 
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from shared import transport  # noqa: E402
+
+# Sessão HTTP (gravação/replay de cassettes com HTTP_TRANSPORT)
+SESSION = transport.session()
+
 def get_steam_reviews(app_id, total_reviews):
     url = f"https://store.steampowered.com/appreviews/{app_id}"
     cursor = "*"
@@ -26,7 +37,7 @@ def get_steam_reviews(app_id, total_reviews):
             }
 
             try:
-                response = requests.get(url, params=params)
+                response = SESSION.get(url, params=params)
                 response.raise_for_status()
             except requests.exceptions.RequestException as e:
                 print(f"Erro na requisição: {e}")
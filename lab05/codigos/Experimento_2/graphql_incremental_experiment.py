@@ -11,7 +11,6 @@ from pathlib import Path
 from textwrap import dedent
 from typing import Dict, Iterable, Tuple
 
-import requests
 
 BASE_DIR = Path(__file__).resolve().parent
 LAB_ROOT = BASE_DIR.parents[1]
@@ -21,6 +20,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from config_token import configurar_token  # type: ignore  # noqa: E402
+from shared import transport  # noqa: E402
 
 GITHUB_TOKEN = configurar_token()[0]
 
@@ -161,7 +161,7 @@ class IncrementalExperiment:
     GRAPHQL_URL = "https://api.github.com/graphql"
 
     def __init__(self, token: str, fields_map: Dict[str, str], logger: logging.Logger):
-        self.session = requests.Session()
+        self.session = transport.session()
         self.token = token
         self.fields_map = fields_map
         self.logger = logger
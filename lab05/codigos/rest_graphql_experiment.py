@@ -10,7 +10,6 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Tuple
 
-import requests
 
 BASE_DIR = Path(__file__).resolve().parent
 LAB_ROOT = BASE_DIR.parent
@@ -20,6 +19,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.append(str(PROJECT_ROOT))
 
 from config_token import configurar_token  # type: ignore  # noqa: E402
+from shared import transport  # noqa: E402
 
 GITHUB_TOKEN = configurar_token()[0]
 
@@ -57,7 +57,7 @@ class GitHubExperiment:
 
     def __init__(self, token: str, logger: logging.Logger):
         self.logger = logger
-        self.session = requests.Session()
+        self.session = transport.session()
         self.token = token
 
     @property
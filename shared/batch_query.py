@@ -0,0 +1,214 @@
+import re
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from shared.graphql_client import RATE_LIMIT_FIELD
+
+# Limite de nós por chamada da API GraphQL do GitHub
+NODE_LIMIT = 500_000
+
+# Erros que indicam que a query ficou grande demais e o lote deve encolher
+OVERSIZE_ERRORS = ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED", "timeout", "Something went wrong")
+
+
+class BatchQuery:
+    """
+    Monta uma única query GraphQL com vários itens usando aliases.
+
+    Cada item (por exemplo, um repositório) recebe os mesmos campos com o
+    prefixo ``i<n>_`` e as próprias variáveis (``$owner_<n>``). A resposta é
+    separada de volta em um resultado por item. O tamanho do lote se ajusta
+    pelo custo devolvido no campo rateLimit, mantendo cada requisição abaixo
+    do custo alvo e do limite de nós.
+
+    Uso:
+        batch = BatchQuery.repositories("stargazerCount")
+        results = batch.run([{"owner": "o", "name": "r"}, ...], client.execute)
+    """
+
+    def __init__(self, fields: Dict[str, str], variable_types: Dict[str, str], max_batch: int = 100,
+                 initial_batch: int = 20, target_cost: int = 100, node_limit: int = NODE_LIMIT):
+        """
+        Inicializa o construtor de lotes.
+
+        Args:
+            fields (Dict[str, str]): Nome do campo no resultado -> campo GraphQL com variáveis ($nome)
+            variable_types (Dict[str, str]): Tipo GraphQL de cada variável de item (ex.: {"owner": "String!"})
+            max_batch (int): Máximo de itens por requisição
+            initial_batch (int): Itens na primeira requisição, antes de conhecer o custo
+            target_cost (int): Custo máximo desejado por requisição, em pontos
+            node_limit (int): Limite de nós por requisição
+        """
+        self.fields = fields
+        self.variable_types = variable_types
+        self.max_batch = max_batch
+        self.batch_size = min(initial_batch, max_batch)
+        self.target_cost = target_cost
+        self.node_limit = node_limit
+        self.requests = 0
+        self._variable_pattern = re.compile(r"\$(%s)\b" % "|".join(map(re.escape, variable_types)))
+
+    @classmethod
+    def repositories(cls, selection: str, **kwargs) -> "BatchQuery":
+        """
+        Lote de ``repository(owner:, name:)`` com a mesma seleção de campos.
+
+        Args:
+            selection (str): Campos pedidos de cada repositório
+            **kwargs: Parâmetros de BatchQuery (max_batch, target_cost, ...)
+
+        Returns:
+            BatchQuery: Itens no formato {"owner": ..., "name": ...}; resultado em "repository"
+        """
+        field = f"repository(owner: $owner, name: $name) {{ {selection} }}"
+        return cls({"repository": field}, {"owner": "String!", "name": "String!"}, **kwargs)
+
+    def build(self, items: List[Dict]) -> Tuple[str, Dict]:
+        """
+        Monta a query de um lote.
+
+        Args:
+            items (List[Dict]): Variáveis de cada item
+
+        Returns:
+            (query, variables) prontos para o cliente GraphQL
+        """
+        declarations = []
+        selections = []
+        variables = {}
+
+        for index, item in enumerate(items):
+            for name, graphql_type in self.variable_types.items():
+                declarations.append(f"${name}_{index}: {graphql_type}")
+                variables[f"{name}_{index}"] = item.get(name)
+            for alias, field in self.fields.items():
+                field = self._variable_pattern.sub(lambda m: f"${m.group(1)}_{index}", field)
+                selections.append(f"i{index}_{alias}: {field}")
+
+        query = "query(%s) {\n    %s\n    %s\n}" % (", ".join(declarations), "\n    ".join(selections),
+                                                  RATE_LIMIT_FIELD)
+        return query, variables
+
+    def split(self, response: Dict, count: int) -> List[Optional[Dict]]:
+        """
+        Separa a resposta de um lote em um resultado por item.
+
+        Itens com erro (campo ausente ou erro GraphQL com o alias no path)
+        voltam como None; os demais como {nome do campo: valor}.
+
+        Args:
+            response (Dict): Resposta completa da API
+            count (int): Quantidade de itens do lote
+
+        Returns:
+            List[Optional[Dict]]: Resultados na ordem dos itens
+        """
+        data = response.get("data") or {}
+        failed = set()
+        for error in response.get("errors") or []:
+            path = error.get("path") or []
+            if path and str(path[0]).startswith("i"):
+                failed.add(str(path[0]).split("_", 1)[0])
+
+        results = []
+        for index in range(count):
+            if f"i{index}" in failed:
+                results.append(None)
+                continue
+            result = {alias: data.get(f"i{index}_{alias}") for alias in self.fields}
+            results.append(result if any(value is not None for value in result.values()) else None)
+        return results
+
+    def observe(self, response: Dict, count: int) -> None:
+        """
+        Ajusta o tamanho do lote a partir do custo informado na resposta.
+
+        Args:
+            response (Dict): Resposta completa da API (com o campo rateLimit)
+            count (int): Quantidade de itens do lote
+        """
+        self.requests += 1
+        rate_limit = (response.get("data") or {}).get("rateLimit") or {}
+        cost = rate_limit.get("cost")
+        if not cost or not count:
+            return
+
+        # O custo é nós/100 arredondado para cima (mínimo 1), então por item é uma estimativa por cima
+        cost_per_item = cost / count
+        by_cost = int(self.target_cost / cost_per_item)
+        by_nodes = int(self.node_limit / (cost_per_item * 100))
+        # Cresce no máximo 2x por vez; encolhe direto para o que cabe
+        self.batch_size = max(1, min(self.max_batch, 2 * count, by_cost, by_nodes))
+
+    def shrink(self) -> bool:
+        """Reduz o lote pela metade após uma falha; False se já estava em 1 item."""
+        if self.batch_size <= 1:
+            return False
+        self.batch_size = max(1, self.batch_size // 2)
+        return True
+
+    @staticmethod
+    def is_oversize(response: Dict) -> bool:
+        """Se a resposta indica que a query inteira ficou grande ou lenta demais."""
+        if response.get("data"):
+            return False
+        return any(
+            any(marker in f"{error.get('type', '')} {error.get('message', '')}" for marker in OVERSIZE_ERRORS)
+            for error in response.get("errors") or []
+        )
+
+    def run(self, items: List[Dict], execute: Callable[[str, Dict], Dict]) -> List[Optional[Dict]]:
+        """
+        Executa todos os itens em lotes.
+
+        Args:
+            items (List[Dict]): Variáveis de cada item
+            execute (Callable): Função (query, variables) -> resposta, ex.: GraphQLClient.execute
+
+        Returns:
+            List[Optional[Dict]]: Um resultado por item, na ordem recebida
+        """
+        results: List[Optional[Dict]] = []
+        position = 0
+        while position < len(items):
+            chunk = items[position:position + self.batch_size]
+            query, variables = self.build(chunk)
+            try:
+                response = execute(query, variables)
+            except Exception:
+                if self.shrink():
+                    continue
+                raise
+            if self.is_oversize(response) and self.shrink():
+                continue
+
+            self.observe(response, len(chunk))
+            results.extend(self.split(response, len(chunk)))
+            position += len(chunk)
+        return results
+
+    async def run_async(self, items: List[Dict],
+                        execute: Callable[[str, Dict], Awaitable[Dict]]) -> List[Optional[Dict]]:
+        """
+        Versão assíncrona de run: execute é uma corrotina (query, variables) -> resposta.
+
+        Os lotes são enviados um após o outro, para que o tamanho de cada um
+        use o custo do anterior.
+        """
+        results: List[Optional[Dict]] = []
+        position = 0
+        while position < len(items):
+            chunk = items[position:position + self.batch_size]
+            query, variables = self.build(chunk)
+            try:
+                response = await execute(query, variables)
+            except Exception:
+                if self.shrink():
+                    continue
+                raise
+            if self.is_oversize(response) and self.shrink():
+                continue
+
+            self.observe(response, len(chunk))
+            results.extend(self.split(response, len(chunk)))
+            position += len(chunk)
+        return results
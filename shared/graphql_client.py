@@ -0,0 +1,265 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from shared import transport
+from shared.response_cache import ResponseCache
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Campo a incluir nas queries para que a resposta traga o custo e o saldo de pontos
+RATE_LIMIT_FIELD = "rateLimit { limit cost remaining resetAt }"
+
+# Cota primária da API GraphQL (pontos por hora) usada até a primeira resposta
+DEFAULT_LIMIT = 5000
+
+
+class GraphQLRequestError(requests.exceptions.RequestException):
+    """Falha definitiva de uma requisição GraphQL (todas as tentativas esgotadas)."""
+
+
+class TokenBudget:
+    """Saldo de pontos conhecido de um token."""
+
+    __slots__ = ("token", "limit", "remaining", "reset_at", "paused_until", "reserved", "requests")
+
+    def __init__(self, token: str, limit: int = DEFAULT_LIMIT):
+        self.token = token
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = 0.0
+        self.paused_until = 0.0
+        self.reserved = 0
+        self.requests = 0
+
+    def headroom(self, now: float) -> int:
+        """Pontos disponíveis descontando as requisições em andamento."""
+        if now < self.paused_until:
+            return 0
+        if self.reset_at and now >= self.reset_at:
+            # A janela virou: o saldo volta ao limite até a próxima resposta confirmar
+            self.remaining = self.limit
+            self.reset_at = 0.0
+        return self.remaining - self.reserved
+
+
+class TokenPool:
+    """
+    Distribui as requisições entre vários tokens do GitHub pelo saldo de cada um.
+
+    O saldo de cada token é atualizado a cada resposta (cabeçalhos
+    X-RateLimit-* e, se presente, o campo rateLimit da query) e cada nova
+    requisição vai para o token com mais pontos livres. Quando todos chegam
+    ao piso, a espera é só até o reset mais próximo, em vez de esperar o 403.
+    """
+
+    def __init__(self, tokens: List[str], floor: int = 50, default_cost: int = 1):
+        """
+        Inicializa o pool.
+
+        Args:
+            tokens (List[str]): Tokens de acesso
+            floor (int): Pontos mantidos de reserva em cada token
+            default_cost (int): Custo estimado de uma query antes de observar respostas
+        """
+        if not tokens:
+            raise ValueError("TokenPool precisa de pelo menos um token")
+
+        self.budgets = {token: TokenBudget(token) for token in tokens}
+        self.floor = floor
+        self.estimated_cost = default_cost
+        self._condition = threading.Condition()
+
+    def __len__(self) -> int:
+        return len(self.budgets)
+
+    def acquire(self, cost: Optional[int] = None) -> Tuple[str, int]:
+        """
+        Reserva pontos no token com mais saldo, esperando o reset se todos estiverem no piso.
+
+        Args:
+            cost (int): Custo estimado da requisição (padrão: média observada)
+
+        Returns:
+            Tuple[str, int]: Token escolhido e pontos reservados (a devolver em release)
+        """
+        cost = cost or self.estimated_cost
+
+        with self._condition:
+            while True:
+                now = time.time()
+                budget = max(self.budgets.values(), key=lambda b: b.headroom(now))
+                if budget.headroom(now) - cost >= self.floor:
+                    budget.reserved += cost
+                    budget.requests += 1
+                    return budget.token, cost
+
+                # Todos no piso: espera o primeiro reset (ou uma requisição em andamento terminar)
+                wake_at = min(max(b.reset_at, b.paused_until) or now + 1 for b in self.budgets.values())
+                self._condition.wait(timeout=max(wake_at - now, 0.05))
+
+    def release(self, token: str, reserved: int, headers=None,
+                rate_limit: Optional[Dict] = None, status: Optional[int] = None) -> None:
+        """
+        Libera a reserva e atualiza o saldo do token com a resposta recebida.
+
+        Args:
+            token (str): Token usado
+            reserved (int): Pontos reservados, exatamente como devolvidos por acquire
+                (a estimativa de custo pode ter mudado desde a reserva)
+            headers: Cabeçalhos da resposta HTTP (opcional)
+            rate_limit (Dict): Campo rateLimit da resposta GraphQL (opcional)
+            status (int): Status HTTP da resposta (opcional)
+        """
+        now = time.time()
+
+        with self._condition:
+            budget = self.budgets[token]
+            budget.reserved = max(budget.reserved - reserved, 0)
+
+            remaining = reset_at = None
+            if headers is not None:
+                if headers.get("X-RateLimit-Limit") is not None:
+                    budget.limit = int(headers["X-RateLimit-Limit"])
+                if headers.get("X-RateLimit-Remaining") is not None:
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                if headers.get("X-RateLimit-Reset") is not None:
+                    reset_at = float(headers["X-RateLimit-Reset"])
+
+            if rate_limit:
+                remaining = rate_limit.get("remaining", remaining)
+                budget.limit = rate_limit.get("limit", budget.limit)
+                if rate_limit.get("resetAt"):
+                    reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+
+            if remaining is not None:
+                # O reset vem em segundos inteiros; 1s de margem evita contar com a janela nova cedo demais
+                reset_at = reset_at + 1 if reset_at is not None else budget.reset_at
+                if reset_at and reset_at > budget.reset_at + 1:
+                    budget.remaining = remaining
+                else:
+                    # Mesma janela: respostas chegam fora de ordem, vale o menor saldo visto
+                    budget.remaining = min(budget.remaining, remaining)
+                budget.reset_at = max(reset_at or 0.0, budget.reset_at)
+
+            if rate_limit:
+                if rate_limit.get("cost"):
+                    # Média móvel do custo real, usada nas próximas reservas
+                    self.estimated_cost = max(1, round(0.8 * self.estimated_cost + 0.2 * rate_limit["cost"]))
+
+            if status in (403, 429):
+                retry_after = headers.get("Retry-After") if headers is not None else None
+                if retry_after is not None:
+                    budget.paused_until = now + int(retry_after)
+                elif budget.remaining == 0 and budget.reset_at > now:
+                    budget.paused_until = budget.reset_at
+                else:
+                    # Limite secundário sem cabeçalho: pausa curta só neste token
+                    budget.paused_until = now + 60
+
+            self._condition.notify_all()
+
+    def total_headroom(self) -> int:
+        """Soma dos pontos livres de todos os tokens."""
+        with self._condition:
+            now = time.time()
+            return sum(max(b.headroom(now), 0) for b in self.budgets.values())
+
+    def snapshot(self) -> List[Dict]:
+        """Estado atual de cada token (para logs e métricas)."""
+        with self._condition:
+            now = time.time()
+            return [
+                {
+                    "token": f"...{b.token[-4:]}",
+                    "remaining": b.remaining,
+                    "limit": b.limit,
+                    "reserved": b.reserved,
+                    "requests": b.requests,
+                    "reset_in": max(b.reset_at - now, 0),
+                    "paused": now < b.paused_until,
+                }
+                for b in self.budgets.values()
+            ]
+
+
+class GraphQLClient:
+    """Cliente GraphQL do GitHub que envia cada requisição pelo token com mais saldo."""
+
+    def __init__(self, pool: TokenPool, url: str = GITHUB_GRAPHQL_URL, cache: Optional[ResponseCache] = None,
+                 max_retries: int = 5, timeout: float = 30):
+        """
+        Inicializa o cliente.
+
+        Args:
+            pool (TokenPool): Pool de tokens
+            url (str): Endpoint GraphQL (um servidor local nos testes)
+            cache (ResponseCache): Cache persistente de respostas (opcional)
+            max_retries (int): Tentativas por requisição
+            timeout (float): Timeout de cada requisição em segundos
+        """
+        self.pool = pool
+        self.url = url
+        self.cache = cache
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = transport.session()
+
+    def execute(self, query: str, variables: Optional[Dict] = None, cost: Optional[int] = None) -> Dict:
+        """
+        Executa uma query GraphQL.
+
+        Args:
+            query (str): Texto da query (inclua RATE_LIMIT_FIELD para acompanhar o custo)
+            variables (Dict): Variáveis da query
+            cost (int): Custo estimado em pontos (padrão: média observada)
+
+        Returns:
+            Dict: Resposta completa da API (pode conter "errors")
+
+        Raises:
+            GraphQLRequestError: Se todas as tentativas falharem
+        """
+        if self.cache is not None:
+            cached = self.cache.get(query, variables)
+            if cached is not None:
+                return cached
+
+        payload = {"query": query, "variables": variables or {}}
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            token, reserved = self.pool.acquire(cost)
+            try:
+                r = self.session.post(self.url, headers={"Authorization": f"bearer {token}"},
+                                      json=payload, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                self.pool.release(token, reserved)
+                last_error = e
+                time.sleep(2 ** attempt)
+                continue
+
+            body = r.json() if r.headers.get("Content-Type", "").startswith("application/json") else {}
+            rate_limit = (body.get("data") or {}).get("rateLimit") if r.status_code == 200 else None
+            self.pool.release(token, reserved, r.headers, rate_limit, r.status_code)
+
+            if r.status_code in (403, 429):
+                # O token foi pausado no pool; a próxima tentativa usa outro
+                last_error = GraphQLRequestError(f"Rate limit ({r.status_code}): {body.get('message', '')}")
+                continue
+
+            if r.status_code >= 500:
+                last_error = GraphQLRequestError(f"Erro no servidor: {r.status_code}")
+                time.sleep(2 ** attempt)
+                continue
+
+            r.raise_for_status()
+
+            if self.cache is not None and "errors" not in body:
+                self.cache.set(query, variables, body)
+            return body
+
+        raise GraphQLRequestError(f"Número máximo de tentativas excedido: {last_error}")
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = PROJECT_ROOT / ".cache" / "github_responses.sqlite"
+
+
+class ResponseCache:
+    """
+    Cache persistente de respostas GraphQL do GitHub.
+
+    As respostas são endereçadas pelo hash da query e das variáveis e
+    guardadas comprimidas (zlib) em um arquivo SQLite compartilhado pelos
+    coletores dos labs. Entradas expiram após ``ttl_seconds`` e, quando o
+    cache passa de ``max_bytes``, as menos usadas recentemente são removidas.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = 7 * 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        """
+        Inicializa o cache.
+
+        Args:
+            path (str): Caminho do arquivo SQLite (padrão: GITHUB_CACHE_PATH ou .cache/ na raiz)
+            ttl_seconds (float): Tempo de vida de cada resposta em segundos
+            max_bytes (int): Tamanho máximo (comprimido) antes da remoção LRU
+        """
+        self.path = Path(path or os.environ.get("GITHUB_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # Os coletores do lab03 usam threads, então a conexão é compartilhada com lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(query: str, variables: Optional[Dict] = None) -> str:
+        """
+        Gera a chave de conteúdo para uma query e suas variáveis.
+
+        Args:
+            query (str): Texto da query GraphQL
+            variables (Dict): Variáveis da query
+
+        Returns:
+            str: Hash SHA-256 em hexadecimal
+        """
+        normalized = json.dumps({"query": " ".join(query.split()), "variables": variables or {}},
+                                sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get(self, query: str, variables: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Busca uma resposta no cache.
+
+        Args:
+            query (str): Texto da query GraphQL
+            variables (Dict): Variáveis da query
+
+        Returns:
+            Optional[Dict]: Resposta armazenada ou None se ausente/expirada
+        """
+        key = self.make_key(query, variables)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            created_at, payload = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+    def set(self, query: str, variables: Optional[Dict], response: Dict) -> None:
+        """
+        Armazena uma resposta no cache e aplica a remoção LRU se necessário.
+
+        Args:
+            query (str): Texto da query GraphQL
+            variables (Dict): Variáveis da query
+            response (Dict): Resposta da API
+        """
+        key = self.make_key(query, variables)
+        payload = zlib.compress(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created_at, accessed_at, size, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, len(payload), payload)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Remove entradas expiradas e, depois, as menos usadas até caber em max_bytes."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def clear(self) -> None:
+        """Remove todas as respostas do cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo do cache."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,347 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+# Cabeçalhos que não são repassados (valem só para a conexão original ou foram decodificados)
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length",
+    "set-cookie", "date", "server",
+}
+
+# Cabeçalhos de rate limit gravados, substituídos pela simulação no replay
+RATE_LIMIT_HEADERS = {
+    "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset", "x-ratelimit-used",
+    "x-ratelimit-resource", "retry-after",
+}
+
+
+class QuotaWindow:
+    """Cota de requisições por token dentro de uma janela de tempo, como o rate limit do GitHub."""
+
+    def __init__(self, quotas: Dict[str, int], window_seconds: float = 3600, default: Optional[int] = None):
+        """
+        Inicializa a janela.
+
+        Args:
+            quotas (Dict[str, int]): Cota de pontos por token
+            window_seconds (float): Duração da janela
+            default (int): Cota de tokens não listados (None recusa tokens desconhecidos)
+        """
+        self.quotas = dict(quotas)
+        self.window_seconds = window_seconds
+        self.default = default
+        self.reset_at = time.time() + window_seconds
+        self.remaining = dict(quotas)
+        self.requests_by_token = {token: 0 for token in quotas}
+        self.rejected_by_token = {token: 0 for token in quotas}
+        self._lock = threading.Lock()
+
+    def knows(self, token: str) -> bool:
+        """Se o token tem cota (própria ou padrão)."""
+        return token in self.quotas or self.default is not None
+
+    def limit(self, token: str) -> int:
+        """Cota do token por janela."""
+        return self.quotas.get(token, self.default)
+
+    def charge(self, token: str, cost: int = 1) -> Tuple[bool, int, float]:
+        """Desconta a cota do token; retorna (aceito, restante, reset)."""
+        with self._lock:
+            now = time.time()
+            if now >= self.reset_at:
+                self.reset_at = now + self.window_seconds
+                self.remaining = {t: self.quotas.get(t, self.default) for t in self.remaining}
+
+            if token not in self.remaining:
+                self.remaining[token] = self.limit(token)
+                self.requests_by_token[token] = 0
+                self.rejected_by_token[token] = 0
+
+            self.requests_by_token[token] += 1
+            if self.remaining[token] < cost:
+                self.rejected_by_token[token] += 1
+                return False, 0, self.reset_at
+
+            self.remaining[token] -= cost
+            return True, self.remaining[token], self.reset_at
+
+    def headers(self, token: str, remaining: int, reset_at: float) -> Dict:
+        """Cabeçalhos X-RateLimit-* de uma resposta."""
+        return {
+            "X-RateLimit-Limit": self.limit(token),
+            "X-RateLimit-Remaining": remaining,
+            "X-RateLimit-Reset": int(reset_at),
+        }
+
+
+class _ThreadingServer(ThreadingHTTPServer):
+    # O padrão (5) derruba conexões quando dezenas de requisições simultâneas chegam juntas
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class LocalHTTPServer:
+    """Base dos servidores locais: uma porta livre de 127.0.0.1 servida em uma thread."""
+
+    def __init__(self):
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        raise NotImplementedError
+
+    def start(self):
+        """Inicia o servidor em uma thread, numa porta livre de 127.0.0.1."""
+        self._server = _ThreadingServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Encerra o servidor."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _send(handler: BaseHTTPRequestHandler, status: int, payload: bytes, headers: Dict = None,
+          content_type: str = "application/json; charset=utf-8") -> None:
+    """Escreve uma resposta HTTP completa."""
+    handler.send_response(status)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(len(payload)))
+    for name, value in (headers or {}).items():
+        handler.send_header(name, str(value))
+    handler.end_headers()
+    handler.wfile.write(payload)
+
+
+def _send_recorded(handler: BaseHTTPRequestHandler, status: int, headers: Dict, payload: bytes) -> None:
+    """Escreve uma resposta gravada, separando o Content-Type dos demais cabeçalhos."""
+    content_type = "application/octet-stream"
+    others = {}
+    for name, value in headers.items():
+        if name.lower() == "content-type":
+            content_type = value
+        else:
+            others[name] = value
+    _send(handler, status, payload, others, content_type)
+
+
+def _patch_rate_limit(content: bytes, limit: int, remaining: int, reset_at: float) -> bytes:
+    """Substitui o campo rateLimit gravado no corpo GraphQL pelos valores simulados."""
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return content
+    rate_limit = (body.get("data") or {}).get("rateLimit") if isinstance(body, dict) else None
+    if not isinstance(rate_limit, dict):
+        return content
+    rate_limit.update({
+        "limit": limit,
+        "remaining": remaining,
+        "resetAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(reset_at)),
+    })
+    return json.dumps(body).encode("utf-8")
+
+
+def _token(handler: BaseHTTPRequestHandler) -> str:
+    """Token do cabeçalho Authorization ("anonymous" se não houver)."""
+    return handler.headers.get("Authorization", "").split(" ")[-1] or "anonymous"
+
+
+class StubGitHubServer(LocalHTTPServer):
+    """
+    Servidor GraphQL local que imita as cotas de rate limit do GitHub.
+
+    Cada token tem sua própria cota por janela; cada requisição consome
+    ``cost`` pontos e a resposta traz os cabeçalhos X-RateLimit-* e, se a
+    query pedir, o campo rateLimit. Com a cota esgotada o servidor responde
+    403, como a API real. Os dados de cada resposta vêm de ``responder``.
+
+    Uso:
+        with StubGitHubServer({"token-a": 100, "token-b": 50}) as server:
+            client = GraphQLClient(TokenPool(["token-a", "token-b"]), url=server.url)
+    """
+
+    def __init__(self, quotas: Dict[str, int], window_seconds: float = 3600, cost: int = 1,
+                 responder: Optional[Callable[[str, Dict], Dict]] = None, latency: float = 0.0):
+        """
+        Inicializa o servidor (sem iniciá-lo).
+
+        Args:
+            quotas (Dict[str, int]): Cota de pontos por token
+            window_seconds (float): Duração da janela de rate limit
+            cost (int): Pontos consumidos por requisição
+            responder (Callable): Função (query, variables) -> campo "data" da resposta
+            latency (float): Atraso artificial de cada resposta, em segundos
+        """
+        super().__init__()
+        self.window = QuotaWindow(quotas, window_seconds)
+        self.quotas = self.window.quotas
+        self.cost = cost
+        self.responder = responder or (lambda query, variables: {})
+        self.latency = latency
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/graphql"
+
+    @property
+    def requests_by_token(self) -> Dict[str, int]:
+        return self.window.requests_by_token
+
+    @property
+    def rejected_by_token(self) -> Dict[str, int]:
+        return self.window.rejected_by_token
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                token = _token(self)
+
+                if not stub.window.knows(token):
+                    _send(self, 401, json.dumps({"message": "Bad credentials"}).encode("utf-8"))
+                    return
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                accepted, remaining, reset_at = stub.window.charge(token, stub.cost)
+                headers = stub.window.headers(token, remaining, reset_at)
+                headers["X-RateLimit-Resource"] = "graphql"
+                if not accepted:
+                    _send(self, 403, json.dumps({"message": "API rate limit exceeded"}).encode("utf-8"), headers)
+                    return
+
+                query = request.get("query", "")
+                data = stub.responder(query, request.get("variables") or {})
+                if "rateLimit" in query:
+                    data["rateLimit"] = {
+                        "limit": stub.window.limit(token),
+                        "cost": stub.cost,
+                        "remaining": remaining,
+                        "resetAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(reset_at)),
+                    }
+                _send(self, 200, json.dumps({"data": data}).encode("utf-8"), headers)
+
+        return Handler
+
+
+class CassetteServer(LocalHTTPServer):
+    """
+    Servidor local que grava respostas reais em um cassette ou as reproduz.
+
+    As URLs chegam no formato ``/<esquema>/<host>/<caminho>`` (veja
+    shared.transport). No modo "record" cada requisição é repassada ao host
+    real e a resposta é gravada; no modo "replay" a resposta sai do cassette,
+    sem rede, com latência e rate limit simulados. Requisições que não estão
+    no cassette recebem 404.
+    """
+
+    def __init__(self, cassette, mode: str = "replay", latency: float = 0.0, quota: Optional[int] = None,
+                 window_seconds: float = 3600):
+        """
+        Inicializa o servidor (sem iniciá-lo).
+
+        Args:
+            cassette (Cassette): Cassette de onde ler ou onde gravar as respostas
+            mode (str): "record" ou "replay"
+            latency (float): Atraso artificial de cada resposta no replay, em segundos
+            quota (int): Requisições por token e por janela no replay (None desliga o rate limit)
+            window_seconds (float): Duração da janela de rate limit
+        """
+        super().__init__()
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Modo inválido para o CassetteServer: {mode}")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.window = QuotaWindow({}, window_seconds, default=quota) if quota is not None else None
+        self.misses = 0
+
+    def _forward(self, method: str, target: str, headers: Dict, body: bytes) -> Tuple[int, Dict, bytes]:
+        """Repassa a requisição ao host real (modo record)."""
+        import requests
+
+        headers = {k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS | {"host"}}
+        response = requests.request(method, target, headers=headers, data=body or None, timeout=60)
+        response_headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
+        return response.status_code, response_headers, response.content
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                scheme, _, rest = self.path.lstrip("/").partition("/")
+                target = f"{scheme}://{rest}"
+                key = server.cassette.key(self.command, target, body)
+
+                if server.mode == "record":
+                    status, headers, content = server._forward(self.command, target, dict(self.headers), body)
+                    server.cassette.append(key, self.command, target, status, headers, content)
+                    _send_recorded(self, status, headers, content)
+                    return
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                rate_headers = {}
+                if server.window is not None:
+                    token = _token(self)
+                    accepted, remaining, reset_at = server.window.charge(token)
+                    rate_headers = server.window.headers(token, remaining, reset_at)
+                    if not accepted:
+                        _send(self, 403, json.dumps({"message": "API rate limit exceeded"}).encode("utf-8"),
+                              rate_headers)
+                        return
+
+                recorded = server.cassette.next_response(key)
+                if recorded is None:
+                    server.misses += 1
+                    message = {"message": f"Resposta não gravada no cassette: {self.command} {target}"}
+                    _send(self, 404, json.dumps(message).encode("utf-8"))
+                    return
+
+                status, headers, content = recorded
+                if server.window is not None:
+                    # Sem cota simulada os cabeçalhos gravados seguem como vieram
+                    headers = {k: v for k, v in headers.items() if k.lower() not in RATE_LIMIT_HEADERS}
+                    headers.update(rate_headers)
+                    content = _patch_rate_limit(content, server.window.limit(token), remaining, reset_at)
+                _send_recorded(self, status, headers, content)
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+            do_PATCH = _handle
+            do_DELETE = _handle
+
+        return Handler
@@ -0,0 +1,262 @@
+import atexit
+import base64
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CASSETTE_PATH = PROJECT_ROOT / ".cache" / "cassette.json"
+
+TRANSPORT_MODES = ("live", "record", "replay")
+
+# Parâmetros de query com credenciais: não entram na chave nem no cassette
+SECRET_PARAMS = {"key", "api_key", "access_token", "token", "client_secret"}
+
+
+class Cassette:
+    """
+    Respostas HTTP gravadas, indexadas pela requisição que as gerou.
+
+    A chave é o método, a URL (sem credenciais e com a query ordenada) e o
+    corpo (JSON normalizado, quando for JSON). Requisições idênticas
+    repetidas guardam as respostas em sequência e são reproduzidas na mesma
+    ordem; depois da última, a última se repete.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Abre o cassette (vazio se o arquivo ainda não existir).
+
+        Args:
+            path (str): Caminho do arquivo JSON (padrão: HTTP_CASSETTE ou .cache/cassette.json na raiz)
+        """
+        self.path = Path(path or os.environ.get("HTTP_CASSETTE", DEFAULT_CASSETTE_PATH))
+        self.interactions: Dict[str, Dict] = {}
+        self._played: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.interactions = json.load(f).get("interactions", {})
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    @staticmethod
+    def clean_url(url: str) -> str:
+        """URL sem parâmetros de credencial e com a query em ordem."""
+        parts = urlsplit(url)
+        params = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                        if k.lower() not in SECRET_PARAMS)
+        query = f"?{urlencode(params)}" if params else ""
+        return f"{parts.scheme}://{parts.netloc}{parts.path}{query}"
+
+    @classmethod
+    def key(cls, method: str, url: str, body: bytes = b"") -> str:
+        """
+        Chave de uma requisição.
+
+        Args:
+            method (str): Método HTTP
+            url (str): URL completa
+            body (bytes): Corpo da requisição
+
+        Returns:
+            str: Hash SHA-256 da requisição normalizada
+        """
+        if body:
+            try:
+                body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+            except ValueError:
+                pass
+        digest = hashlib.sha256(f"{method.upper()} {cls.clean_url(url)}\n".encode("utf-8"))
+        digest.update(body or b"")
+        return digest.hexdigest()
+
+    def append(self, key: str, method: str, url: str, status: int, headers: Dict, content: bytes) -> None:
+        """Grava uma resposta para a requisição."""
+        try:
+            body, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+
+        with self._lock:
+            interaction = self.interactions.setdefault(
+                key, {"request": {"method": method.upper(), "url": self.clean_url(url)}, "responses": []}
+            )
+            interaction["responses"].append(
+                {"status": status, "headers": dict(headers), "body": body, "encoding": encoding}
+            )
+
+    def next_response(self, key: str) -> Optional[Tuple[int, Dict, bytes]]:
+        """
+        Próxima resposta gravada para a requisição.
+
+        Returns:
+            (status, cabeçalhos, corpo) ou None se a requisição não foi gravada
+        """
+        with self._lock:
+            interaction = self.interactions.get(key)
+            if interaction is None:
+                return None
+            responses = interaction["responses"]
+            index = min(self._played.get(key, 0), len(responses) - 1)
+            self._played[key] = index + 1
+            response = responses[index]
+
+        if response["encoding"] == "base64":
+            content = base64.b64decode(response["body"])
+        else:
+            content = response["body"].encode("utf-8")
+        return response["status"], response["headers"], content
+
+    def save(self) -> None:
+        """Grava o cassette em disco (arquivo temporário + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "interactions": self.interactions}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class TransportSession(requests.Session):
+    """requests.Session que envia cada requisição pelo transporte (gravação ou replay)."""
+
+    def __init__(self, transport: "Transport"):
+        super().__init__()
+        self.transport = transport
+
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, self.transport.url(url), *args, **kwargs)
+
+
+class Transport:
+    """
+    Camada de transporte HTTP compartilhada pelos coletores.
+
+    No modo "live" as requisições vão direto à API. Nos modos "record" e
+    "replay", as URLs são reescritas para um CassetteServer local, que grava
+    as respostas reais ou as reproduz sem rede, com latência e rate limit
+    configuráveis. Como só a URL muda, funciona tanto com requests quanto
+    com aiohttp.
+
+    Configuração por variáveis de ambiente:
+        HTTP_TRANSPORT: live (padrão), record ou replay
+        HTTP_CASSETTE: arquivo do cassette (padrão: .cache/cassette.json)
+        HTTP_REPLAY_LATENCY: atraso por resposta no replay, em segundos
+        HTTP_REPLAY_QUOTA: requisições por token e por janela no replay
+        HTTP_REPLAY_WINDOW: duração da janela de rate limit, em segundos
+    """
+
+    def __init__(self, mode: str = "live", cassette_path: Optional[str] = None, latency: float = 0.0,
+                 quota: Optional[int] = None, window_seconds: float = 3600):
+        """
+        Inicializa o transporte (o servidor local só sobe na primeira requisição).
+
+        Args:
+            mode (str): "live", "record" ou "replay"
+            cassette_path (str): Arquivo do cassette
+            latency (float): Atraso por resposta no replay, em segundos
+            quota (int): Requisições por token e por janela no replay (None desliga o rate limit)
+            window_seconds (float): Duração da janela de rate limit
+        """
+        if mode not in TRANSPORT_MODES:
+            raise ValueError(f"HTTP_TRANSPORT inválido: {mode} (use {', '.join(TRANSPORT_MODES)})")
+        self.mode = mode
+        self.cassette_path = cassette_path
+        self.latency = latency
+        self.quota = quota
+        self.window_seconds = window_seconds
+        self.cassette: Optional[Cassette] = None
+        self.server = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "Transport":
+        """Transporte configurado pelas variáveis HTTP_*."""
+        quota = os.environ.get("HTTP_REPLAY_QUOTA")
+        return cls(
+            mode=os.environ.get("HTTP_TRANSPORT", "live").lower(),
+            cassette_path=os.environ.get("HTTP_CASSETTE"),
+            latency=float(os.environ.get("HTTP_REPLAY_LATENCY", 0)),
+            quota=int(quota) if quota else None,
+            window_seconds=float(os.environ.get("HTTP_REPLAY_WINDOW", 3600)),
+        )
+
+    def _ensure_server(self) -> None:
+        """Sobe o CassetteServer na primeira requisição."""
+        with self._lock:
+            if self.server is not None:
+                return
+            from shared.stub_server import CassetteServer
+
+            self.cassette = Cassette(self.cassette_path)
+            if self.mode == "replay" and not len(self.cassette):
+                print(f"Aviso: cassette vazio ou inexistente em {self.cassette.path}")
+            self.server = CassetteServer(self.cassette, self.mode, self.latency, self.quota,
+                                         self.window_seconds).start()
+            atexit.register(self.close)
+
+    def url(self, url: str) -> str:
+        """
+        URL a usar na requisição.
+
+        Args:
+            url (str): URL real da API
+
+        Returns:
+            str: A própria URL no modo live; senão, a URL equivalente no servidor local
+        """
+        if self.mode == "live":
+            return url
+        self._ensure_server()
+        parts = urlsplit(url)
+        rewritten = f"{self.server.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+    def session(self) -> requests.Session:
+        """Sessão requests que passa pelo transporte (uma sessão comum no modo live)."""
+        if self.mode == "live":
+            return requests.Session()
+        return TransportSession(self)
+
+    def close(self) -> None:
+        """Encerra o servidor local e, no modo record, salva o cassette."""
+        with self._lock:
+            if self.server is None:
+                return
+            self.server.stop()
+            self.server = None
+            if self.mode == "record":
+                self.cassette.save()
+                print(f"Cassette salvo em {self.cassette.path} ({len(self.cassette)} requisições)")
+
+
+_default_transport: Optional[Transport] = None
+_default_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """Transporte padrão do processo, configurado pelas variáveis HTTP_*."""
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = Transport.from_env()
+        return _default_transport
+
+
+def url(target: str) -> str:
+    """Atalho para get_transport().url(target)."""
+    return get_transport().url(target)
+
+
+def session() -> requests.Session:
+    """Atalho para get_transport().session()."""
+    return get_transport().session()
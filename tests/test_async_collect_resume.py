@@ -0,0 +1,88 @@
+import csv
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lab01', 'codigo'))
+
+from services import git_async  # noqa: E402
+from services.git_async import AsyncGitHubService  # noqa: E402
+from services.save_to_csv import StreamingCSVSink  # noqa: E402
+
+
+class CollectorCrash(Exception):
+    pass
+
+
+def make_node(owner, stars):
+    return {
+        'name': f'repo-{owner}', 'owner': {'login': owner}, 'stargazerCount': stars,
+        'createdAt': '2015-01-01T00:00:00Z', 'updatedAt': '2024-01-01T00:00:00Z',
+        'pullRequests': {'totalCount': 1}, 'releases': {'totalCount': 1}, 'primaryLanguage': None,
+        'issues': {'totalCount': 2}, 'closedIssues': {'totalCount': 1},
+    }
+
+
+class FakeSearchService(AsyncGitHubService):
+    """Responde à busca a partir de uma lista fixa de (owner, estrelas), sem rede."""
+
+    def __init__(self, repositories, fail_after=None):
+        super().__init__('token', max_concurrency=2, page_size=3)
+        self.repositories = repositories
+        self.fail_after = fail_after
+        self.pages = 0
+
+    async def make_request_async(self, session, variables):
+        search = variables['searchQuery']
+        match = re.match(r'stars:(\d+)\.\.(\d+)', search)
+        if match:
+            low, high = int(match.group(1)), int(match.group(2))
+        else:
+            low, high = int(re.match(r'stars:>=(\d+)', search).group(1)), float('inf')
+        found = sorted(((o, s) for o, s in self.repositories if low <= s <= high), key=lambda r: -r[1])
+
+        start = int(variables['after'] or 0)
+        page = found[start:start + variables['first']]
+        if variables['first'] > 1:
+            self.pages += 1
+            if self.fail_after is not None and self.pages > self.fail_after:
+                raise CollectorCrash()
+        end = start + len(page)
+        return {'data': {'search': {
+            'repositoryCount': len(found),
+            'pageInfo': {'endCursor': str(end), 'hasNextPage': end < len(found)},
+            'edges': [{'node': make_node(owner, stars)} for owner, stars in page],
+        }}}
+
+
+def test_resume_with_different_top_star_count_keeps_shards_and_has_no_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_async, 'SEARCH_RESULT_CAP', 10)
+    repositories = [(f'owner{i}', 10 + 7 * i) for i in range(40)]
+    csv_path = str(tmp_path / 'repositories.csv')
+
+    first = FakeSearchService(repositories, fail_after=5)
+    with pytest.raises(CollectorCrash):
+        first.collect_repositories(30, StreamingCSVSink(csv_path))
+    assert not os.path.exists(csv_path)
+
+    # O repositório mais popular ganhou estrelas: um novo planejamento daria outras faixas
+    repositories[-1] = (repositories[-1][0], 5000)
+    second = FakeSearchService(repositories)
+    sink = StreamingCSVSink(csv_path)
+    assert sink.shard_plan() is not None
+    second.collect_repositories(30, sink)
+
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    owners = [row['owner'] for row in rows]
+    assert len(owners) == len(set(owners))
+    # Só o antigo primeiro colocado saiu das faixas salvas
+    assert len(owners) >= 29
+    assert not os.path.exists(f'{csv_path}.checkpoint.json')
+
+    # A retomada não repete as páginas já gravadas
+    fresh = FakeSearchService(repositories)
+    fresh.collect_repositories(30, StreamingCSVSink(str(tmp_path / 'fresh.csv')))
+    assert second.pages < fresh.pages
@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from shared.graphql_client import RATE_LIMIT_FIELD, GraphQLClient, TokenPool
+from shared.stub_server import StubGitHubServer
+
+QUERY = f"query {{ viewer {{ login }} {RATE_LIMIT_FIELD} }}"
+
+
+def test_release_returns_exactly_what_acquire_reserved():
+    pool = TokenPool(["token-a"], floor=0, default_cost=20)
+    rate_limit = {"limit": 5000, "remaining": 4000, "resetAt": "2099-01-01T00:00:00Z"}
+
+    for _ in range(100):
+        for real_cost in (1, 20):
+            token, reserved = pool.acquire()
+            # A estimativa muda a cada resposta; a reserva devolvida continua a mesma
+            pool.release(token, reserved, rate_limit={**rate_limit, "cost": real_cost})
+
+    assert pool.budgets["token-a"].reserved == 0
+
+
+def test_client_spreads_requests_by_quota_without_403():
+    quotas = {"token-a": 120, "token-b": 60}
+    with StubGitHubServer(quotas, responder=lambda query, variables: {"viewer": {"login": "stub"}}) as server:
+        pool = TokenPool(list(quotas), floor=5)
+        client = GraphQLClient(pool, url=server.url)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bodies = list(executor.map(lambda _: client.execute(QUERY), range(150)))
+
+    assert all(body["data"]["viewer"]["login"] == "stub" for body in bodies)
+    assert server.rejected_by_token == {"token-a": 0, "token-b": 0}
+    assert server.requests_by_token["token-a"] > server.requests_by_token["token-b"]
+    assert all(budget.reserved == 0 for budget in pool.budgets.values())
+
+
+def test_cost_change_between_acquire_and_release_keeps_reservations_balanced():
+    quotas = {"token-a": 1000, "token-b": 1000}
+    with StubGitHubServer(quotas, cost=1) as server:
+        # Estimativa inicial alta; o custo real (1) e o custo alterado (7) a puxam em sentidos opostos
+        pool = TokenPool(list(quotas), floor=5, default_cost=20)
+        client = GraphQLClient(pool, url=server.url)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: client.execute(QUERY), range(30)))
+            server.cost = 7
+            list(executor.map(lambda _: client.execute(QUERY), range(30)))
+
+    assert pool.estimated_cost != 20
+    assert all(budget.reserved == 0 for budget in pool.budgets.values())
+    assert sum(server.rejected_by_token.values()) == 0